@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+"""
+Benchmark the parsing and analysis hot paths on synthetic leagues.
+
+Times the Yahoo parsers (standings, teams, rosters, scoreboards), season
+aggregation, franchise player detection, logo color extraction, draft sheet
+parsing and JSON serialization at a configurable scale, and prints the
+results as JSON.
+
+Usage:
+    python benchmark.py                          # 14 seasons, 12 teams
+    python benchmark.py --preset large           # 100 seasons, 500 teams
+    python benchmark.py --seasons 40 --teams 100 --output bench.json
+    python benchmark.py --compare bench.json     # exit 1 on regressions
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import fetch_draft_data
+import fetch_yahoo_data
+import json_output
+import synthetic_league
+
+PRESETS = {
+    'small': {'seasons': 14, 'teams': 12},
+    'medium': {'seasons': 40, 'teams': 100},
+    'large': {'seasons': 100, 'teams': 500},
+}
+
+PLAYOFF_START_WEEK = 22
+
+
+class Timer:
+    """Collects repeated timings of one phase."""
+
+    def __init__(self):
+        self.phases = {}
+
+    @contextlib.contextmanager
+    def phase(self, name, items):
+        started = time.perf_counter()
+        yield
+        elapsed = time.perf_counter() - started
+        entry = self.phases.setdefault(name, {'items': items, 'runs': []})
+        entry['runs'].append(elapsed)
+
+    def report(self):
+        results = {}
+        for name, entry in self.phases.items():
+            runs = entry['runs']
+            best = min(runs)
+            results[name] = {
+                'items': entry['items'],
+                'runs': len(runs),
+                'seconds_min': round(best, 6),
+                'seconds_median': round(statistics.median(runs), 6),
+                'per_item_us': round(best / entry['items'] * 1e6, 3) if entry['items'] else None,
+            }
+        return results
+
+
+def bench_yahoo(timer, seasons, teams, roster_size):
+    """Parser and aggregation phases; returns the aggregated league structures"""
+    standings_by_season = {}
+    playoffs_by_season = {}
+    rosters_by_season = {}
+
+    # Payloads are generated one season at a time so large scales fit in memory
+    for s in range(seasons):
+        season = synthetic_league.season_name(s)
+
+        payload = synthetic_league.standings_payload(s, teams)
+        with timer.phase('parse_standings', seasons):
+            standings_by_season[season] = fetch_yahoo_data.parse_standings(payload)
+
+        payload = synthetic_league.teams_payload(s, teams)
+        with timer.phase('parse_league_teams', seasons):
+            fetch_yahoo_data.parse_league_teams(payload)
+
+        payloads = [synthetic_league.scoreboard_payload(w, teams) for w in fetch_yahoo_data.playoff_weeks(PLAYOFF_START_WEEK)]
+        with timer.phase('parse_scoreboard', seasons * len(payloads)):
+            playoffs = []
+            for week, payload in zip(fetch_yahoo_data.playoff_weeks(PLAYOFF_START_WEEK), payloads):
+                playoffs.extend(fetch_yahoo_data.parse_playoff_scoreboard(payload, week, PLAYOFF_START_WEEK))
+            playoffs_by_season[season] = playoffs
+
+        payloads = [synthetic_league.roster_payload(t, s, roster_size) for t in range(teams)]
+        with timer.phase('parse_team_roster', seasons * teams):
+            rosters_by_season[season] = {
+                synthetic_league.team_name(t): fetch_yahoo_data.parse_team_roster(payload)
+                for t, payload in enumerate(payloads)
+            }
+
+    # Single-pass phases are merged into one run each
+    for name in ('parse_standings', 'parse_league_teams', 'parse_scoreboard', 'parse_team_roster'):
+        timer.phases[name]['runs'] = [sum(timer.phases[name]['runs'])]
+
+    with timer.phase('aggregate_league', seasons * teams * roster_size):
+        champions, all_teams, season_rosters, player_history, team_rosters = fetch_yahoo_data.aggregate_league(
+            standings_by_season, playoffs_by_season, rosters_by_season
+        )
+
+    return champions, all_teams, season_rosters, player_history, team_rosters
+
+
+def bench_franchise(timer, all_teams, player_history, repeat):
+    stints = sum(len(data['teams']) for data in player_history.values())
+    for _ in range(repeat):
+        with timer.phase('find_franchise_players', stints):
+            franchise_players = fetch_yahoo_data.find_franchise_players(player_history, all_teams)
+    return franchise_players
+
+
+def bench_logos(timer, num_logos, repeat):
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = []
+        for i in range(num_logos):
+            path = Path(tmp) / f"logo-{i}.png"
+            synthetic_league.write_logo(path, seed=i)
+            paths.append(path)
+
+        for _ in range(repeat):
+            with timer.phase('extract_logo_colors', num_logos):
+                for path in paths:
+                    fetch_yahoo_data.extract_logo_colors(path)
+
+
+def bench_drafts(timer, seasons, teams, repeat):
+    sheets = [(str(2000 + s), synthetic_league.draft_sheet_rows(2000 + s, teams)) for s in range(seasons)]
+    for _ in range(repeat):
+        with timer.phase('parse_draft_sheet', len(sheets)):
+            for year, rows in sheets:
+                fetch_draft_data.parse_draft_sheet(rows, year)
+
+
+def bench_json(timer, output, repeat):
+    size = len(json.dumps(output, indent=2))
+    for _ in range(repeat):
+        with timer.phase('json_dump_indent', size):
+            json.dump(output, io.StringIO(), indent=2)
+        with timer.phase('json_dump_compact', size):
+            json.dump(output, io.StringIO(), separators=(',', ':'))
+        with timer.phase('json_output_stream', size):
+            json_output.dump(output, io.StringIO())
+    return size
+
+
+def run(seasons, teams, roster_size, num_logos, repeat):
+    timer = Timer()
+
+    # Keep the scripts' progress prints out of the timings and the JSON output
+    with contextlib.redirect_stdout(io.StringIO()):
+        champions, all_teams, season_rosters, player_history, team_rosters = bench_yahoo(
+            timer, seasons, teams, roster_size
+        )
+        franchise_players = bench_franchise(timer, all_teams, player_history, repeat)
+        bench_logos(timer, num_logos, repeat)
+        bench_drafts(timer, seasons, teams, repeat)
+        output = fetch_yahoo_data.build_output(
+            all_teams, champions, season_rosters, team_rosters, franchise_players, player_history
+        )
+        output_bytes = bench_json(timer, output, repeat)
+
+    return {
+        'scale': {
+            'seasons': seasons,
+            'teams': teams,
+            'roster_size': roster_size,
+            'logos': num_logos,
+            'players': len(player_history),
+            'franchise_players': len(franchise_players),
+            'league_data_bytes': output_bytes,
+        },
+        'repeat': repeat,
+        'python': platform.python_version(),
+        'phases': timer.report(),
+    }
+
+
+def compare(results, baseline, threshold):
+    """Phases slower than baseline by more than `threshold` (e.g. 1.2 = 20%)"""
+    regressions = []
+    for name, phase in results['phases'].items():
+        before = baseline.get('phases', {}).get(name)
+        if not before or not before['seconds_min']:
+            continue
+        ratio = phase['seconds_min'] / before['seconds_min']
+        if ratio > threshold:
+            regressions.append({'phase': name, 'ratio': round(ratio, 2),
+                                'baseline_s': before['seconds_min'], 'current_s': phase['seconds_min']})
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark fetch parsing and analysis on synthetic leagues")
+    parser.add_argument('--preset', choices=PRESETS, help="Named scale (overrides --seasons/--teams)")
+    parser.add_argument('--seasons', type=int, default=14)
+    parser.add_argument('--teams', type=int, default=12)
+    parser.add_argument('--roster-size', type=int, default=25)
+    parser.add_argument('--logos', type=int, help="Logos to extract colors from (default: min(teams, 50))")
+    parser.add_argument('--repeat', type=int, default=3, help="Runs of each repeatable phase")
+    parser.add_argument('--output', type=Path, help="Also write the results to this file")
+    parser.add_argument('--compare', type=Path, help="Baseline results to check for regressions")
+    parser.add_argument('--threshold', type=float, default=1.25, help="Slowdown ratio counted as a regression")
+    args = parser.parse_args()
+
+    if args.preset:
+        args.seasons = PRESETS[args.preset]['seasons']
+        args.teams = PRESETS[args.preset]['teams']
+    num_logos = args.logos if args.logos is not None else min(args.teams, 50)
+
+    results = run(args.seasons, args.teams, args.roster_size, num_logos, args.repeat)
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        if baseline.get('scale') != results['scale']:
+            print(f"Baseline {args.compare} was run at a different scale: {baseline.get('scale')}", file=sys.stderr)
+            sys.exit(2)
+        results['regressions'] = compare(results, baseline, args.threshold)
+
+    text = json.dumps(results, indent=2)
+    if args.output:
+        args.output.write_text(text + '\n')
+    print(text)
+
+    if results.get('regressions'):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for the Yahoo Fantasy API and Google Sheets.
+
+Serves responses recorded with LAKELAND_HTTP_MODE=record, optionally with
+added latency and injected errors, so full fetch runs can be reproduced and
+timed without network access.
+
+Usage:
+    python cassette_server.py --port 8765 --latency-ms 120 --jitter-ms 40 --error-rate 0.02
+
+    LAKELAND_HTTP_MODE=replay LAKELAND_REPLAY_URL=http://127.0.0.1:8765 python fetch_yahoo_data.py
+"""
+
+import argparse
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl
+
+from http_client import DEFAULT_CASSETTE_DIR, Cassette, request_key
+
+
+class CassetteHandler(BaseHTTPRequestHandler):
+    # Set by make_server
+    cassette = None
+    latency = 0.0
+    jitter = 0.0
+    error_rate = 0.0
+    error_status = 503
+    rng = None
+    rng_lock = threading.Lock()
+
+    def _original_url(self):
+        # /host/path?query -> https://host/path?query
+        return f"https:/{self.path}"
+
+    def _respond(self, method, data=None):
+        with self.rng_lock:
+            delay = self.latency + self.rng.uniform(0, self.jitter)
+            fail = self.rng.random() < self.error_rate
+        time.sleep(delay)
+
+        if fail:
+            self._send(self.error_status, b'injected error')
+            return
+
+        response = self.cassette.load(request_key(method, self._original_url(), data=data))
+        if response is None:
+            self._send(404, b'not recorded')
+            return
+        self._send(response.status_code, response.content)
+
+    def _send(self, status, body):
+        self.send_response(status)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        self._respond('GET')
+
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        data = dict(parse_qsl(self.rfile.read(length).decode('utf-8')))
+        self._respond('POST', data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def make_server(cassette_dir, port=8765, latency_ms=0, jitter_ms=0, error_rate=0.0,
+                error_status=503, seed=None):
+    """Build a ThreadingHTTPServer serving one cassette directory."""
+    handler = type('Handler', (CassetteHandler,), {
+        'cassette': Cassette(cassette_dir),
+        'latency': latency_ms / 1000,
+        'jitter': jitter_ms / 1000,
+        'error_rate': error_rate,
+        'error_status': error_status,
+        'rng': random.Random(seed),
+    })
+    return ThreadingHTTPServer(('127.0.0.1', port), handler)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve recorded Yahoo/Sheets responses locally")
+    parser.add_argument('--cassette-dir', default=DEFAULT_CASSETTE_DIR)
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--latency-ms', type=float, default=0, help="Added to every response")
+    parser.add_argument('--jitter-ms', type=float, default=0, help="Random extra latency, up to this much")
+    parser.add_argument('--error-rate', type=float, default=0.0, help="Fraction of requests answered with an error")
+    parser.add_argument('--error-status', type=int, default=503)
+    parser.add_argument('--seed', type=int, help="Seed for reproducible latency and errors")
+    args = parser.parse_args()
+
+    server = make_server(args.cassette_dir, args.port, args.latency_ms, args.jitter_ms,
+                         args.error_rate, args.error_status, args.seed)
+    print(f"Serving {args.cassette_dir} on http://127.0.0.1:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
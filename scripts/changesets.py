@@ -0,0 +1,109 @@
+"""
+Change sets between two runs of a fetcher.
+
+Both fetchers rewrite their whole output file on every run. With --changes
+they also diff the new output against the previous file and write only what
+changed, so the seeding step can apply a handful of row changes instead of
+reloading everything. Records are keyed by IDs that stay the same between
+runs:
+
+    team        team name
+    season      season label ("2024-25")
+    membership  "<season>|<team>|<player_id or name>"
+    pick        "<year>|<round_1|round_2|...>|<pick>"
+    prospect    "<team>|<rights_expire>|<normalized player name>", with "#2",
+                "#3", ... for further prospects of a team whose key is taken
+
+A change set looks like
+
+    {"from": <sha256 of old file>, "to": <sha256 of new file>,
+     "counts": {"teams": {"inserted": 0, "updated": 1, "deleted": 0}, ...},
+     "changes": {"teams": {"inserted": [...], "updated": [...], "deleted": [ids]}, ...}}
+
+where inserted and updated entries are {"id": ..., "record": {...}}.
+"""
+
+import hashlib
+import json
+from datetime import datetime, timezone
+from pathlib import Path
+
+from player_matching import normalize_name
+
+
+def diff_records(old: dict, new: dict) -> dict:
+    """Inserted, updated and deleted records between two id -> record maps."""
+    return {
+        'inserted': [{'id': key, 'record': new[key]} for key in sorted(new.keys() - old.keys())],
+        'updated': [{'id': key, 'record': new[key]} for key in sorted(new.keys() & old.keys()) if new[key] != old[key]],
+        'deleted': sorted(old.keys() - new.keys()),
+    }
+
+
+def league_records(output: dict) -> dict:
+    """Entity tables of a league_data.json keyed by stable IDs."""
+    teams = {team['name']: team for team in output.get('teams', [])}
+    seasons = {entry['season']: entry for entry in output.get('seasons', [])}
+
+    memberships = {}
+    for season, rosters in (output.get('team_rosters') or {}).items():
+        for team, players in (rosters or {}).items():
+            for player in players:
+                key = f"{season}|{team}|{player.get('player_id') or player['name']}"
+                memberships[key] = dict(player, season=season, team=team)
+
+    return {'teams': teams, 'seasons': seasons, 'memberships': memberships}
+
+
+def draft_records(output: dict) -> dict:
+    """Entity tables of a draft_data.json keyed by stable IDs."""
+    picks = {}
+    for year, draft in (output.get('drafts') or {}).items():
+        for section, entries in (draft.get('entry_draft') or {}).items():
+            for entry in entries:
+                picks[f"{year}|{section}|{entry['pick']}"] = dict(entry, year=year, round=section)
+
+    prospects = {}
+    for team, players in (output.get('prospects') or {}).items():
+        for entry in players:
+            # Two prospects can share a normalized name ("J. Hughes"); none may overwrite another
+            key = f"{team}|{entry.get('rights_expire')}|{normalize_name(entry['player'])}"
+            unique, n = key, 1
+            while unique in prospects:
+                n += 1
+                unique = f"{key}#{n}"
+            prospects[unique] = dict(entry, team=team)
+
+    return {'picks': picks, 'prospects': prospects}
+
+
+def file_sha256(path: Path) -> str | None:
+    path = Path(path)
+    if not path.exists():
+        return None
+    return hashlib.sha256(path.read_bytes()).hexdigest()
+
+
+def build_changeset(old_output: dict | None, new_output: dict, extract) -> dict:
+    """Diff two outputs with `extract` (league_records or draft_records)."""
+    old_tables = extract(old_output or {})
+    new_tables = extract(new_output)
+    changes = {name: diff_records(old_tables.get(name, {}), table) for name, table in new_tables.items()}
+    return {
+        'generated_at': datetime.now(timezone.utc).isoformat(),
+        'full': old_output is None,
+        'counts': {name: {kind: len(items) for kind, items in diff.items()} for name, diff in changes.items()},
+        'changes': changes,
+    }
+
+
+def write_changeset(changeset: dict, path: Path, old_file: str | None, new_file: Path) -> None:
+    """Write a change set recording which file versions it connects."""
+    changeset = {'from': old_file, 'to': file_sha256(new_file), **changeset}
+    with open(path, 'w') as f:
+        json.dump(changeset, f, separators=(',', ':'))
+
+    summary = ', '.join(
+        f"{name} +{c['inserted']} ~{c['updated']} -{c['deleted']}" for name, c in changeset['counts'].items()
+    )
+    print(f"Changes saved to {path}: {summary}")
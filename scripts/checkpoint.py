@@ -0,0 +1,70 @@
+"""
+Checkpoint journal for long fetch runs.
+
+Every finished fetch unit (a season's standings, settings or team list, one
+playoff week, one team roster) is appended to a JSON-lines journal together
+with its parsed result, keyed by the Yahoo endpoint it came from. A run
+started with --resume replays the journal instead of fetching those units
+again, so a crash on season 11 only costs the units that were in flight.
+"""
+
+import json
+import os
+import threading
+from pathlib import Path
+
+JOURNAL_VERSION = 1
+
+
+class Journal:
+    """Append-only record of completed units, flushed after every entry."""
+
+    def __init__(self, path: Path, resume: bool = False):
+        self.path = Path(path)
+        self.completed = {}
+        self._lock = threading.Lock()
+
+        if resume and self.path.exists():
+            self.completed = self._read()
+        if not self.completed and self.path.exists():
+            self.path.unlink()
+
+        self._file = open(self.path, 'a')
+        if not self.completed:
+            self._write({'journal': JOURNAL_VERSION})
+
+    def _read(self) -> dict:
+        completed = {}
+        with open(self.path) as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    # The last line of a run killed mid-write
+                    continue
+                if 'journal' in entry:
+                    if entry['journal'] != JOURNAL_VERSION:
+                        return {}
+                    continue
+                completed[entry['unit']] = entry['result']
+        return completed
+
+    def _write(self, entry: dict) -> None:
+        with self._lock:
+            self._file.write(json.dumps(entry, separators=(',', ':')) + '\n')
+            self._file.flush()
+
+    def get(self, unit: str):
+        """Saved result of a completed unit, or None."""
+        return self.completed.get(unit)
+
+    def record(self, unit: str, result) -> None:
+        """Mark a unit done; `result` must be JSON serializable."""
+        self.completed[unit] = result
+        self._write({'unit': unit, 'result': result})
+
+    def close(self, finished: bool = False) -> None:
+        """Close the journal; a finished run has nothing left to resume."""
+        self._file.close()
+        if finished:
+            os.remove(self.path)
@@ -0,0 +1,334 @@
+#!/usr/bin/env python3
+"""
+Run the Yahoo and draft sheet fetchers as one dependency graph.
+
+Each unit of work (auth, per-season standings/playoffs/rosters/weeks, player
+stats, logos, each draft sheet, derived analyses, writes) is a stage with
+explicit dependencies.
+Stages whose dependencies are done run concurrently on a thread pool, all
+HTTP goes through one shared client, and a run manifest with per-stage
+timings and output hashes is written at the end.
+
+Usage:
+    python fetch_all.py [--workers 8] [--cache-dir .http_cache] [--deadline 1800] [--hedge] [--no-archive]
+                        [--rate 5] [--max-in-flight 8]
+
+Seasons sealed in seasons.archive are read from there, not fetched again.
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import time
+import traceback
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import datetime, timezone
+from pathlib import Path
+
+import fetch_draft_data
+import fetch_yahoo_data
+from http_client import HttpClient, RateLimiter, get_client, set_client, write_run_metrics
+from league_registry import DEFAULT_RATE_LIMIT
+from season_archive import SeasonArchive
+
+SCRIPTS_DIR = Path(__file__).parent
+LEAGUE_DATA_FILE = SCRIPTS_DIR / "league_data.json"
+MANIFEST_FILE = SCRIPTS_DIR / "run_manifest.json"
+METRICS_FILE = SCRIPTS_DIR / "run_metrics.json"
+ARCHIVE_FILE = SCRIPTS_DIR / fetch_yahoo_data.ARCHIVE_FILE
+
+
+class Stage:
+    """
+    A named unit of work that runs once all of its dependencies are done.
+
+    Stages in `after` only order the run: the stage waits for them but still
+    runs if they fail, and finds their result in the results dict if they
+    didn't.
+    """
+
+    def __init__(self, name, func, deps=(), outputs=(), after=()):
+        self.name = name
+        self.func = func
+        self.deps = list(deps)
+        self.outputs = [Path(p) for p in outputs]
+        self.after = list(after)
+
+
+def file_digest(path):
+    """sha256 and size of a written output file"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return {'sha256': digest.hexdigest(), 'bytes': path.stat().st_size}
+
+
+def run_dag(stages, max_workers=8):
+    """
+    Run stages respecting dependencies; returns (results, stage_records).
+
+    A stage receives the results dict of everything finished so far. If a
+    stage fails, everything depending on it is skipped.
+    """
+    names = {stage.name for stage in stages}
+    for stage in stages:
+        missing = [dep for dep in stage.deps + stage.after if dep not in names]
+        if missing:
+            raise ValueError(f"Stage {stage.name} depends on unknown stages: {missing}")
+
+    pending = {stage.name: stage for stage in stages}
+    results = {}
+    records = {}
+    failed = set()
+    run_start = time.perf_counter()
+
+    def execute(stage):
+        started = time.perf_counter()
+        value = stage.func(results)
+        return value, started - run_start, time.perf_counter() - started
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        running = {}
+
+        while pending or running:
+            for name, stage in list(pending.items()):
+                if any(dep in failed for dep in stage.deps):
+                    failed.add(name)
+                    records[name] = {'deps': stage.deps, 'status': 'skipped'}
+                    del pending[name]
+                elif (all(dep in results for dep in stage.deps)
+                      and all(dep in results or dep in failed for dep in stage.after)):
+                    running[pool.submit(execute, stage)] = stage
+                    del pending[name]
+
+            if not running:
+                # Whatever is left waits on stages that can never finish
+                for name, stage in pending.items():
+                    records[name] = {'deps': stage.deps, 'status': 'skipped'}
+                break
+
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                stage = running.pop(future)
+                record = {'deps': stage.deps}
+                try:
+                    value, started, duration = future.result()
+                except Exception as e:
+                    failed.add(stage.name)
+                    record.update(status='failed', error=f"{type(e).__name__}: {e}")
+                    print(f"\n  Stage {stage.name} failed: {e}")
+                    traceback.print_exc()
+                else:
+                    results[stage.name] = value
+                    record.update(status='ok', started_s=round(started, 3), duration_s=round(duration, 3))
+                    outputs = {str(p.name): file_digest(p) for p in stage.outputs if p.exists()}
+                    if outputs:
+                        record['outputs'] = outputs
+                records[stage.name] = record
+
+    return results, records
+
+
+def build_stages(use_archive=True):
+    """The full refresh: Yahoo league data, draft sheets and derived files"""
+    stages = [Stage('auth', lambda r: _authenticate())]
+    seasons = sorted(fetch_yahoo_data.LAKELAND_CUP_SEASONS.items())
+
+    # Sealed seasons are read-only inputs, fed in from the archive instead of Yahoo
+    sealed = ({}, {}, {}, {})
+    archive = SeasonArchive.open(ARCHIVE_FILE) if use_archive else None
+    if archive:
+        fetch_yahoo_data.load_archived_seasons(archive, *sealed)
+        archive.close()
+        print(f"Reading {len(archive.seasons)} sealed seasons from {ARCHIVE_FILE.name}")
+
+    for season, (game_key, league_id) in seasons:
+        if season in sealed[0]:
+            stages += [
+                Stage(f'{kind}:{season}', lambda r, value=by_season[season]: value)
+                for kind, by_season in zip(('standings', 'playoffs', 'rosters', 'weeks'), sealed)
+            ]
+            continue
+
+        def standings(r, season=season, game_key=game_key, league_id=league_id):
+            return fetch_yahoo_data.fetch_season_standings(r['auth'], season, game_key, league_id)
+
+        def playoffs(r, season=season, game_key=game_key, league_id=league_id):
+            if not r[f'standings:{season}']:
+                return None
+            return fetch_yahoo_data.fetch_season_playoffs(r['auth'], season, game_key, league_id)
+
+        def rosters(r, season=season, game_key=game_key, league_id=league_id):
+            if not r[f'standings:{season}']:
+                return None
+            return fetch_yahoo_data.fetch_season_rosters(r['auth'], season, game_key, league_id)
+
+        def regular_season(r, season=season, game_key=game_key, league_id=league_id):
+            if not r[f'standings:{season}']:
+                return None
+            return fetch_yahoo_data.fetch_season_regular_season(r['auth'], season, game_key, league_id)
+
+        # The sync point is read before the current rosters, so no move falls between the two
+        roster_after = ['transactions'] if season == fetch_yahoo_data.CURRENT_SEASON else []
+        stages += [
+            Stage(f'standings:{season}', standings, ['auth']),
+            Stage(f'playoffs:{season}', playoffs, [f'standings:{season}']),
+            Stage(f'rosters:{season}', rosters, [f'standings:{season}'], after=roster_after),
+            Stage(f'weeks:{season}', regular_season, [f'standings:{season}']),
+        ]
+
+    def transactions(r):
+        return r['auth'].get_transactions(*fetch_yahoo_data.LAKELAND_CUP_SEASONS[fetch_yahoo_data.CURRENT_SEASON])
+
+    stages.append(Stage('transactions', transactions, ['auth']))
+
+    season_stages = [f'{kind}:{season}' for season, _ in seasons for kind in ('standings', 'playoffs', 'rosters')]
+    week_stages = [f'weeks:{season}' for season, _ in seasons]
+
+    def aggregate(r):
+        return fetch_yahoo_data.aggregate_league(
+            {season: r[f'standings:{season}'] for season, _ in seasons},
+            {season: r[f'playoffs:{season}'] for season, _ in seasons},
+            {season: r[f'rosters:{season}'] for season, _ in seasons},
+        )
+
+    def logos(r):
+        all_teams = r['aggregate'][1]
+        fetch_yahoo_data.process_logos(all_teams)
+        return all_teams
+
+    def league_output(r):
+        champions, all_teams, season_rosters, player_history, team_rosters = r['aggregate']
+        franchise_players = fetch_yahoo_data.find_franchise_players(player_history, all_teams)
+        fetch_yahoo_data.print_results(all_teams, champions, franchise_players)
+        output = fetch_yahoo_data.build_output(
+            all_teams, champions, season_rosters, team_rosters, franchise_players, player_history,
+            {season: r[f'weeks:{season}'] for season, _ in seasons},
+            r['stats']
+        )
+        # Sync point for the next fetch_yahoo_data.py --incremental run
+        output['sync'] = fetch_yahoo_data.sync_rosters(
+            r['auth'], {season: r[f'rosters:{season}'] for season, _ in seasons},
+            {season: r[f'standings:{season}'] for season, _ in seasons}, r.get('transactions')
+        )
+        return output
+
+    def seal(r):
+        by_kind = [{season: r[f'{kind}:{season}'] for season, _ in seasons}
+                   for kind in ('standings', 'playoffs', 'rosters', 'weeks')]
+        fetch_yahoo_data.seal_completed_seasons(ARCHIVE_FILE, *by_kind)
+
+    if use_archive:
+        stages.append(Stage('seal', seal, season_stages + week_stages, outputs=[ARCHIVE_FILE]))
+
+    stages += [
+        Stage('aggregate', aggregate, season_stages),
+        Stage('logos', logos, ['aggregate']),
+        Stage('stats', lambda r: fetch_yahoo_data.fetch_player_stats(r['auth'], r['aggregate'][3]), ['aggregate']),
+        Stage('franchise', league_output, ['logos', 'stats'] + week_stages, after=['transactions']),
+        Stage('write:league', lambda r: fetch_yahoo_data.write_league_data(r['franchise'], LEAGUE_DATA_FILE),
+              ['franchise'], outputs=[LEAGUE_DATA_FILE]),
+    ]
+
+    # Draft sheets don't touch Yahoo, so they run alongside everything above
+    sheet_stages = []
+    for year, gid in fetch_draft_data.DRAFT_SHEETS.items():
+        def sheet(r, year=year, gid=gid):
+            # One bad sheet only leaves its year out, like fetch_all_drafts
+            print(f"Fetching {year} draft (gid={gid})...")
+            try:
+                return fetch_draft_data.parse_draft_sheet(fetch_draft_data.fetch_sheet(gid), year)
+            except Exception as e:
+                print(f"  Error: {e}")
+                return None
+
+        stages.append(Stage(f'sheet:{year}', sheet))
+        sheet_stages.append(f'sheet:{year}')
+
+    def derive_drafts(r):
+        drafts = {name.split(':', 1)[1]: r[name] for name in sheet_stages if r[name] is not None}
+        if 'franchise' in r:
+            league_data = r['franchise']
+        else:
+            # The Yahoo branch failed; join with the last league_data.json instead
+            league_data = fetch_draft_data.load_league_data(SCRIPTS_DIR)
+        return fetch_draft_data.derive_draft_data(drafts, r['sheet:prospects'], league_data)
+
+    def write_drafts(r):
+        data, search_index = r['derive:drafts']
+        fetch_draft_data.write_draft_outputs(data, search_index, SCRIPTS_DIR)
+        fetch_draft_data.print_draft_summary(data)
+
+    stages += [
+        Stage('sheet:prospects', lambda r: fetch_draft_data.fetch_prospects()),
+        Stage('derive:drafts', derive_drafts, sheet_stages + ['sheet:prospects'], after=['franchise']),
+        Stage('write:drafts', write_drafts, ['derive:drafts'],
+              outputs=[SCRIPTS_DIR / 'draft_data.json', SCRIPTS_DIR / 'search_index.json']),
+    ]
+
+    return stages
+
+
+def _authenticate():
+    api = fetch_yahoo_data.YahooFantasyAPI()
+    api.authenticate()
+    return api
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fetch all Lakeland Cup data in one run")
+    parser.add_argument('--workers', type=int, default=8, help="Stages run at the same time")
+    parser.add_argument('--cache-dir', type=Path, help="Keep finished-season responses on disk")
+    parser.add_argument('--manifest', type=Path, default=MANIFEST_FILE, help="Where to write the run manifest")
+    parser.add_argument('--deadline', type=float, metavar='SECONDS',
+                        help="Stop sending requests after this long (default: LAKELAND_RUN_DEADLINE)")
+    parser.add_argument('--hedge', action='store_true', default=None,
+                        help="Resend GETs slower than their p95 and take the first answer (default: LAKELAND_HEDGE)")
+    parser.add_argument('--rate', type=float, default=DEFAULT_RATE_LIMIT['requests_per_second'],
+                        help="Requests started per second across all stages")
+    parser.add_argument('--max-in-flight', type=int, default=DEFAULT_RATE_LIMIT['max_in_flight'],
+                        help="Requests in flight at once across all stages (week stages fan out on their own threads)")
+    parser.add_argument('--no-archive', action='store_true',
+                        help=f"Ignore {ARCHIVE_FILE.name} and fetch every season from Yahoo")
+    args = parser.parse_args()
+
+    # Stages and their own thread pools all share one limiter, as leagues do in --leagues mode
+    limiter = RateLimiter(args.rate, args.max_in_flight)
+    set_client(HttpClient(cache_dir=args.cache_dir, limiter=limiter, deadline=args.deadline, hedge=args.hedge))
+
+    print("="*60)
+    print("Lakeland Cup Full Refresh")
+    print("="*60)
+
+    started_at = datetime.now(timezone.utc)
+    run_start = time.perf_counter()
+    _, records = run_dag(build_stages(not args.no_archive), max_workers=args.workers)
+
+    manifest = {
+        'started_at': started_at.isoformat(),
+        'duration_s': round(time.perf_counter() - run_start, 3),
+        'workers': args.workers,
+        'ok': all(record['status'] == 'ok' for record in records.values()),
+        'http': get_client().metrics.snapshot()['totals'],
+        'stages': records,
+    }
+    with open(args.manifest, 'w') as f:
+        json.dump(manifest, f, indent=2)
+
+    write_run_metrics(METRICS_FILE)
+
+    print("\n" + "="*60)
+    print(f"Run finished in {manifest['duration_s']}s, manifest saved to {args.manifest}")
+    for name, record in records.items():
+        if record['status'] != 'ok':
+            print(f"  {name}: {record['status']}")
+
+    if not manifest['ok']:
+        raise SystemExit(1)
+
+
+if __name__ == '__main__':
+    os.chdir(SCRIPTS_DIR)
+    main()
@@ -6,15 +6,31 @@ The spreadsheet has tabs for each draft year with:
 - Entry Draft Round 1 (picks 1-12)
 - Entry Draft Round 2 (picks 13-24)
 - Free Agent Draft (optional)
+
+Usage:
+    python fetch_draft_data.py
+    python fetch_draft_data.py --profile profiles/   # per-stage cProfile + memory
+    python fetch_draft_data.py --changes draft_changes.json   # also write what changed since the last run
+
+Only the draft sheets or only the prospects: python lakeland.py drafts / prospects
 """
 
+import argparse
 import csv
 import json
 import re
-import requests
+from collections import Counter
+from datetime import date
+from functools import cache
 from io import StringIO
 from pathlib import Path
 
+from changesets import build_changeset, draft_records, file_sha256, write_changeset
+from http_client import get_client, write_run_metrics
+from json_output import read_json
+from player_matching import PickIndex, PlayerIndex, build_search_index, normalize_name, resolve_draft_players, similarity
+from profiling import StageProfiler
+
 SPREADSHEET_ID = "1hySqKud8A6cqEZrYBmPjUGWngEvv6H4-6f1j4ZiAFFs"
 
 # Known draft year sheet gids (mapped by inspecting the spreadsheet)
@@ -33,11 +49,21 @@ DRAFT_SHEETS = {
 # Prospect protection sheet
 PROSPECTS_GID = "1885725030"
 
+# Minimum similarity for a sheet team name to count as a known team
+TEAM_MATCH_THRESHOLD = 0.75
+
+# Years a drafted player's rights stay with his team
+GOALIE_PROTECTION_YEARS = 5
+SKATER_PROTECTION_YEARS = 3
+
+# Goalies without a Yahoo position yet (never rostered), shared with protection/search/route.ts
+KNOWN_GOALIES_FILE = Path(__file__).parent.parent / "src" / "lib" / "known-goalies.json"
+
 
 def fetch_sheet(gid: str) -> list[list[str]]:
     """Fetch a sheet as CSV and return as list of rows."""
     url = f"https://docs.google.com/spreadsheets/d/{SPREADSHEET_ID}/export?format=csv&gid={gid}"
-    response = requests.get(url, allow_redirects=True)
+    response = get_client().get(url, allow_redirects=True, endpoint_type="sheet")
     response.raise_for_status()
 
     # Explicitly decode as UTF-8 to avoid encoding issues with special characters
@@ -153,8 +179,11 @@ def fetch_prospects() -> dict:
     print(f"Fetching prospect data (gid={PROSPECTS_GID})...")
 
     rows = fetch_sheet(PROSPECTS_GID)
+    return parse_prospects(rows)
+
 
-    # Parse the prospect sheet
+def parse_prospects(rows: list[list[str]]) -> dict:
+    """Parse the prospect protection sheet into team -> [prospects]."""
     # Structure: Team names as column headers, rows grouped by expiration year
     prospects = {}
     teams = []
@@ -195,33 +224,381 @@ def fetch_prospects() -> dict:
     return prospects
 
 
-def main():
-    output_dir = Path(__file__).parent
+def team_key(name: str) -> str:
+    """Normalized, singularized form of a team name for fuzzy comparison."""
+    words = normalize_name(name).replace("-", " ").split()
+    words = [re.sub(r"ies$", "y", word) for word in words]
+    return " ".join(re.sub(r"(?<=[^s])s$", "", word) for word in words)
 
-    # Fetch all draft data
-    drafts = fetch_all_drafts()
 
-    # Fetch prospect data
-    prospects = fetch_prospects()
+class TeamNameResolver:
+    """Map the sheet's abbreviated and misspelled team names to one spelling."""
+
+    def __init__(self, drafts: dict, known_teams: list[str] | None = None):
+        counts = Counter()
+        self.years = {}
+        for year, draft in drafts.items():
+            for picks in draft["entry_draft"].values():
+                for pick in picks:
+                    name = pick["team"]
+                    if len(name.split()) > 1:
+                        counts[name] += 1
+                        self.years.setdefault(name, set()).add(year)
+
+        # Known Yahoo names win, then the most common spelling on the sheet
+        known = set(known_teams or [])
+        ordered = sorted(known) + [name for name, _ in counts.most_common() if name not in known]
+
+        self.canonical = []
+        self.aliases = {}
+        for name in ordered:
+            match = self._closest(team_key(name), self.canonical)
+            if match:
+                self.aliases[name] = match
+                self.years.setdefault(match, set()).update(self.years.get(name, ()))
+            else:
+                self.canonical.append(name)
+                self.aliases[name] = name
+
+    def _closest(self, key: str, names: list[str], year: str | None = None) -> str | None:
+        best, best_score = None, TEAM_MATCH_THRESHOLD
+        for name in names:
+            candidate = team_key(name)
+            if f" {key} " in f" {candidate} ":
+                # Nicknames like "Goons" or "Ice-Crackers" are part of the full name
+                score = 0.9
+            elif " " in key:
+                score = similarity(key, candidate)
+            else:
+                score = max(similarity(key, word) for word in candidate.split(" "))
+            if year and year in self.years.get(name, ()):
+                score += 0.01
+            if score > best_score:
+                best, best_score = name, score
+        return best
+
+    def resolve(self, raw: str, year: str | None = None) -> str | None:
+        """Canonical team name for a raw sheet value."""
+        name = raw.strip()
+        if not name:
+            return None
+        if name in self.aliases:
+            return self.aliases[name]
+        match = self._closest(team_key(name), self.canonical, year)
+        self.aliases[name] = match or name
+        return self.aliases[name]
+
+
+def parse_pick_chain(value: str | None) -> list[str]:
+    """Split a from_team cell into previous owners, oldest first."""
+    if not value:
+        return []
+    if "<-" in value:
+        # "<- Winnipeg Bulldozers <- Slithering Goons" lists the newest owner first
+        parts = re.split(r"<-+", value)[::-1]
+    else:
+        parts = re.split(r"-+>|\s+-\s+|/", value)
+    return [part.strip() for part in parts if part.strip()]
+
+
+def parse_traded_to(value: str | None) -> str | None:
+    """Team a drafted player's rights were traded to, if named."""
+    if not value:
+        return None
+    value = re.sub(r"^to\s+", "", value.strip(), flags=re.IGNORECASE)
+    # A bare "X" only marks that something happened, not who got the pick
+    if value.lower() in ("x", "-", ""):
+        return None
+    return value
+
+
+def build_pick_ownership(drafts: dict, known_teams: list[str] | None = None) -> dict:
+    """
+    Resolve from_team/team/traded_to chains into a pick ownership graph.
+
+    Every pick gets its original owner, final owner and acquisition path, and
+    every team gets adjacency lists of the picks it received ("in") and gave
+    away ("out"), keyed by the other team. Picks without any team on the
+    sheet are listed under "unowned" instead.
+    """
+    resolver = TeamNameResolver(drafts, known_teams)
+    picks = {}
+    teams = {}
+    unowned = []
+
+    def team_entry(name):
+        if name not in teams:
+            teams[name] = {"in": {}, "out": {}, "drafted": [], "final": []}
+        return teams[name]
+
+    for year, draft in sorted(drafts.items()):
+        for round_name, round_picks in draft["entry_draft"].items():
+            round_num = int(round_name.split("_")[-1])
+            for pick in round_picks:
+                key = f"{year}-{round_num}-{pick['pick']}"
+
+                path = [resolver.resolve(name, year) for name in parse_pick_chain(pick["from_team"])]
+                path.append(resolver.resolve(pick["team"], year))
+                traded_to = parse_traded_to(pick["traded_to"])
+                if traded_to:
+                    path.append(resolver.resolve(traded_to, year))
+
+                # Drop blanks and consecutive repeats ("Goons" from "Slithering Goons")
+                deduped = []
+                for team in path:
+                    if team and (not deduped or team != deduped[-1]):
+                        deduped.append(team)
+                path = deduped
+                if not path:
+                    # A pick row without any team (blank or short cells)
+                    unowned.append(key)
+                    continue
+
+                drafted_by = resolver.resolve(pick["team"], year)
+                picks[key] = {
+                    "year": year,
+                    "round": round_num,
+                    "pick": pick["pick"],
+                    "player": pick["player"],
+                    "original_owner": path[0],
+                    "drafted_by": drafted_by,
+                    "final_owner": path[-1],
+                    "path": path,
+                }
+
+                team_entry(drafted_by)["drafted"].append(key)
+                team_entry(path[-1])["final"].append(key)
+                for giver, receiver in zip(path, path[1:]):
+                    team_entry(giver)["out"].setdefault(receiver, []).append(key)
+                    team_entry(receiver)["in"].setdefault(giver, []).append(key)
+
+    return {
+        "picks": picks,
+        "teams": dict(sorted(teams.items())),
+        "aliases": {raw: name for raw, name in sorted(resolver.aliases.items()) if raw != name},
+        "unowned": unowned,
+    }
+
+
+@cache
+def known_goalies() -> frozenset[str]:
+    """Normalized names from KNOWN_GOALIES_FILE."""
+    return frozenset(normalize_name(goalie) for goalie in read_json(KNOWN_GOALIES_FILE))
+
+
+def prospect_position(name: str, yahoo_position: str | None) -> str | None:
+    """Yahoo position, or G for a known goalie Yahoo doesn't have yet."""
+    if yahoo_position:
+        return yahoo_position
+    return "G" if normalize_name(name) in known_goalies() else None
+
+
+def protection_status(first_year: int, expires: int) -> dict:
+    """Status per season, from the draft until the first season without rights."""
+    return {str(year): "protected" if year <= expires else "expired" for year in range(first_year, expires + 2)}
+
+
+def build_protection_table(drafts: dict, prospects: dict, player_history: dict,
+                           known_teams: list[str] | None = None) -> dict:
+    """
+    Precompute every drafted player's protection, keyed like pick_ownership.
+
+    Picks must already carry player_id (see resolve_draft_players). Goalies
+    are protected for 5 years after their draft, skaters for 3. Where the
+    prospect sheet lists a player, its rights holder and rights_expire win
+    over the computed values; sheet prospects that match no pick (e.g. from
+    the free agent draft) are listed separately. "seasons" maps each season
+    to the pick keys protected in it, newest draft first.
+    """
+    resolver = TeamNameResolver(drafts, known_teams)
+    positions = {data["player_id"]: data.get("position") for data in player_history.values() if data.get("player_id")}
+    picks = {}
+    drafted = {}  # drafted name -> pick key, the latest draft winning
+
+    for year, draft in sorted(drafts.items()):
+        for round_name, round_picks in draft["entry_draft"].items():
+            round_num = int(round_name.split("_")[-1])
+            for pick in round_picks:
+                name = pick["player"]
+                if not normalize_name(name):
+                    continue
+                key = f"{year}-{round_num}-{pick['pick']}"
+                position = prospect_position(name, positions.get(pick.get("player_id")))
+                years = GOALIE_PROTECTION_YEARS if position == "G" else SKATER_PROTECTION_YEARS
+                picks[key] = {
+                    "player": name,
+                    "player_id": pick.get("player_id"),
+                    "team": resolver.resolve(parse_traded_to(pick["traded_to"]) or pick["team"], year),
+                    "draft_year": year,
+                    "round": round_num,
+                    "pick": pick["pick"],
+                    "position": position,
+                    "expires": int(year) + years,
+                    "source": "draft",
+                }
+                drafted[name] = key
+
+    # The sheet spells names differently ("L. Cooley"), so match it like Yahoo names
+    pick_index = PickIndex(drafted)
+    yahoo_index = PlayerIndex(player_history)
+    undrafted = []
+    for sheet_team, players in sorted(prospects.items()):
+        team = resolver.resolve(sheet_team)
+        for prospect in players:
+            key = pick_index.resolve(prospect["player"])["pick_key"]
+            if key:
+                entry = picks[key]
+            else:
+                player_id = yahoo_index.resolve(prospect["player"])["player_id"]
+                entry = {
+                    "player": prospect["player"],
+                    "player_id": player_id,
+                    "draft_year": None,
+                    "position": prospect_position(prospect["player"], positions.get(player_id)),
+                }
+                undrafted.append(entry)
+            entry.update(team=team, expires=int(prospect["rights_expire"]), source="sheet",
+                         sheet_name=prospect["player"])
+
+    seasons = {}
+    ordered = sorted(picks, key=lambda key: (-int(picks[key]["draft_year"]), picks[key]["round"], picks[key]["pick"]))
+    for key in ordered:
+        entry = picks[key]
+        entry["status"] = protection_status(int(entry["draft_year"]), entry["expires"])
+        for season, status in entry["status"].items():
+            if status == "protected":
+                seasons.setdefault(season, []).append(key)
+    for entry in undrafted:
+        years = GOALIE_PROTECTION_YEARS if entry["position"] == "G" else SKATER_PROTECTION_YEARS
+        entry["status"] = protection_status(entry["expires"] - years, entry["expires"])
+
+    return {
+        "picks": picks,
+        "undrafted": undrafted,
+        "seasons": dict(sorted(seasons.items())),
+    }
+
+
+def load_league_data(output_dir: Path) -> dict:
+    """Load league_data.json (or league_data.json.gz) if the Yahoo fetch has run."""
+    for league_file in (output_dir / "league_data.json", output_dir / "league_data.json.gz"):
+        if league_file.exists():
+            return read_json(league_file)
+    return {}
+
+
+def derive_draft_data(drafts: dict, prospects: dict, league_data: dict) -> tuple[dict, dict]:
+    """Join drafts with Yahoo data; returns (draft_data, search_index)."""
+    # Link picks to Yahoo player IDs
+    player_history = league_data.get("player_history", {})
+    if player_history:
+        print(f"Resolving draft picks against {len(player_history)} Yahoo players...")
+    else:
+        print("No league_data.json found, draft picks will stay unresolved")
+    resolution = resolve_draft_players(drafts, player_history)
+
+    # Resolve traded pick chains
+    known_teams = [team["name"] for team in league_data.get("teams", [])]
+    ownership = build_pick_ownership(drafts, known_teams)
+
+    # Protection per pick and season, so the API looks it up instead of recomputing it
+    protection = build_protection_table(drafts, prospects, player_history, known_teams)
 
     # Combine into one file
     data = {
         "drafts": drafts,
         "prospects": prospects,
+        "player_resolution": resolution,
+        "pick_ownership": ownership,
+        "protection": protection,
     }
 
-    # Save to JSON
+    # Prebuilt index for the protection search
+    search_index = build_search_index(drafts, player_history)
+
+    return data, search_index
+
+
+def write_draft_outputs(data: dict, search_index: dict, output_dir: Path) -> None:
+    """Write draft_data.json and search_index.json."""
     output_file = output_dir / "draft_data.json"
     with open(output_file, "w") as f:
         json.dump(data, f, indent=2)
 
     print(f"\nSaved draft data to {output_file}")
 
+    index_file = output_dir / "search_index.json"
+    with open(index_file, "w") as f:
+        json.dump(search_index, f, separators=(",", ":"))
+
+    print(f"Saved search index ({len(search_index['entries'])} players) to {index_file}")
+
+
+def print_draft_summary(data: dict) -> None:
+    """Print unresolved picks, pick trades and prospects per team."""
+    resolution = data["player_resolution"]
+    print(f"\nResolved {resolution['resolved']} picks, {resolution['unresolved_count']} unresolved:")
+    for entry in resolution["unresolved"]:
+        guess = f" (best guess: {entry['best_guess']}, {entry['confidence']})" if entry["best_guess"] else ""
+        print(f"  {entry['year']} {entry['round']} #{entry['pick']}: {entry['player']}{guess}")
+
+    print("\nPick trades by team (in / out):")
+    for team, entry in data["pick_ownership"]["teams"].items():
+        received = sum(len(keys) for keys in entry["in"].values())
+        sent = sum(len(keys) for keys in entry["out"].values())
+        print(f"  {team}: {received} / {sent}")
+    if data["pick_ownership"]["unowned"]:
+        print(f"  No team on the sheet: {', '.join(data['pick_ownership']['unowned'])}")
+
+    protection = data["protection"]
+    season = str(date.today().year)
+    protected = protection["seasons"].get(season, [])
+    from_sheet = sum(entry["source"] == "sheet" for entry in protection["picks"].values())
+    goalies = sum(protection["picks"][key]["position"] == "G" for key in protected)
+    print(f"\nProtection: {len(protected)} picks protected in {season} ({goalies} goalies), "
+          f"{from_sheet} picks with sheet rights, {len(protection['undrafted'])} sheet prospects without a pick")
+
     # Print prospect summary
     print("\nProspect summary:")
-    for team, players in sorted(prospects.items()):
+    for team, players in sorted(data["prospects"].items()):
         print(f"  {team}: {len(players)} prospects")
 
 
+def main(profile_dir: Path | None = None, changes_path: Path | None = None):
+    output_dir = Path(__file__).parent
+    profiler = StageProfiler(profile_dir)
+
+    # Fetch all draft data
+    with profiler.stage("sheets"):
+        drafts = fetch_all_drafts()
+
+    # Fetch prospect data
+    with profiler.stage("prospects"):
+        prospects = fetch_prospects()
+
+    with profiler.stage("derive"):
+        league_data = load_league_data(output_dir)
+        data, search_index = derive_draft_data(drafts, prospects, league_data)
+
+    with profiler.stage("write"):
+        draft_file = output_dir / "draft_data.json"
+        if changes_path:
+            old_sha = file_sha256(draft_file)
+            previous = json.loads(draft_file.read_text()) if draft_file.exists() else None
+            changeset = build_changeset(previous, data, draft_records)
+        write_draft_outputs(data, search_index, output_dir)
+        if changes_path:
+            write_changeset(changeset, changes_path, old_sha, draft_file)
+    print_draft_summary(data)
+    write_run_metrics(output_dir / "draft_metrics.json")
+    profiler.write_summary()
+
+
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="Fetch Lakeland Cup draft history from Google Sheets")
+    parser.add_argument("--profile", type=Path, metavar="DIR",
+                        help="Profile each stage and write pstats, collapsed stacks and memory peaks to DIR")
+    parser.add_argument("--changes", type=Path, metavar="FILE",
+                        help="Also write the picks and prospects that changed since the last run")
+    args = parser.parse_args()
+    main(args.profile, args.changes)
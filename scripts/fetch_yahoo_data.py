@@ -9,16 +9,47 @@ Setup:
 
 Usage:
     python fetch_yahoo_data.py
+    python fetch_yahoo_data.py --profile profiles/   # per-stage cProfile + memory
+    python fetch_yahoo_data.py --resume              # skip units finished by a failed run
+    python fetch_yahoo_data.py --incremental         # update rosters from league transactions
+    python fetch_yahoo_data.py --leagues leagues.json   # every league in a registry (see league_registry.py)
+    python fetch_yahoo_data.py --changes league_changes.json   # also write what changed since the last run
+    python fetch_yahoo_data.py --no-archive          # refetch seasons sealed in seasons.archive
+    python fetch_yahoo_data.py --gzip                # write league_data.json.gz
+
+Single tasks (one season, rosters, logos, franchise players) run through lakeland.py.
+
+To record a run for offline replay (see http_client.py):
+    LAKELAND_HTTP_MODE=record python fetch_yahoo_data.py
+    LAKELAND_HTTP_MODE=replay python fetch_yahoo_data.py
+
+To bound a run that hits a slow Yahoo (see http_client.py):
+    LAKELAND_RUN_DEADLINE=1800 LAKELAND_HEDGE=1 python fetch_yahoo_data.py
 """
 
+import argparse
+import asyncio
+import contextlib
+import fcntl
 import json
 import os
 import re
-import webbrowser
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from urllib.parse import urlparse, parse_qs
-import requests
 from pathlib import Path
 
+from changesets import build_changeset, file_sha256, league_records, write_changeset
+from checkpoint import Journal
+from http_client import HttpClient, RateLimiter, get_client, is_timeout, set_client, write_run_metrics
+from json_output import read_json, write_json
+from league_aggregates import build_aggregates
+from league_registry import load_registry
+from logo_store import LogoStore
+from profiling import StageProfiler
+from season_archive import SeasonArchive, seal_seasons
+
 # Lakeland Cup league keys by season (game_key, league_id)
 # League ID changes every year!
 LAKELAND_CUP_SEASONS = {
@@ -38,8 +69,31 @@ LAKELAND_CUP_SEASONS = {
     "2025-26": ("465", "2066"),
 }
 
+# The newest season is still being played; everything before it is final
+CURRENT_SEASON = max(LAKELAND_CUP_SEASONS)
+COMPLETED_LEAGUE_KEYS = {
+    f"{game_key}.l.{league_id}"
+    for season, (game_key, league_id) in LAKELAND_CUP_SEASONS.items()
+    if season != CURRENT_SEASON
+}
+
 CREDENTIALS_FILE = "yahoo_credentials.json"
+LEAGUE_DATA_FILE = "league_data.json"
 TOKEN_FILE = "yahoo_token.json"
+TOKEN_LOCK_FILE = "yahoo_token.json.lock"
+JOURNAL_FILE = "league_fetch.journal"
+# Completed seasons, sealed once fully fetched (see season_archive.py)
+ARCHIVE_FILE = "seasons.archive"
+# Regular-season scoreboard weeks fetched at the same time by fetch_season_regular_season
+WEEK_WORKERS = 6
+
+# Yahoo returns at most 25 players per players;player_keys=... request
+PLAYER_BATCH_SIZE = 25
+STATS_WORKERS = 6
+# Parsed stats of finished seasons, kept across runs since they never change
+STATS_CACHE_DIR = Path('player_stats_cache')
+# Refresh this many seconds before the access token expires
+TOKEN_REFRESH_MARGIN = 300
 REDIRECT_URI = "oob"  # Out-of-band - user will manually copy the code
 LOGOS_DIR = Path(__file__).parent.parent / "public" / "images" / "teams"
 
@@ -140,6 +194,24 @@ def extract_logo_colors(logo_path, num_colors=3):
         return None
 
 
+def is_completed_endpoint(endpoint):
+    """Whether an endpoint only reads a finished season (safe to cache)"""
+    match = re.search(r'\d+\.l\.\d+', endpoint)
+    return bool(match) and match.group() in COMPLETED_LEAGUE_KEYS
+
+
+def endpoint_type(endpoint):
+    """Metrics label of an API endpoint (standings, scoreboard_week, roster, ...)"""
+    path = endpoint.split('?')[0]
+    if path.startswith('users'):
+        return 'users'
+    last = path.rstrip('/').split('/')[-1]
+    name = last.split(';')[0]
+    if name == 'scoreboard' and 'week=' in last:
+        return 'scoreboard_week'
+    return name
+
+
 def slugify(text):
     """Convert text to a safe filename"""
     text = text.lower()
@@ -148,28 +220,15 @@ def slugify(text):
     return text.strip('-')
 
 
-def download_logo(url, team_name):
-    """Download a team logo and save it locally"""
+def download_logo(url):
+    """Download a team logo; returns its bytes (stored through LogoStore)"""
     if not url:
         return None
 
-    LOGOS_DIR.mkdir(parents=True, exist_ok=True)
-
-    # Create filename from team name
-    filename = f"{slugify(team_name)}.png"
-    filepath = LOGOS_DIR / filename
-
-    # Skip if already downloaded
-    if filepath.exists():
-        print(f"      Logo exists: {filename}")
-        return filename
-
     try:
-        response = requests.get(url, timeout=10)
+        response = get_client().get(url, endpoint_type='logo')
         if response.status_code == 200:
-            filepath.write_bytes(response.content)
-            print(f"      Downloaded: {filename}")
-            return filename
+            return response.content
         else:
             print(f"      Failed to download logo: {response.status_code}")
             return None
@@ -184,6 +243,8 @@ class YahooFantasyAPI:
         self.client_secret = None
         self.access_token = None
         self.refresh_token = None
+        self.expires_at = None
+        self._refresh_lock = threading.Lock()
         self.load_credentials()
         self.load_token()
 
@@ -195,6 +256,10 @@ class YahooFantasyAPI:
                 self.client_id = creds.get('client_id')
                 self.client_secret = creds.get('client_secret')
 
+        if get_client().offline and not self.client_id:
+            # Replayed responses don't check credentials
+            self.client_id = self.client_secret = 'offline'
+
         if not self.client_id or not self.client_secret:
             print("\n" + "="*60)
             print("Yahoo API credentials not found!")
@@ -215,25 +280,77 @@ class YahooFantasyAPI:
                 token = json.load(f)
                 self.access_token = token.get('access_token')
                 self.refresh_token = token.get('refresh_token')
+                self.expires_at = token.get('expires_at')
+
+        if get_client().offline and not self.access_token:
+            self.access_token = 'offline'
 
     def save_token(self):
-        """Save token to file"""
-        with open(TOKEN_FILE, 'w') as f:
+        """Save token to file (atomically, so readers never see half a file)"""
+        tmp_path = f"{TOKEN_FILE}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w') as f:
             json.dump({
                 'access_token': self.access_token,
-                'refresh_token': self.refresh_token
+                'refresh_token': self.refresh_token,
+                'expires_at': self.expires_at
             }, f, indent=2)
+        os.replace(tmp_path, TOKEN_FILE)
+
+    def set_token(self, token):
+        """Take the fields of a token endpoint response"""
+        self.access_token = token['access_token']
+        self.refresh_token = token.get('refresh_token', self.refresh_token)
+        expires_in = token.get('expires_in')
+        self.expires_at = time.time() + int(expires_in) if expires_in else None
+
+    def token_is_fresh(self):
+        """True if the access token is known to outlive the refresh margin"""
+        if get_client().offline:
+            return True
+        return bool(self.expires_at) and time.time() < self.expires_at - TOKEN_REFRESH_MARGIN
+
+    @contextlib.contextmanager
+    def token_lock(self):
+        """Serialize token refreshes across threads and processes"""
+        with self._refresh_lock, open(TOKEN_LOCK_FILE, 'w') as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def ensure_token(self, stale_token=None):
+        """
+        Refresh the access token if it is about to expire (or was rejected).
+
+        Whoever holds the lock first refreshes; everyone else re-reads the
+        token file and picks up the new token instead of refreshing again.
+        """
+        if stale_token is None and (self.token_is_fresh() or not self.expires_at):
+            # Tokens of unknown age are only refreshed once Yahoo rejects them
+            return True
+        stale_token = stale_token or self.access_token
+
+        with self.token_lock():
+            self.load_token()
+            if self.access_token != stale_token and self.token_is_fresh():
+                return True
+            return self.do_refresh_token()
 
     def authenticate(self):
         """Perform OAuth2 authentication"""
         if self.access_token:
-            # Try to use existing token
-            if self.test_token():
+            if self.token_is_fresh():
+                # No round trip needed while the saved token is still valid
+                print("Using existing token")
+                return
+            elif not self.expires_at and self.test_token():
+                # Token saved before expiry was recorded
                 print("Using existing token")
                 return
             elif self.refresh_token:
                 # Try to refresh
-                if self.do_refresh_token():
+                if self.ensure_token(stale_token=self.access_token):
                     print("Token refreshed")
                     return
 
@@ -255,6 +372,7 @@ class YahooFantasyAPI:
         print(f"\n{auth_url}\n")
         print("="*60)
 
+        import webbrowser
         webbrowser.open(auth_url)
 
         print("\nAfter authorizing, Yahoo will show you a code.")
@@ -269,8 +387,9 @@ class YahooFantasyAPI:
 
     def exchange_code(self, code):
         """Exchange auth code for access token"""
-        response = requests.post(
+        response = get_client().post(
             "https://api.login.yahoo.com/oauth2/get_token",
+            endpoint_type='token',
             data={
                 'client_id': self.client_id,
                 'client_secret': self.client_secret,
@@ -281,19 +400,19 @@ class YahooFantasyAPI:
         )
 
         if response.status_code == 200:
-            token = response.json()
-            self.access_token = token['access_token']
-            self.refresh_token = token.get('refresh_token')
-            self.save_token()
+            with self.token_lock():
+                self.set_token(response.json())
+                self.save_token()
             print("Authentication successful!")
         else:
             print(f"Token exchange failed: {response.text}")
             raise SystemExit(1)
 
     def do_refresh_token(self):
-        """Refresh the access token"""
-        response = requests.post(
+        """Refresh the access token (callers hold token_lock)"""
+        response = get_client().post(
             "https://api.login.yahoo.com/oauth2/get_token",
+            endpoint_type='token',
             data={
                 'client_id': self.client_id,
                 'client_secret': self.client_secret,
@@ -303,9 +422,7 @@ class YahooFantasyAPI:
         )
 
         if response.status_code == 200:
-            token = response.json()
-            self.access_token = token['access_token']
-            self.refresh_token = token.get('refresh_token', self.refresh_token)
+            self.set_token(response.json())
             self.save_token()
             return True
         return False
@@ -313,28 +430,43 @@ class YahooFantasyAPI:
     def test_token(self):
         """Test if current token is valid"""
         try:
-            response = requests.get(
+            response = get_client().get(
                 "https://fantasysports.yahooapis.com/fantasy/v2/users;use_login=1/games;game_keys=nhl",
                 headers={'Authorization': f'Bearer {self.access_token}'},
-                params={'format': 'json'}
+                params={'format': 'json'},
+                endpoint_type='users'
             )
             return response.status_code == 200
         except:
             return False
 
-    def api_request(self, endpoint):
+    def api_request(self, endpoint, timeout_retries=1):
         """Make an authenticated API request"""
         url = f"https://fantasysports.yahooapis.com/fantasy/v2/{endpoint}"
-        response = requests.get(
-            url,
-            headers={'Authorization': f'Bearer {self.access_token}'},
-            params={'format': 'json'}
-        )
+        self.ensure_token()
+        token = self.access_token
+        try:
+            response = get_client().get(
+                url,
+                headers={'Authorization': f'Bearer {token}'},
+                params={'format': 'json'},
+                cache=is_completed_endpoint(endpoint),
+                endpoint_type=endpoint_type(endpoint)
+            )
+        except Exception as e:
+            if not is_timeout(e):
+                raise
+            if timeout_retries:
+                get_client().metrics.retry(endpoint_type(endpoint))
+                return self.api_request(endpoint, timeout_retries - 1)
+            print(f"API timeout: {endpoint}")
+            return None
 
         if response.status_code == 401:
-            # Token expired, try refresh
-            if self.do_refresh_token():
-                return self.api_request(endpoint)
+            # Token expired early or was revoked, try refresh
+            if self.ensure_token(stale_token=token):
+                get_client().metrics.retry(endpoint_type(endpoint))
+                return self.api_request(endpoint, timeout_retries)
             raise Exception("Authentication failed")
 
         if response.status_code != 200:
@@ -361,72 +493,19 @@ class YahooFantasyAPI:
             return None
 
         try:
-            league = data['fantasy_content']['league']
-            scoreboard = None
-
-            if isinstance(league, list):
-                for item in league:
-                    if isinstance(item, dict) and 'scoreboard' in item:
-                        scoreboard = item['scoreboard']
-                        break
-            else:
-                scoreboard = league.get('scoreboard')
-
-            if not scoreboard:
-                return None
-
-            # Extract matchups
-            matchups_data = scoreboard.get('0', {}).get('matchups', {})
-            if not matchups_data:
-                return None
-
             matchups = []
-            count = matchups_data.get('count', 0)
-
-            for i in range(count):
-                matchup = matchups_data.get(str(i), {}).get('matchup', {})
-                if matchup:
-                    is_playoff = matchup.get('is_playoffs') == '1'
-                    is_consolation = matchup.get('is_consolation') == '1'
-                    week = matchup.get('week')
-
-                    teams_data = matchup.get('0', {}).get('teams', {})
-                    teams = []
-
-                    for j in range(teams_data.get('count', 0)):
-                        team_entry = teams_data.get(str(j), {}).get('team', [])
-                        if team_entry:
-                            team_info = team_entry[0] if team_entry else []
-                            points_info = team_entry[1] if len(team_entry) > 1 else {}
-
-                            name = None
-                            for item in team_info:
-                                if isinstance(item, dict) and 'name' in item:
-                                    name = item['name']
-                                    break
-
-                            points = points_info.get('team_points', {}).get('total') if isinstance(points_info, dict) else None
-
-                            teams.append({
-                                'name': name,
-                                'points': float(points) if points else None
-                            })
-
-                    if teams:
-                        # Determine winner
-                        winner = None
-                        if len(teams) == 2 and teams[0]['points'] and teams[1]['points']:
-                            winner = teams[0]['name'] if teams[0]['points'] > teams[1]['points'] else teams[1]['name']
-
-                        matchups.append({
-                            'week': week,
-                            'is_playoff': is_playoff,
-                            'is_consolation': is_consolation,
-                            'teams': teams,
-                            'winner': winner
-                        })
-
-            return matchups
+            for matchup in iter_scoreboard_matchups(data):
+                teams = parse_matchup_teams(matchup)
+                if teams:
+                    matchups.append({
+                        'week': matchup.get('week'),
+                        'is_playoff': matchup.get('is_playoffs') == '1',
+                        'is_consolation': matchup.get('is_consolation') == '1',
+                        'teams': teams,
+                        'winner': matchup_winner(teams)
+                    })
+
+            return matchups or None
 
         except (KeyError, IndexError, TypeError) as e:
             print(f"Error parsing bracket: {e}")
@@ -438,92 +517,65 @@ class YahooFantasyAPI:
 
         # First get settings to find playoff weeks
         settings = self.get_league_settings(game_key, league_id)
-        playoff_start_week = None
-
-        if settings:
-            try:
-                league = settings['fantasy_content']['league']
-                if isinstance(league, list):
-                    for item in league:
-                        if isinstance(item, dict) and 'settings' in item:
-                            s = item['settings'][0]
-                            playoff_start_week = s.get('playoff_start_week')
-                            break
-            except:
-                pass
+        playoff_start_week = parse_playoff_start_week(settings)
 
         # Get matchups for playoff weeks
         playoff_matchups = []
 
-        if playoff_start_week:
-            for week in range(int(playoff_start_week), int(playoff_start_week) + 4):  # Usually 3-4 playoff weeks
-                endpoint = f"league/{league_key}/scoreboard;week={week}"
-                data = self.api_request(endpoint)
-
-                if data:
-                    try:
-                        league = data['fantasy_content']['league']
-                        scoreboard = None
-
-                        if isinstance(league, list):
-                            for item in league:
-                                if isinstance(item, dict) and 'scoreboard' in item:
-                                    scoreboard = item['scoreboard']
-                                    break
-
-                        if scoreboard:
-                            matchups_data = scoreboard.get('0', {}).get('matchups', {})
-                            count = matchups_data.get('count', 0)
-
-                            for i in range(count):
-                                matchup = matchups_data.get(str(i), {}).get('matchup', {})
-                                if matchup:
-                                    is_playoff = matchup.get('is_playoffs') == '1'
-                                    is_consolation = matchup.get('is_consolation') == '1'
-
-                                    if is_playoff and not is_consolation:
-                                        teams_data = matchup.get('0', {}).get('teams', {})
-                                        teams = []
-
-                                        for j in range(teams_data.get('count', 0)):
-                                            team_entry = teams_data.get(str(j), {}).get('team', [])
-                                            if team_entry:
-                                                team_info = team_entry[0] if team_entry else []
-                                                points_info = team_entry[1] if len(team_entry) > 1 else {}
-
-                                                name = None
-                                                for item in team_info:
-                                                    if isinstance(item, dict) and 'name' in item:
-                                                        name = item['name']
-                                                        break
-
-                                                points = None
-                                                if isinstance(points_info, dict):
-                                                    points = points_info.get('team_points', {}).get('total')
-
-                                                teams.append({
-                                                    'name': name,
-                                                    'points': float(points) if points else None
-                                                })
-
-                                        if len(teams) == 2:
-                                            winner = None
-                                            if teams[0]['points'] and teams[1]['points']:
-                                                winner = teams[0]['name'] if teams[0]['points'] > teams[1]['points'] else teams[1]['name']
-
-                                            playoff_matchups.append({
-                                                'week': week,
-                                                'round': week - int(playoff_start_week) + 1,
-                                                'teams': [t['name'] for t in teams],
-                                                'scores': [t['points'] for t in teams],
-                                                'winner': winner
-                                            })
-                    except Exception as e:
-                        print(f"    Error parsing week {week}: {e}")
-                        continue
+        for week in playoff_weeks(playoff_start_week):
+            endpoint = f"league/{league_key}/scoreboard;week={week}"
+            data = self.api_request(endpoint)
+
+            if data:
+                try:
+                    playoff_matchups.extend(parse_playoff_scoreboard(data, week, playoff_start_week))
+                except Exception as e:
+                    print(f"    Error parsing week {week}: {e}")
+                    continue
 
         return playoff_matchups if playoff_matchups else None
 
+    def get_regular_season(self, game_key, league_id, workers=WEEK_WORKERS):
+        """Get every regular-season matchup as week -> [matchups]"""
+        league_key = f"{game_key}.l.{league_id}"
+        settings = self.get_league_settings(game_key, league_id)
+
+        def fetch_week(week):
+            data = self.api_request(f"league/{league_key}/scoreboard;week={week}")
+            if not data:
+                return week, []
+            try:
+                return week, parse_week_scoreboard(data)
+            except Exception as e:
+                print(f"    Error parsing week {week}: {e}")
+                return week, []
+
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            weeks = dict(pool.map(fetch_week, regular_season_weeks(settings) or []))
+
+        return weeks if any(weeks.values()) else None
+
+    def get_player_stats(self, game_key, league_id, player_ids):
+        """Get season stats of up to PLAYER_BATCH_SIZE players as player_id -> {stat_id: value}"""
+        league_key = f"{game_key}.l.{league_id}"
+        player_keys = ','.join(f"{game_key}.p.{player_id}" for player_id in player_ids)
+        endpoint = f"league/{league_key}/players;player_keys={player_keys}/stats;type=season"
+
+        data = self.api_request(endpoint)
+        if not data:
+            return None
+        return parse_player_stats(data)
+
+    def get_transactions(self, game_key, league_id):
+        """Get the league's add/drop/trade transactions, oldest first"""
+        league_key = f"{game_key}.l.{league_id}"
+        endpoint = f"league/{league_key}/transactions;types=add,drop,trade"
+
+        data = self.api_request(endpoint)
+        if not data:
+            return None
+        return parse_transactions(data)
+
     def get_league_teams_with_keys(self, game_key, league_id):
         """Get all teams in a league with their team keys"""
         league_key = f"{game_key}.l.{league_id}"
@@ -532,55 +584,7 @@ class YahooFantasyAPI:
         data = self.api_request(endpoint)
         if not data:
             return None
-
-        try:
-            league = data['fantasy_content']['league']
-            if isinstance(league, list):
-                teams_data = None
-                for item in league:
-                    if isinstance(item, dict) and 'teams' in item:
-                        teams_data = item['teams']
-                        break
-                if not teams_data:
-                    return None
-            else:
-                teams_data = league.get('teams')
-
-            results = []
-            count = teams_data.get('count', 0)
-            for i in range(count):
-                team_data = teams_data.get(str(i))
-                if team_data:
-                    team = team_data['team']
-                    team_info = team[0]
-
-                    team_key = None
-                    name = None
-                    manager = None
-                    for item in team_info:
-                        if isinstance(item, dict):
-                            if 'team_key' in item:
-                                team_key = item['team_key']
-                            if 'name' in item:
-                                name = item['name']
-                            if 'managers' in item:
-                                managers = item['managers']
-                                if isinstance(managers, list) and managers:
-                                    manager = managers[0].get('manager', {}).get('nickname')
-                                elif isinstance(managers, dict):
-                                    manager = managers.get('manager', {}).get('nickname')
-
-                    if team_key and name:
-                        results.append({
-                            'team_key': team_key,
-                            'name': name,
-                            'manager': manager
-                        })
-
-            return results
-        except (KeyError, IndexError, TypeError) as e:
-            print(f"Error parsing teams: {e}")
-            return None
+        return parse_league_teams(data)
 
     def get_team_roster(self, team_key):
         """Get the roster for a specific team"""
@@ -589,69 +593,7 @@ class YahooFantasyAPI:
         data = self.api_request(endpoint)
         if not data:
             return None
-
-        try:
-            team = data['fantasy_content']['team']
-            roster_data = None
-
-            if isinstance(team, list):
-                for item in team:
-                    if isinstance(item, dict) and 'roster' in item:
-                        roster_data = item['roster']
-                        break
-            else:
-                roster_data = team.get('roster')
-
-            if not roster_data:
-                return None
-
-            # Get coverage type (usually "week" or "date")
-            coverage = roster_data.get('0', {}).get('players', {})
-            if not coverage:
-                coverage = roster_data.get('players', {})
-
-            players = []
-            count = coverage.get('count', 0)
-
-            for i in range(count):
-                player_data = coverage.get(str(i))
-                if player_data:
-                    player = player_data.get('player', [])
-                    if player:
-                        player_info = player[0] if isinstance(player[0], list) else player
-
-                        player_id = None
-                        name = None
-                        position = None
-                        jersey_number = None
-
-                        for item in player_info:
-                            if isinstance(item, dict):
-                                if 'player_id' in item:
-                                    player_id = item['player_id']
-                                if 'name' in item:
-                                    name = item['name'].get('full', item['name'].get('first', '') + ' ' + item['name'].get('last', ''))
-                                if 'primary_position' in item:
-                                    position = item['primary_position']
-                                if 'display_position' in item and not position:
-                                    position = item['display_position']
-                                if 'uniform_number' in item:
-                                    jersey_number = item['uniform_number']
-
-                        if name:
-                            players.append({
-                                'player_id': player_id,
-                                'name': name,
-                                'position': position,
-                                'jersey_number': jersey_number
-                            })
-
-            return players
-        except (KeyError, IndexError, TypeError) as e:
-            print(f"Error parsing roster: {e}")
-            import traceback
-            traceback.print_exc()
-            return None
+        return parse_team_roster(data)
 
     def get_league_standings(self, game_key, league_id):
         """Get standings for a specific league/season"""
@@ -661,73 +603,526 @@ class YahooFantasyAPI:
         data = self.api_request(endpoint)
         if not data:
             return None
+        return parse_standings(data)
+
+
+def league_section(data, key):
+    """Find a section (e.g. 'standings') in Yahoo's nested league response"""
+    league = data['fantasy_content']['league']
+    # Handle Yahoo's weird nested array format
+    if isinstance(league, list):
+        for item in league:
+            if isinstance(item, dict) and key in item:
+                return item[key]
+        return None
+    return league.get(key)
+
+
+def parse_playoff_start_week(settings):
+    """Read playoff_start_week from a league settings response"""
+    if not settings:
+        return None
+    try:
+        league = settings['fantasy_content']['league']
+        if isinstance(league, list):
+            for item in league:
+                if isinstance(item, dict) and 'settings' in item:
+                    return item['settings'][0].get('playoff_start_week')
+    except:
+        pass
+    return None
+
+
+def regular_season_weeks(settings):
+    """Regular-season scoreboard weeks that have been played, or None if the settings can't be read"""
+    if not settings:
+        return []
+    try:
+        league = settings['fantasy_content']['league']
+        meta = league[0] if isinstance(league, list) and league and isinstance(league[0], dict) else {}
+
+        playoff_start_week = parse_playoff_start_week(settings)
+        if playoff_start_week:
+            last = int(playoff_start_week) - 1
+        elif meta.get('end_week'):
+            last = int(meta['end_week'])
+        else:
+            return []
+
+        if meta.get('current_week') and not int(meta.get('is_finished') or 0):
+            # Later weeks of a running season have no scores yet
+            last = min(last, int(meta['current_week']))
+
+        return list(range(int(meta.get('start_week') or 1), last + 1))
+    except (KeyError, IndexError, TypeError, ValueError) as e:
+        print(f"Error parsing regular season weeks: {e}")
+        return None
+
+
+def playoff_weeks(playoff_start_week):
+    """Scoreboard weeks to fetch for the playoffs"""
+    if not playoff_start_week:
+        return []
+    start = int(playoff_start_week)
+    return list(range(start, start + 4))  # Usually 3-4 playoff weeks
 
-        try:
-            league = data['fantasy_content']['league']
-            # Handle Yahoo's weird nested array format
-            if isinstance(league, list):
-                standings_data = None
-                for item in league:
-                    if isinstance(item, dict) and 'standings' in item:
-                        standings_data = item['standings']
-                        break
-                if not standings_data:
-                    return None
-            else:
-                standings_data = league.get('standings')
-
-            teams = standings_data[0]['teams']
-
-            results = []
-            # Yahoo returns teams as {"0": {...}, "1": {...}, "count": N}
-            count = teams.get('count', 0)
-            for i in range(count):
-                team_data = teams.get(str(i))
-                if team_data:
-                    team = team_data['team']
-                    # Team data is also nested weirdly
-                    team_info = team[0]
-                    standings_info = team[2] if len(team) > 2 else {}
-
-                    name = None
-                    manager = None
-                    logo_url = None
-                    for item in team_info:
-                        if isinstance(item, dict):
-                            if 'name' in item:
-                                name = item['name']
-                            if 'managers' in item:
-                                managers = item['managers']
-                                if isinstance(managers, list) and managers:
-                                    manager = managers[0].get('manager', {}).get('nickname')
-                                elif isinstance(managers, dict):
-                                    manager = managers.get('manager', {}).get('nickname')
-                            if 'team_logos' in item:
-                                logos = item['team_logos']
-                                if isinstance(logos, list) and logos:
-                                    logo_url = logos[0].get('team_logo', {}).get('url')
-                                elif isinstance(logos, dict):
-                                    logo_url = logos.get('team_logo', {}).get('url')
-
-                    rank = None
-                    if isinstance(standings_info, dict) and 'team_standings' in standings_info:
-                        rank = standings_info['team_standings'].get('rank')
 
+def iter_scoreboard_matchups(data):
+    """Yield the raw matchup dicts of a scoreboard response"""
+    scoreboard = league_section(data, 'scoreboard')
+    if not scoreboard:
+        return
+
+    matchups_data = scoreboard.get('0', {}).get('matchups', {})
+    if not matchups_data:
+        return
+
+    for i in range(matchups_data.get('count', 0)):
+        matchup = matchups_data.get(str(i), {}).get('matchup', {})
+        if matchup:
+            yield matchup
+
+
+def parse_matchup_teams(matchup):
+    """Team names and points of one matchup as [{name, points}]"""
+    teams_data = matchup.get('0', {}).get('teams', {})
+    teams = []
+
+    for j in range(teams_data.get('count', 0)):
+        team_entry = teams_data.get(str(j), {}).get('team', [])
+        if team_entry:
+            team_info = team_entry[0] if team_entry else []
+            points_info = team_entry[1] if len(team_entry) > 1 else {}
+
+            name = None
+            for item in team_info:
+                if isinstance(item, dict) and 'name' in item:
+                    name = item['name']
+                    break
+
+            points = None
+            if isinstance(points_info, dict):
+                points = points_info.get('team_points', {}).get('total')
+
+            teams.append({
+                'name': name,
+                'points': float(points) if points else None
+            })
+
+    return teams
+
+
+def matchup_winner(teams):
+    """Name of the team with more points, if both scored"""
+    if len(teams) == 2 and teams[0]['points'] and teams[1]['points']:
+        return teams[0]['name'] if teams[0]['points'] > teams[1]['points'] else teams[1]['name']
+    return None
+
+
+def parse_playoff_scoreboard(data, week, playoff_start_week):
+    """Championship-bracket matchups of one scoreboard week"""
+    matchups = []
+    for matchup in iter_scoreboard_matchups(data):
+        is_playoff = matchup.get('is_playoffs') == '1'
+        is_consolation = matchup.get('is_consolation') == '1'
+        if not is_playoff or is_consolation:
+            continue
+
+        teams = parse_matchup_teams(matchup)
+        if len(teams) == 2:
+            matchups.append({
+                'week': week,
+                'round': week - int(playoff_start_week) + 1,
+                'teams': [t['name'] for t in teams],
+                'scores': [t['points'] for t in teams],
+                'winner': matchup_winner(teams)
+            })
+
+    return matchups
+
+
+def parse_week_scoreboard(data):
+    """Regular-season matchups of one scoreboard week"""
+    matchups = []
+    for matchup in iter_scoreboard_matchups(data):
+        if matchup.get('is_playoffs') == '1':
+            continue
+
+        teams = parse_matchup_teams(matchup)
+        if len(teams) == 2:
+            matchups.append({
+                'teams': [t['name'] for t in teams],
+                'scores': [t['points'] for t in teams],
+                'winner': matchup_winner(teams)
+            })
+
+    return matchups
+
+
+def compact_regular_season(weeks):
+    """
+    Pack a season's weekly matchups for league_data.json.
+
+    Team names are listed once under 'teams'; each week maps to rows of
+    [team_a, team_b, points_a, points_b] with teams as indexes into that
+    list. Winners are left out because the points decide them.
+    """
+    if not weeks:
+        return None
+    names = sorted({name for matchups in weeks.values() for m in matchups for name in m['teams'] if name})
+    index = {name: i for i, name in enumerate(names)}
+    return {
+        'teams': names,
+        'weeks': {
+            str(week): [[index.get(m['teams'][0]), index.get(m['teams'][1]), *m['scores']] for m in weeks[week]]
+            for week in sorted(weeks)
+        }
+    }
+
+
+def expand_regular_season(compact):
+    """Unpack a compact_regular_season entry back into week -> [matchups], as parse_week_scoreboard returns them"""
+    if not compact:
+        return None
+    names = compact['teams']
+    weeks = {}
+    for week, rows in compact['weeks'].items():
+        matchups = []
+        for a, b, points_a, points_b in rows:
+            teams = [{'name': names[i] if i is not None else None, 'points': points}
+                     for i, points in ((a, points_a), (b, points_b))]
+            matchups.append({
+                'teams': [t['name'] for t in teams],
+                'scores': [t['points'] for t in teams],
+                'winner': matchup_winner(teams)
+            })
+        weeks[int(week)] = matchups
+    return weeks
+
+
+def finished_weeks(previous):
+    """
+    season -> {week: matchups} of a previous league_data.json that can't change any more.
+
+    Every stored week but a season's newest was already over when it was
+    fetched; the newest may have been in progress, so it is fetched again.
+    """
+    finished = {}
+    for season, compact in (previous or {}).get('regular_season', {}).items():
+        weeks = expand_regular_season(compact) or {}
+        if weeks:
+            newest = max(weeks)
+            finished[season] = {week: matchups for week, matchups in weeks.items() if week != newest}
+    return finished
+
+
+def reuse_weeks(regular_season_by_season, standings_by_season, stored):
+    """Fill in the weeks the pipeline skipped (see finished_weeks) of every fetched season"""
+    for season, weeks in stored.items():
+        if not weeks or not standings_by_season.get(season):
+            continue
+        merged = {**weeks, **(regular_season_by_season.get(season) or {})}
+        regular_season_by_season[season] = dict(sorted(merged.items()))
+        print(f"  {season}: reused {len(weeks)} finished weeks")
+
+
+def parse_manager(managers):
+    """Nickname of the first manager in a 'managers' entry"""
+    if isinstance(managers, list) and managers:
+        return managers[0].get('manager', {}).get('nickname')
+    elif isinstance(managers, dict):
+        return managers.get('manager', {}).get('nickname')
+    return None
+
+
+def parse_league_teams(data):
+    """Teams of a league/teams response as [{team_key, name, manager}]"""
+    try:
+        teams_data = league_section(data, 'teams')
+        if not teams_data:
+            return None
+
+        results = []
+        count = teams_data.get('count', 0)
+        for i in range(count):
+            team_data = teams_data.get(str(i))
+            if team_data:
+                team = team_data['team']
+                team_info = team[0]
+
+                team_key = None
+                name = None
+                manager = None
+                for item in team_info:
+                    if isinstance(item, dict):
+                        if 'team_key' in item:
+                            team_key = item['team_key']
+                        if 'name' in item:
+                            name = item['name']
+                        if 'managers' in item:
+                            manager = parse_manager(item['managers'])
+
+                if team_key and name:
                     results.append({
-                        'rank': int(rank) if rank else i + 1,
+                        'team_key': team_key,
                         'name': name,
-                        'manager': manager,
-                        'logo_url': logo_url
+                        'manager': manager
                     })
 
-            # Sort by rank
-            results.sort(key=lambda x: x['rank'])
-            return results
+        return results
+    except (KeyError, IndexError, TypeError) as e:
+        print(f"Error parsing teams: {e}")
+        return None
 
-        except (KeyError, IndexError, TypeError) as e:
-            print(f"Error parsing standings: {e}")
+
+def parse_player(player_info):
+    """Flatten one Yahoo player entry to {player_id, name, position, jersey_number}"""
+    player_id = None
+    name = None
+    position = None
+    jersey_number = None
+
+    for item in player_info:
+        if isinstance(item, dict):
+            if 'player_id' in item:
+                player_id = item['player_id']
+            if 'name' in item:
+                name = item['name'].get('full', item['name'].get('first', '') + ' ' + item['name'].get('last', ''))
+            if 'primary_position' in item:
+                position = item['primary_position']
+            if 'display_position' in item and not position:
+                position = item['display_position']
+            if 'uniform_number' in item:
+                jersey_number = item['uniform_number']
+
+    return {
+        'player_id': player_id,
+        'name': name,
+        'position': position,
+        'jersey_number': jersey_number
+    }
+
+
+def stat_value(value):
+    """Yahoo stat value as a number ('-' means no stat)"""
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        return None
+    return int(number) if number.is_integer() else number
+
+
+def parse_stat_categories(settings):
+    """stat_id -> display name from a league settings response"""
+    categories = {}
+    try:
+        for item in league_section(settings, 'settings') or []:
+            for entry in item.get('stat_categories', {}).get('stats', []):
+                stat = entry.get('stat', {})
+                categories[str(stat.get('stat_id'))] = stat.get('display_name') or stat.get('name')
+    except (KeyError, TypeError, AttributeError):
+        pass
+    return categories
+
+
+def parse_player_stats(data):
+    """Season stats of a players;player_keys=.../stats response as player_id -> {stat_id: value}"""
+    players = league_section(data, 'players') or {}
+    stats_by_player = {}
+
+    for i in range(players.get('count', 0)):
+        player = players.get(str(i), {}).get('player', [])
+        if not player:
+            continue
+        player_info = player[0] if isinstance(player[0], list) else player
+        player_id = parse_player(player_info)['player_id']
+
+        stats = {}
+        for part in player[1:]:
+            if not isinstance(part, dict):
+                continue
+            for entry in part.get('player_stats', {}).get('stats', []):
+                stat = entry.get('stat', {})
+                stats[str(stat.get('stat_id'))] = stat_value(stat.get('value'))
+            if 'player_points' in part:
+                stats['points'] = stat_value(part['player_points'].get('total'))
+
+        if player_id:
+            stats_by_player[player_id] = stats
+
+    return stats_by_player
+
+
+def parse_team_roster(data):
+    """Players of a team/roster response"""
+    try:
+        team = data['fantasy_content']['team']
+        roster_data = None
+
+        if isinstance(team, list):
+            for item in team:
+                if isinstance(item, dict) and 'roster' in item:
+                    roster_data = item['roster']
+                    break
+        else:
+            roster_data = team.get('roster')
+
+        if not roster_data:
+            return None
+
+        # Get coverage type (usually "week" or "date")
+        coverage = roster_data.get('0', {}).get('players', {})
+        if not coverage:
+            coverage = roster_data.get('players', {})
+
+        players = []
+        count = coverage.get('count', 0)
+
+        for i in range(count):
+            player_data = coverage.get(str(i))
+            if player_data:
+                player = player_data.get('player', [])
+                if player:
+                    player_info = player[0] if isinstance(player[0], list) else player
+                    parsed = parse_player(player_info)
+                    if parsed['name']:
+                        players.append(parsed)
+
+        return players
+    except (KeyError, IndexError, TypeError) as e:
+        print(f"Error parsing roster: {e}")
+        import traceback
+        traceback.print_exc()
+        return None
+
+
+def parse_transactions(data):
+    """Successful moves of a league/transactions response as [{id, type, timestamp, moves}], oldest first"""
+    section = league_section(data, 'transactions') or {}
+    transactions = []
+
+    for i in range(section.get('count', 0)):
+        entry = section.get(str(i), {}).get('transaction', [])
+        if not entry or entry[0].get('status') != 'successful':
+            continue
+        meta = entry[0]
+        players = entry[1].get('players', {}) if len(entry) > 1 and isinstance(entry[1], dict) else {}
+
+        moves = []
+        for j in range(players.get('count', 0)):
+            player = players.get(str(j), {}).get('player', [])
+            if not player:
+                continue
+            player_info = player[0] if isinstance(player[0], list) else player
+            move = player[1].get('transaction_data', {}) if len(player) > 1 else {}
+            if isinstance(move, list):
+                move = move[0] if move else {}
+            moves.append({
+                'player': parse_player(player_info),
+                'type': move.get('type'),
+                'from_team': move.get('source_team_name'),
+                'to_team': move.get('destination_team_name')
+            })
+
+        transactions.append({
+            'id': int(meta['transaction_id']),
+            'type': meta.get('type'),
+            'timestamp': meta.get('timestamp'),
+            'moves': moves
+        })
+
+    transactions.sort(key=lambda t: t['id'])
+    return transactions
+
+
+def apply_transactions(rosters, transactions):
+    """
+    Apply transaction moves to one season's rosters (team_name -> [players]).
+
+    Returns updated copies, or None if a move does not fit the rosters (a
+    dropped player who isn't on the team, an added player already there, an
+    unknown team), which means the stored rosters have drifted.
+    """
+    rosters = {team: list(players) for team, players in rosters.items()}
+
+    for transaction in transactions:
+        for move in transaction['moves']:
+            player = move['player']
+            source, destination = move['from_team'], move['to_team']
+
+            if source:
+                if source not in rosters:
+                    return None
+                kept = [p for p in rosters[source] if p['player_id'] != player['player_id']]
+                if len(kept) == len(rosters[source]):
+                    return None
+                rosters[source] = kept
+
+            if destination:
+                if destination not in rosters:
+                    return None
+                if any(p['player_id'] == player['player_id'] for p in rosters[destination]):
+                    return None
+                rosters[destination].append(player)
+
+    return rosters
+
+
+def parse_standings(data):
+    """Teams of a league/standings response sorted by final rank"""
+    try:
+        standings_data = league_section(data, 'standings')
+        if not standings_data:
             return None
 
+        teams = standings_data[0]['teams']
+
+        results = []
+        # Yahoo returns teams as {"0": {...}, "1": {...}, "count": N}
+        count = teams.get('count', 0)
+        for i in range(count):
+            team_data = teams.get(str(i))
+            if team_data:
+                team = team_data['team']
+                # Team data is also nested weirdly
+                team_info = team[0]
+                standings_info = team[2] if len(team) > 2 else {}
+
+                name = None
+                manager = None
+                logo_url = None
+                for item in team_info:
+                    if isinstance(item, dict):
+                        if 'name' in item:
+                            name = item['name']
+                        if 'managers' in item:
+                            manager = parse_manager(item['managers'])
+                        if 'team_logos' in item:
+                            logos = item['team_logos']
+                            if isinstance(logos, list) and logos:
+                                logo_url = logos[0].get('team_logo', {}).get('url')
+                            elif isinstance(logos, dict):
+                                logo_url = logos.get('team_logo', {}).get('url')
+
+                rank = None
+                if isinstance(standings_info, dict) and 'team_standings' in standings_info:
+                    rank = standings_info['team_standings'].get('rank')
+
+                results.append({
+                    'rank': int(rank) if rank else i + 1,
+                    'name': name,
+                    'manager': manager,
+                    'logo_url': logo_url
+                })
+
+        # Sort by rank
+        results.sort(key=lambda x: x['rank'])
+        return results
+
+    except (KeyError, IndexError, TypeError) as e:
+        print(f"Error parsing standings: {e}")
+        return None
+
 
 def list_my_leagues():
     """List all leagues the user is part of"""
@@ -782,190 +1177,411 @@ def list_my_leagues():
         traceback.print_exc()
 
 
-def main():
-    print("="*60)
-    print("Lakeland Cup Data Fetcher")
-    print("="*60)
+def fetch_season_standings(api, season, game_key, league_id):
+    """Fetch final standings for one season"""
+    print(f"\n{season} (game key: {game_key}, league: {league_id})...")
+    standings = api.get_league_standings(game_key, league_id)
+
+    if standings:
+        champion = standings[0]
+        runner_up = standings[1] if len(standings) > 1 else None
+        print(f"  Champion: {champion['name']} ({champion['manager']})")
+        if runner_up:
+            print(f"  Runner-up: {runner_up['name']} ({runner_up['manager']})")
+    else:
+        print(f"  Could not fetch data (league may not exist for this season)")
+
+    return standings
+
+
+def fetch_season_playoffs(api, season, game_key, league_id):
+    """Fetch playoff matchups for one season"""
+    print(f"  {season}: fetching playoff bracket...")
+    playoffs = api.get_all_matchups(game_key, league_id)
+
+    if playoffs:
+        print(f"  {season}: found {len(playoffs)} playoff matchups")
+        for match in playoffs:
+            print(f"    Round {match['round']}: {match['teams'][0]} vs {match['teams'][1]} -> {match['winner']}")
+    else:
+        print(f"  {season}: no playoff data available")
+
+    return playoffs
+
+
+def fetch_season_regular_season(api, season, game_key, league_id):
+    """Fetch every regular-season week of one season as week -> [matchups]"""
+    print(f"  {season}: fetching regular season...")
+    weeks = api.get_regular_season(game_key, league_id)
+
+    if weeks:
+        print(f"  {season}: found {sum(len(m) for m in weeks.values())} matchups in {len(weeks)} weeks")
+    else:
+        print(f"  {season}: no regular season data available")
+
+    return weeks
+
+
+def season_player_ids(player_history):
+    """season -> sorted player_ids rostered that season"""
+    by_season = {}
+    for data in player_history.values():
+        if not data.get('player_id'):
+            continue
+        for seasons in data['teams'].values():
+            for season in seasons:
+                by_season.setdefault(season, set()).add(data['player_id'])
+    return {season: sorted(ids, key=lambda i: (len(i), i)) for season, ids in by_season.items()}
+
+
+def fetch_player_stats(api, player_history, workers=STATS_WORKERS, seasons=LAKELAND_CUP_SEASONS,
+                       cache_dir=STATS_CACHE_DIR):
+    """
+    Season stats of every player in player_history as player_id -> season -> {stat: value}.
+
+    Player IDs are grouped per season into batches of PLAYER_BATCH_SIZE and
+    all batches are fetched concurrently. Finished seasons are read from
+    `cache_dir` when every player is already there.
+    """
+    current_season = max(seasons)
+    print("\nFetching player stats...")
+    ids_by_season = season_player_ids(player_history)
+    stats_by_season = {}
+    batches = []
+
+    for season, player_ids in sorted(ids_by_season.items()):
+        game_key, league_id = seasons[season]
+        cache_file = cache_dir / f"{season}.json"
+        if season != current_season and cache_file.exists():
+            with open(cache_file) as f:
+                cached = json.load(f)
+            if set(player_ids) <= set(cached):
+                stats_by_season[season] = cached
+                continue
+
+        for start in range(0, len(player_ids), PLAYER_BATCH_SIZE):
+            batches.append((season, game_key, league_id, player_ids[start:start + PLAYER_BATCH_SIZE]))
+
+    def fetch_batch(batch):
+        season, game_key, league_id, player_ids = batch
+        return season, api.get_player_stats(game_key, league_id, player_ids)
+
+    def fetch_categories(season):
+        return season, parse_stat_categories(api.get_league_settings(*seasons[season]))
+
+    fetched_seasons = sorted({batch[0] for batch in batches})
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        categories = dict(pool.map(fetch_categories, fetched_seasons))
+        results = list(pool.map(fetch_batch, batches))
+    print(f"  {len(batches)} batches for {len(fetched_seasons)} seasons, "
+          f"{len(ids_by_season) - len(fetched_seasons)} seasons from cache")
+
+    failed = set()
+    for season, batch_stats in results:
+        if batch_stats is None:
+            failed.add(season)
+            continue
+        names = categories[season]
+        season_stats = stats_by_season.setdefault(season, {})
+        for player_id, stats in batch_stats.items():
+            season_stats[player_id] = {names.get(stat_id, stat_id): value for stat_id, value in stats.items()}
+
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    for season in fetched_seasons:
+        if season != current_season and season not in failed and season in stats_by_season:
+            with open(cache_dir / f"{season}.json", 'w') as f:
+                json.dump(stats_by_season[season], f)
+
+    player_stats = {}
+    for season, season_stats in sorted(stats_by_season.items()):
+        for player_id, stats in season_stats.items():
+            player_stats.setdefault(player_id, {})[season] = stats
+    return player_stats
+
+
+def fetch_season_rosters(api, season, game_key, league_id):
+    """Fetch the roster of every team in one season as team_name -> [players]"""
+    print(f"  {season}: fetching rosters...")
+    teams_with_keys = api.get_league_teams_with_keys(game_key, league_id)
+    if not teams_with_keys:
+        return None
 
-    api = YahooFantasyAPI()
-    api.authenticate()
+    rosters = {}
+    for team_info in teams_with_keys:
+        team_name = team_info['name']
+        roster = api.get_team_roster(team_info['team_key'])
+        if roster:
+            rosters[team_name] = roster
+            print(f"    {season} {team_name}: {len(roster)} players")
+        else:
+            print(f"    {season} {team_name}: failed to fetch roster")
 
-    print(f"\nFetching data for Lakeland Cup")
-    print("-"*60)
+    return rosters
 
-    champions = []
-    all_teams = {}  # name -> {owner, logo_url, logo_file, seasons: []}
-    all_playoffs = {}
-    season_rosters = {}  # season -> [team_names]
-    player_history = {}  # player_name -> {team_name -> [seasons]}
-    team_rosters = {}  # season -> team_name -> [players]
 
-    for season, (game_key, league_id) in sorted(LAKELAND_CUP_SEASONS.items()):
-        print(f"\n{season} (game key: {game_key}, league: {league_id})...")
+def sync_current_rosters(previous, team_names, transactions):
+    """
+    Update the stored current-season rosters from transactions since the last sync.
 
-        standings = api.get_league_standings(game_key, league_id)
+    Returns (rosters, last_transaction_id), or None when the rosters have to
+    be pulled in full: no sync point for this season, teams renamed or
+    added, transactions missing, or moves that don't fit.
+    """
+    sync = previous.get('sync') or {}
+    stored = previous.get('team_rosters', {}).get(CURRENT_SEASON)
+    last_id = sync.get('last_transaction_id')
+    if sync.get('season') != CURRENT_SEASON or not stored or last_id is None:
+        print(f"  {CURRENT_SEASON}: no sync point, pulling full rosters")
+        return None
+    if set(stored) != set(team_names):
+        print(f"  {CURRENT_SEASON}: teams changed since last sync, pulling full rosters")
+        return None
 
-        if standings:
-            champion = standings[0]
-            runner_up = standings[1] if len(standings) > 1 else None
+    if transactions is None:
+        return None
+    if last_id is not None and transactions and transactions[0]['id'] > last_id + 1:
+        # The oldest transaction returned is past our sync point, some may be cut off
+        print(f"  {CURRENT_SEASON}: transactions since {last_id} incomplete, pulling full rosters")
+        return None
 
-            print(f"  Champion: {champion['name']} ({champion['manager']})")
-            if runner_up:
-                print(f"  Runner-up: {runner_up['name']} ({runner_up['manager']})")
+    new = [t for t in transactions if t['id'] > last_id]
+    rosters = apply_transactions(stored, new)
+    if rosters is None:
+        print(f"  {CURRENT_SEASON}: transactions don't match stored rosters, pulling full rosters")
+        return None
 
-            # Try to get playoff bracket
-            print(f"  Fetching playoff bracket...")
-            playoffs = api.get_all_matchups(game_key, league_id)
+    print(f"  {CURRENT_SEASON}: applied {len(new)} transactions to stored rosters")
+    return rosters, max([t['id'] for t in new], default=last_id)
+
+
+def sync_rosters(api, rosters_by_season, standings_by_season, transactions, previous=None, skipped=()):
+    """
+    Fill in rosters the pipeline skipped and return the sync point to store.
+
+    `transactions` are the current season's, read by the pipeline before it
+    pulled any current-season roster, so the sync point never runs ahead of
+    the rosters. With `previous` (the last league_data.json) finished
+    seasons reuse its rosters. If the pipeline skipped the current season's
+    rosters (it is in `skipped`), they are brought up to date from the
+    transactions, falling back to a full pull; otherwise the pipeline's
+    full rosters are kept.
+    """
+    game_key, league_id = LAKELAND_CUP_SEASONS[CURRENT_SEASON]
+    current_teams = [team['name'] for team in standings_by_season.get(CURRENT_SEASON) or []]
+
+    if previous:
+        for season, rosters in previous.get('team_rosters', {}).items():
+            if season != CURRENT_SEASON and season in rosters_by_season:
+                rosters_by_season[season] = rosters
+
+    if previous and current_teams and CURRENT_SEASON in skipped:
+        synced = sync_current_rosters(previous, current_teams, transactions)
+        if synced:
+            rosters_by_season[CURRENT_SEASON], last_id = synced
+            return {'season': CURRENT_SEASON, 'last_transaction_id': last_id}
+        rosters_by_season[CURRENT_SEASON] = fetch_season_rosters(api, CURRENT_SEASON, game_key, league_id)
+
+    if not current_teams or transactions is None:
+        return None
+    return {'season': CURRENT_SEASON, 'last_transaction_id': transactions[-1]['id'] if transactions else 0}
+
+
+def player_history_from_rosters(team_rosters):
+    """Player history folded over every season's rosters in order, like the full fetch does"""
+    player_history = {}
+    for season in sorted(team_rosters):
+        add_roster_history(player_history, season, team_rosters[season])
+    return player_history
+
+
+def load_archived_seasons(archive, standings_by_season, playoffs_by_season, rosters_by_season,
+                          regular_season_by_season):
+    """Fill the per-season dicts with every season sealed in the archive"""
+    for season in archive.seasons:
+        data = archive.season(season)
+        standings_by_season[season] = data['standings']
+        playoffs_by_season[season] = data['playoffs']
+        regular_season_by_season[season] = data['regular_season']
+        rosters_by_season[season] = archive.rosters(season)
+
+
+def seal_completed_seasons(path, standings_by_season, playoffs_by_season, rosters_by_season,
+                           regular_season_by_season):
+    """
+    Seal finished seasons whose data is complete into the archive.
+
+    A season is only sealed with standings, playoffs, regular season and a
+    roster for every team, so a request that failed this run can't freeze
+    a gap into the archive.
+    """
+    complete = {}
+    for season, standings in standings_by_season.items():
+        rosters = rosters_by_season.get(season)
+        if (season == CURRENT_SEASON or not standings or not playoffs_by_season.get(season)
+                or not regular_season_by_season.get(season) or not rosters or len(rosters) < len(standings)):
+            continue
+        complete[season] = {
+            'standings': standings,
+            'playoffs': playoffs_by_season[season],
+            'regular_season': regular_season_by_season[season],
+            'rosters': rosters,
+        }
 
-            if playoffs:
-                print(f"  Found {len(playoffs)} playoff matchups")
-                all_playoffs[season] = playoffs
+    sealed = seal_seasons(path, complete)
+    if sealed:
+        print(f"Sealed {', '.join(sealed)} into {path}")
 
-                # Print playoff bracket
-                for match in playoffs:
-                    print(f"    Round {match['round']}: {match['teams'][0]} vs {match['teams'][1]} -> {match['winner']}")
-            else:
-                print(f"  No playoff data available")
-
-            champions.append({
-                'season': season,
-                'champion_team': champion['name'],
-                'champion_owner': champion['manager'],
-                'runner_up_team': runner_up['name'] if runner_up else None,
-                'runner_up_owner': runner_up['manager'] if runner_up else None,
-                'playoffs': playoffs,
-            })
 
-            # Collect all teams with their logos and track seasons
-            season_rosters[season] = []
-            for team in standings:
-                name = team['name']
-                season_rosters[season].append(name)
-
-                if name not in all_teams:
-                    all_teams[name] = {
-                        'owner': team['manager'],
-                        'logo_url': team['logo_url'],
-                        'seasons': []
-                    }
-                # Update logo_url if we have a newer one
-                if team['logo_url']:
-                    all_teams[name]['logo_url'] = team['logo_url']
-                # Track which seasons this team was active
-                all_teams[name]['seasons'].append(season)
-
-            # Fetch rosters for all teams
-            print(f"  Fetching rosters...")
-            teams_with_keys = api.get_league_teams_with_keys(game_key, league_id)
-            if teams_with_keys:
-                team_rosters[season] = {}
-                for team_info in teams_with_keys:
-                    team_key = team_info['team_key']
-                    team_name = team_info['name']
-                    manager = team_info['manager']
-
-                    roster = api.get_team_roster(team_key)
-                    if roster:
-                        team_rosters[season][team_name] = roster
-                        print(f"    {team_name}: {len(roster)} players")
-
-                        # Track player history for franchise player analysis
-                        for player in roster:
-                            player_name = player['name']
-                            if player_name not in player_history:
-                                player_history[player_name] = {
-                                    'teams': {},  # team_name -> [seasons]
-                                    'position': player['position'],
-                                    'player_id': player['player_id'],
-                                    'jersey_number': player.get('jersey_number')
-                                }
-                            # Update jersey number if we have a newer one
-                            if player.get('jersey_number'):
-                                player_history[player_name]['jersey_number'] = player['jersey_number']
-                            if team_name not in player_history[player_name]['teams']:
-                                player_history[player_name]['teams'][team_name] = []
-                            player_history[player_name]['teams'][team_name].append(season)
-                    else:
-                        print(f"    {team_name}: failed to fetch roster")
-        else:
-            print(f"  Could not fetch data (league may not exist for this season)")
+def aggregate_league(standings_by_season, playoffs_by_season, rosters_by_season):
+    """Fold per-season results into the league-wide structures"""
+    champions = []
+    all_teams = {}  # name -> {owner, logo_url, logo_file, seasons: []}
+    season_rosters = {}  # season -> [team_names]
+    player_history = {}  # player_name -> {team_name -> [seasons]}
+    team_rosters = {}  # season -> team_name -> [players]
 
-    # Download all logos and extract colors
+    for season in sorted(standings_by_season):
+        standings = standings_by_season[season]
+        if not standings:
+            continue
+
+        champion = standings[0]
+        runner_up = standings[1] if len(standings) > 1 else None
+        playoffs = playoffs_by_season.get(season)
+
+        champions.append({
+            'season': season,
+            'champion_team': champion['name'],
+            'champion_owner': champion['manager'],
+            'runner_up_team': runner_up['name'] if runner_up else None,
+            'runner_up_owner': runner_up['manager'] if runner_up else None,
+            'playoffs': playoffs,
+        })
+
+        # Collect all teams with their logos and track seasons
+        season_rosters[season] = []
+        for team in standings:
+            name = team['name']
+            season_rosters[season].append(name)
+
+            if name not in all_teams:
+                all_teams[name] = {
+                    'owner': team['manager'],
+                    'logo_url': team['logo_url'],
+                    'seasons': []
+                }
+            # Update logo_url if we have a newer one
+            if team['logo_url']:
+                all_teams[name]['logo_url'] = team['logo_url']
+            # Track which seasons this team was active
+            all_teams[name]['seasons'].append(season)
+
+        rosters = rosters_by_season.get(season)
+        if rosters is None:
+            continue
+
+        team_rosters[season] = rosters
+        add_roster_history(player_history, season, rosters)
+
+    return champions, all_teams, season_rosters, player_history, team_rosters
+
+
+def add_roster_history(player_history, season, rosters):
+    """Track which team each rostered player was on in a season, for franchise player analysis"""
+    for team_name, roster in rosters.items():
+        for player in roster:
+            player_name = player['name']
+            if player_name not in player_history:
+                player_history[player_name] = {
+                    'teams': {},  # team_name -> [seasons]
+                    'position': player['position'],
+                    'player_id': player['player_id'],
+                    'jersey_number': player.get('jersey_number')
+                }
+            # Update jersey number if we have a newer one
+            if player.get('jersey_number'):
+                player_history[player_name]['jersey_number'] = player['jersey_number']
+            if team_name not in player_history[player_name]['teams']:
+                player_history[player_name]['teams'][team_name] = []
+            player_history[player_name]['teams'][team_name].append(season)
+
+
+def process_logo(name, data, store, downloads):
+    """Find or download one team's logo and take its colors, once per distinct image"""
+    print(f"\n  {name}...")
+    # Files saved before the store existed are named after the team
+    legacy_file = f"{slugify(name)}.png"
+    logo_file = store.file_for(name) or store.adopt(name, legacy_file)
+    if logo_file:
+        print(f"      Logo exists: {logo_file}")
+    elif data.get('logo_url'):
+        # Teams sharing a logo URL download it once
+        url = data['logo_url']
+        if url not in downloads:
+            downloads[url] = download_logo(url)
+        if downloads[url]:
+            known = set(store.images)
+            logo_file = store.add(name, downloads[url], legacy_file)
+            print(f"      Same logo as {logo_file}" if logo_file in known else f"      Downloaded: {logo_file}")
+
+    data['logo_file'] = logo_file
+    data['colors'] = store.colors(logo_file, extract_logo_colors) if logo_file else None
+    if data['colors']:
+        print(f"      Colors: {', '.join(data['colors'])}")
+
+
+def process_logos(all_teams, recolor=False):
+    """Download all logos and extract colors"""
     print("\n" + "="*60)
     print("DOWNLOADING LOGOS & EXTRACTING COLORS")
     print("="*60)
 
+    store = LogoStore(LOGOS_DIR)
+    if recolor:
+        store.forget_colors()
+    downloads = {}
     for name, data in all_teams.items():
-        print(f"\n  {name}...")
-        logo_file = download_logo(data['logo_url'], name)
-        data['logo_file'] = logo_file
-
-        # Extract colors from logo
-        if logo_file:
-            logo_path = LOGOS_DIR / logo_file
-            if logo_path.exists():
-                colors = extract_logo_colors(logo_path)
-                data['colors'] = colors
-                if colors:
-                    print(f"      Colors: {', '.join(colors)}")
-            else:
-                data['colors'] = None
-        else:
-            data['colors'] = None
-
-    # Output results
-    print("\n" + "="*60)
-    print("RESULTS")
-    print("="*60)
+        process_logo(name, data, store, downloads)
+    store.save()
 
-    print("\n--- Teams ---")
-    for name in sorted(all_teams.keys()):
-        data = all_teams[name]
-        logo_status = f"✓ {data['logo_file']}" if data.get('logo_file') else "✗ no logo"
-        print(f"  {name} ({data['owner']}) [{logo_status}]")
+    distinct = {data['logo_file'] for data in all_teams.values() if data['logo_file']}
+    print(f"\n  {len(all_teams)} teams share {len(distinct)} distinct logos; "
+          f"{len(downloads)} downloads, colors extracted {store.extractions} times")
+    if store.removed:
+        print(f"  Removed {len(store.removed)} duplicate logo files: {', '.join(store.removed)}")
+    return store
 
-    print("\n--- Champions by Season ---")
-    for c in champions:
-        print(f"  {c['season']}: {c['champion_team']} ({c['champion_owner']})")
-        if c.get('playoffs'):
-            # Find the final
-            finals = [p for p in c['playoffs'] if p['round'] == max(p['round'] for p in c['playoffs'])]
-            if finals:
-                final = finals[0]
-                print(f"    Final: {final['teams'][0]} ({final['scores'][0]}) vs {final['teams'][1]} ({final['scores'][1]})")
 
-    # Analyze franchise players (10+ consecutive seasons with same team)
-    print("\n" + "="*60)
-    print("FRANCHISE PLAYERS (10+ consecutive seasons)")
-    print("="*60)
+def get_consecutive_seasons(seasons_list):
+    """Find longest consecutive run of seasons"""
+    if not seasons_list:
+        return [], 0
 
-    def get_consecutive_seasons(seasons_list):
-        """Find longest consecutive run of seasons"""
-        if not seasons_list:
-            return [], 0
+    # Sort seasons chronologically
+    sorted_seasons = sorted(seasons_list, key=lambda s: int(s.split('-')[0]))
 
-        # Sort seasons chronologically
-        sorted_seasons = sorted(seasons_list, key=lambda s: int(s.split('-')[0]))
+    best_run = []
+    current_run = [sorted_seasons[0]]
 
-        best_run = []
-        current_run = [sorted_seasons[0]]
+    for i in range(1, len(sorted_seasons)):
+        prev_year = int(sorted_seasons[i-1].split('-')[0])
+        curr_year = int(sorted_seasons[i].split('-')[0])
 
-        for i in range(1, len(sorted_seasons)):
-            prev_year = int(sorted_seasons[i-1].split('-')[0])
-            curr_year = int(sorted_seasons[i].split('-')[0])
+        if curr_year == prev_year + 1:
+            current_run.append(sorted_seasons[i])
+        else:
+            if len(current_run) > len(best_run):
+                best_run = current_run
+            current_run = [sorted_seasons[i]]
 
-            if curr_year == prev_year + 1:
-                current_run.append(sorted_seasons[i])
-            else:
-                if len(current_run) > len(best_run):
-                    best_run = current_run
-                current_run = [sorted_seasons[i]]
+    if len(current_run) > len(best_run):
+        best_run = current_run
 
-        if len(current_run) > len(best_run):
-            best_run = current_run
+    return best_run, len(best_run)
 
-        return best_run, len(best_run)
 
+def find_franchise_players(player_history, all_teams):
+    """Players with 10+ consecutive seasons on the same team"""
     franchise_players = []
 
     for player_name, data in player_history.items():
@@ -989,6 +1605,34 @@ def main():
 
     # Sort by years (descending), then by player name
     franchise_players.sort(key=lambda x: (-x['years'], x['player']))
+    return franchise_players
+
+
+def print_results(all_teams, champions, franchise_players):
+    """Print a summary of teams, champions and franchise players"""
+    print("\n" + "="*60)
+    print("RESULTS")
+    print("="*60)
+
+    print("\n--- Teams ---")
+    for name in sorted(all_teams.keys()):
+        data = all_teams[name]
+        logo_status = f"✓ {data['logo_file']}" if data.get('logo_file') else "✗ no logo"
+        print(f"  {name} ({data['owner']}) [{logo_status}]")
+
+    print("\n--- Champions by Season ---")
+    for c in champions:
+        print(f"  {c['season']}: {c['champion_team']} ({c['champion_owner']})")
+        if c.get('playoffs'):
+            # Find the final
+            finals = [p for p in c['playoffs'] if p['round'] == max(p['round'] for p in c['playoffs'])]
+            if finals:
+                final = finals[0]
+                print(f"    Final: {final['teams'][0]} ({final['scores'][0]}) vs {final['teams'][1]} ({final['scores'][1]})")
+
+    print("\n" + "="*60)
+    print("FRANCHISE PLAYERS (10+ consecutive seasons)")
+    print("="*60)
 
     # Group by team for display
     teams_franchise = {}
@@ -1009,8 +1653,11 @@ def main():
 
     print(f"\n  Total franchise players found: {len(franchise_players)}")
 
-    # Save to JSON for easy import
-    output = {
+
+def build_output(all_teams, champions, season_rosters, team_rosters, franchise_players, player_history,
+                 regular_season=None, player_stats=None):
+    """Assemble the league_data.json structure"""
+    return {
         'teams': [
             {
                 'name': name,
@@ -1025,25 +1672,589 @@ def main():
         'season_rosters': season_rosters,
         'team_rosters': team_rosters,
         'franchise_players': franchise_players,
-        'player_history': {
-            name: {
-                'teams': data['teams'],
-                'position': data['position'],
-                'player_id': data['player_id'],
-                'jersey_number': data.get('jersey_number')
-            }
-            for name, data in player_history.items()
-        }
+        # Entries already hold exactly teams, position, player_id and jersey_number
+        'player_history': player_history,
+        'regular_season': {
+            season: compact_regular_season(weeks)
+            for season, weeks in sorted((regular_season or {}).items())
+            if weeks
+        },
+        'aggregates': build_aggregates(all_teams, champions, regular_season),
+        'player_stats': player_stats or {}
     }
 
-    with open('league_data.json', 'w') as f:
-        json.dump(output, f, indent=2)
 
-    print(f"\n✓ Data saved to league_data.json")
+def refresh_aggregates(output):
+    """Recompute the aggregates of a league_data.json dict after its seasons, teams or matchups changed"""
+    all_teams = {team['name']: team for team in output.get('teams', [])}
+    regular_season = {season: expand_regular_season(weeks) for season, weeks in output.get('regular_season', {}).items()}
+    output['aggregates'] = build_aggregates(all_teams, output.get('seasons', []), regular_season)
+    return output['aggregates']
+
+
+def refresh_franchise_players(output):
+    """Recompute franchise players of a league_data.json dict from its player history and team colors"""
+    all_teams = {team['name']: team for team in output.get('teams', [])}
+    output['franchise_players'] = find_franchise_players(output.get('player_history', {}), all_teams)
+    return output['franchise_players']
+
+
+def league_data_path(path=LEAGUE_DATA_FILE):
+    """`path`, or its .gz sibling when only that exists (after a --gzip run)"""
+    path = str(path)
+    compressed = f"{path}.gz"
+    if not os.path.exists(path) and os.path.exists(compressed):
+        return compressed
+    return path
+
+
+def read_league_data(path=LEAGUE_DATA_FILE):
+    """The league_data.json of the last run, if there is one, compressed or not"""
+    path = str(path)
+    for candidate in (path, path[:-3] if path.endswith('.gz') else f"{path}.gz"):
+        if os.path.exists(candidate):
+            return read_json(candidate)
+    return None
+
+
+def write_league_data(output, path=LEAGUE_DATA_FILE):
+    """Write league_data.json as compact JSON, atomically (gzip-compressed if path ends in .gz)"""
+    write_json(path, output)
+
+    print(f"\n✓ Data saved to {path}")
     print(f"✓ Logos saved to {LOGOS_DIR}")
     print("\nYou can use this data to seed the database.")
 
 
+class StageStats:
+    """Items handled and busy time of one pipeline stage"""
+
+    def __init__(self, name, workers):
+        self.name = name
+        self.workers = workers
+        self.items = 0
+        self.busy = 0.0
+
+    def record(self, started):
+        self.items += 1
+        self.busy += time.perf_counter() - started
+
+    def report(self, elapsed):
+        return {
+            'stage': self.name,
+            'workers': self.workers,
+            'items': self.items,
+            'busy_s': round(self.busy, 3),
+            'items_per_s': round(self.items / elapsed, 2) if elapsed else None,
+            'utilization': round(self.busy / (elapsed * self.workers), 3) if elapsed else None,
+        }
+
+
+class SeasonRecords:
+    """Folds the records of parsed fetch units into per-season structures, in any order"""
+
+    def __init__(self):
+        self.standings = {}
+        self.playoffs = {}
+        self.weeks = {}
+        self.team_order = {}
+        self.rosters = {}
+        self.transactions = {}
+
+    def add(self, record):
+        kind, season = record[0], record[1]
+        if kind == 'standings':
+            self.standings[season] = record[2]
+        elif kind == 'playoffs':
+            self.playoffs.setdefault(season, []).extend(record[2])
+        elif kind == 'week':
+            self.weeks.setdefault(season, {})[record[2]] = record[3]
+        elif kind == 'teams':
+            self.team_order[season] = [team['name'] for team in record[2]] if record[2] else None
+        elif kind == 'roster':
+            self.rosters.setdefault(season, {})[record[2]] = record[3]
+        elif kind == 'transactions':
+            self.transactions[season] = record[2]
+
+    def results(self):
+        """(standings, playoffs, rosters, regular_season) by season, shaped like the sequential fetchers'"""
+        playoffs_by_season = {
+            season: sorted(matchups, key=lambda m: m['week']) or None
+            for season, matchups in self.playoffs.items()
+        }
+
+        rosters_by_season = {}
+        for season, names in self.team_order.items():
+            if names is None:
+                rosters_by_season[season] = None
+                continue
+            season_teams = self.rosters.get(season, {})
+            rosters_by_season[season] = {name: season_teams[name] for name in names if season_teams.get(name)}
+
+        regular_season_by_season = {
+            season: weeks if any(weeks.values()) else None for season, weeks in self.weeks.items()
+        }
+
+        return self.standings, playoffs_by_season, rosters_by_season, regular_season_by_season
+
+
+def season_requests(season, game_key, league_id):
+    """Initial fetch units for a season; the rest are discovered while parsing"""
+    league_key = f"{game_key}.l.{league_id}"
+    return [{'kind': 'standings', 'season': season, 'endpoint': f"league/{league_key}/standings"}]
+
+
+def unit_key(request):
+    """Journal key of a fetch unit"""
+    return f"{request['season']} {request['endpoint']}"
+
+
+def parse_payload(request, data):
+    """
+    Decode one fetched payload.
+
+    Returns (records, follow_up_requests); records are tuples folded in by
+    the aggregator, follow-ups are fetched next (e.g. rosters once the team
+    list of a season is known).
+    """
+    kind = request['kind']
+    season = request['season']
+    league_key = request['endpoint'].split('/')[1]
+
+    if kind == 'standings':
+        standings = parse_standings(data) if data else None
+        follow_ups = []
+        if standings:
+            follow_ups = [
+                {'kind': 'settings', 'season': season, 'endpoint': f"league/{league_key}/settings"},
+                {'kind': 'teams', 'season': season, 'endpoint': f"league/{league_key}/teams"},
+            ]
+        return [('standings', season, standings)], follow_ups
+
+    if kind == 'settings':
+        start = parse_playoff_start_week(data)
+        follow_ups = [
+            {'kind': 'scoreboard', 'season': season, 'week': week, 'playoff_start_week': start,
+             'endpoint': f"league/{league_key}/scoreboard;week={week}"}
+            for week in playoff_weeks(start)
+        ]
+        follow_ups += [
+            {'kind': 'week', 'season': season, 'week': week,
+             'endpoint': f"league/{league_key}/scoreboard;week={week}"}
+            for week in regular_season_weeks(data) or []
+        ]
+        return [], follow_ups
+
+    if kind == 'scoreboard':
+        matchups = []
+        if data:
+            try:
+                matchups = parse_playoff_scoreboard(data, request['week'], request['playoff_start_week'])
+            except Exception as e:
+                print(f"    {season}: error parsing week {request['week']}: {e}")
+        return [('playoffs', season, matchups)], []
+
+    if kind == 'week':
+        matchups = []
+        if data:
+            try:
+                matchups = parse_week_scoreboard(data)
+            except Exception as e:
+                print(f"    {season}: error parsing week {request['week']}: {e}")
+        return [('week', season, request['week'], matchups)], []
+
+    if kind == 'teams':
+        teams = parse_league_teams(data) if data else None
+        follow_ups = [
+            {'kind': 'roster', 'season': season, 'team_name': team['name'],
+             'endpoint': f"team/{team['team_key']}/roster"}
+            for team in teams or []
+        ]
+        if request.get('sync') and teams:
+            # The sync point is read before the rosters, so no move can fall between the two
+            follow_ups = [{'kind': 'transactions', 'season': season, 'rosters': follow_ups,
+                           'endpoint': f"league/{league_key}/transactions;types=add,drop,trade"}]
+        return [('teams', season, teams)], follow_ups
+
+    if kind == 'transactions':
+        transactions = parse_transactions(data) if data else None
+        return [('transactions', season, transactions)], request['rosters']
+
+    if kind == 'roster':
+        roster = parse_team_roster(data) if data else None
+        return [('roster', season, request['team_name'], roster)], []
+
+    raise ValueError(f"Unknown fetch unit: {kind}")
+
+
+async def run_league_pipeline(api, seasons, fetch_workers=6, parse_workers=2, queue_size=16, journal=None,
+                              skip_rosters=(), sync_season=None, skip_weeks=None):
+    """
+    Fetch, parse and aggregate all seasons as a staged pipeline.
+
+    Fetchers run the blocking HTTP calls in threads and hand raw payloads
+    to parser workers through a bounded queue; parsed records go through a
+    second bounded queue to a single aggregator. Units already in `journal`
+    are replayed from it without a request, and every newly parsed unit is
+    added to it. Rosters of seasons in `skip_rosters` and the regular-season
+    weeks in `skip_weeks` (season -> weeks) are not fetched. The
+    transactions of `sync_season` are fetched after its team list and before
+    its rosters. Returns (standings_by_season, playoffs_by_season,
+    rosters_by_season, regular_season_by_season, transactions_by_season,
+    stats).
+    """
+    request_queue = asyncio.Queue()  # Only small descriptors, never bounded
+    payload_queue = asyncio.Queue(maxsize=queue_size)
+    record_queue = asyncio.Queue(maxsize=queue_size)
+
+    fetch_stats = StageStats('fetch', fetch_workers)
+    parse_stats = StageStats('parse', parse_workers)
+    aggregate_stats = StageStats('aggregate', 1)
+    resumed_stats = StageStats('resumed', 1)
+
+    outstanding = 0  # Requests not yet fully parsed
+    all_parsed = asyncio.Event()
+    failures = []
+
+    def enqueue(request):
+        nonlocal outstanding
+        if request['kind'] == 'teams' and request['season'] == sync_season:
+            request = dict(request, sync=True)
+        outstanding += 1
+        request_queue.put_nowait(request)
+
+    def finish_one():
+        nonlocal outstanding
+        outstanding -= 1
+        if outstanding == 0:
+            all_parsed.set()
+
+    async def fetcher():
+        while True:
+            request = await request_queue.get()
+            started = time.perf_counter()
+            done = journal.get(unit_key(request)) if journal else None
+            if done:
+                resumed_stats.record(started)
+                await payload_queue.put((request, None, done))
+                continue
+            try:
+                data = await asyncio.to_thread(api.api_request, request['endpoint'])
+            except Exception as e:
+                failures.append(e)
+                all_parsed.set()
+                return
+            fetch_stats.record(started)
+            await payload_queue.put((request, data, None))
+
+    async def parser():
+        while True:
+            request, data, resumed = await payload_queue.get()
+            if resumed:
+                records, follow_ups = resumed
+            else:
+                started = time.perf_counter()
+                try:
+                    records, follow_ups = parse_payload(request, data)
+                except Exception as e:
+                    failures.append(e)
+                    all_parsed.set()
+                    return
+                parse_stats.record(started)
+                if journal and data is not None:
+                    # Failed requests stay out of the journal so a resume retries them
+                    journal.record(unit_key(request), [records, follow_ups])
+            for record in records:
+                await record_queue.put(record)
+            for follow_up in follow_ups:
+                if follow_up['kind'] == 'roster' and follow_up['season'] in skip_rosters:
+                    continue
+                if follow_up['kind'] == 'week' and follow_up['week'] in (skip_weeks or {}).get(follow_up['season'], ()):
+                    continue
+                enqueue(follow_up)
+            finish_one()
+
+    season_records = SeasonRecords()
+
+    async def aggregator():
+        while True:
+            record = await record_queue.get()
+            started = time.perf_counter()
+            season_records.add(record)
+            aggregate_stats.record(started)
+            record_queue.task_done()
+
+    for season, (game_key, league_id) in seasons:
+        for request in season_requests(season, game_key, league_id):
+            enqueue(request)
+    if not outstanding:
+        # Nothing to fetch (e.g. every season is archived)
+        all_parsed.set()
+
+    started = time.perf_counter()
+    workers = [asyncio.create_task(fetcher()) for _ in range(fetch_workers)]
+    workers += [asyncio.create_task(parser()) for _ in range(parse_workers)]
+    workers.append(asyncio.create_task(aggregator()))
+
+    await all_parsed.wait()
+    if not failures:
+        await record_queue.join()
+    for worker in workers:
+        worker.cancel()
+    await asyncio.gather(*workers, return_exceptions=True)
+
+    if failures:
+        raise failures[0]
+
+    elapsed = time.perf_counter() - started
+    stats = [s.report(elapsed) for s in (fetch_stats, parse_stats, aggregate_stats)]
+    if resumed_stats.items:
+        stats.append(resumed_stats.report(elapsed))
+
+    return (*season_records.results(), season_records.transactions, stats)
+
+
+def print_season_summary(standings_by_season, playoffs_by_season, rosters_by_season, regular_season_by_season=None):
+    """Per-season champion, playoff, regular season and roster summary"""
+    for season in sorted(standings_by_season):
+        standings = standings_by_season[season]
+        print(f"\n{season}...")
+        if not standings:
+            print(f"  Could not fetch data (league may not exist for this season)")
+            continue
+
+        print(f"  Champion: {standings[0]['name']} ({standings[0]['manager']})")
+        if len(standings) > 1:
+            print(f"  Runner-up: {standings[1]['name']} ({standings[1]['manager']})")
+
+        playoffs = playoffs_by_season.get(season)
+        if playoffs:
+            print(f"  Found {len(playoffs)} playoff matchups")
+            for match in playoffs:
+                print(f"    Round {match['round']}: {match['teams'][0]} vs {match['teams'][1]} -> {match['winner']}")
+        else:
+            print(f"  No playoff data available")
+
+        weeks = (regular_season_by_season or {}).get(season)
+        if weeks:
+            print(f"  Found {sum(len(m) for m in weeks.values())} regular season matchups in {len(weeks)} weeks")
+
+        for team_name, roster in (rosters_by_season.get(season) or {}).items():
+            print(f"    {team_name}: {len(roster)} players")
+
+
+def print_pipeline_stats(stats):
+    """Throughput of each pipeline stage"""
+    print("\n--- Pipeline ---")
+    for s in stats:
+        print(f"  {s['stage']:<10} {s['items']:>5} items  {s['busy_s']:>8}s busy  "
+              f"{s['items_per_s']} items/s  ({s['workers']} workers, {s['utilization']:.0%} utilized)")
+
+
+async def fetch_league(api, league, output_dir):
+    """Fetch one registry league and write <output_dir>/<slug>/league_data.json"""
+    started = time.perf_counter()
+    print(f"\n[{league.slug}] fetching {len(league.seasons)} seasons...")
+
+    standings_by_season, playoffs_by_season, rosters_by_season, regular_season_by_season, _, _ = (
+        await run_league_pipeline(api, sorted(league.seasons.items()))
+    )
+    champions, all_teams, season_rosters, player_history, team_rosters = aggregate_league(
+        standings_by_season, playoffs_by_season, rosters_by_season
+    )
+    player_stats = await asyncio.to_thread(
+        fetch_player_stats, api, player_history, seasons=league.seasons, cache_dir=STATS_CACHE_DIR / league.slug
+    )
+    franchise_players = find_franchise_players(player_history, all_teams)
+
+    output = build_output(all_teams, champions, season_rosters, team_rosters, franchise_players, player_history,
+                          regular_season_by_season, player_stats)
+    output['league'] = {'slug': league.slug, 'name': league.name}
+
+    path = Path(output_dir) / league.slug / LEAGUE_DATA_FILE
+    path.parent.mkdir(parents=True, exist_ok=True)
+    await asyncio.to_thread(write_league_data, output, path)
+
+    return {
+        'league': league.slug,
+        'seasons': len(champions),
+        'teams': len(all_teams),
+        'players': len(player_history),
+        'duration_s': round(time.perf_counter() - started, 2),
+        'output': str(path),
+    }
+
+
+async def fetch_registry(api, registry, output_dir):
+    """
+    Fetch every league of a registry.
+
+    All leagues share one API object (and so one token) and the shared HTTP
+    client's rate limiter. At most registry.league_concurrency leagues are in
+    flight, and each league's data is dropped once its file is written, so
+    memory depends on that limit rather than the number of leagues.
+    """
+    slots = asyncio.Semaphore(registry.league_concurrency)
+
+    async def run(league):
+        async with slots:
+            try:
+                return await fetch_league(api, league, output_dir)
+            except Exception as e:
+                print(f"\n[{league.slug}] failed: {e}")
+                return {'league': league.slug, 'error': f"{type(e).__name__}: {e}"}
+
+    return await asyncio.gather(*(run(league) for league in registry.leagues))
+
+
+def main_registry(registry_path, output_dir):
+    """Fetch all leagues of a registry file into per-league directories"""
+    registry = load_registry(registry_path)
+    for league in registry.leagues:
+        # Finished seasons of every league are cacheable
+        COMPLETED_LEAGUE_KEYS.update(league.completed_keys)
+
+    limits = registry.rate_limit
+    set_client(HttpClient(limiter=RateLimiter(limits['requests_per_second'], limits['max_in_flight'])))
+
+    print("="*60)
+    print(f"Fetching {len(registry.leagues)} leagues "
+          f"({registry.league_concurrency} at a time, {limits['requests_per_second']} requests/s)")
+    print("="*60)
+
+    api = YahooFantasyAPI()
+    api.authenticate()
+
+    results = asyncio.run(fetch_registry(api, registry, output_dir))
+
+    print("\n" + "="*60)
+    for result in results:
+        if 'error' in result:
+            print(f"  {result['league']}: FAILED ({result['error']})")
+        else:
+            print(f"  {result['league']}: {result['seasons']} seasons, {result['teams']} teams, "
+                  f"{result['players']} players in {result['duration_s']}s -> {result['output']}")
+
+    Path(output_dir).mkdir(parents=True, exist_ok=True)
+    write_run_metrics(Path(output_dir) / 'metrics.json')
+    if any('error' in result for result in results):
+        raise SystemExit(1)
+
+
+def main(profile_dir=None, resume=False, incremental=False, changes_path=None, use_archive=True,
+         output_path=LEAGUE_DATA_FILE):
+    profiler = StageProfiler(profile_dir)
+
+    print("="*60)
+    print("Lakeland Cup Data Fetcher")
+    print("="*60)
+
+    with profiler.stage('auth'):
+        api = YahooFantasyAPI()
+        api.authenticate()
+
+    print(f"\nFetching data for Lakeland Cup")
+    print("-"*60)
+
+    previous = read_league_data(output_path) if incremental else None
+    if incremental and not previous:
+        print("No league_data.json to update, running a full fetch")
+    skip_rosters = set((previous or {}).get('team_rosters', {}))
+    stored_weeks = finished_weeks(previous)
+
+    archive = SeasonArchive.open(ARCHIVE_FILE) if use_archive else None
+    archived = set(archive.seasons) if archive else set()
+    if archived:
+        print(f"Reading {len(archived)} sealed seasons from {ARCHIVE_FILE}")
+
+    journal = Journal(JOURNAL_FILE, resume=resume)
+    if journal.completed:
+        print(f"Resuming: {len(journal.completed)} units already done")
+
+    with profiler.stage('fetch'):
+        live_seasons = [(season, keys) for season, keys in sorted(LAKELAND_CUP_SEASONS.items()) if season not in archived]
+        (standings_by_season, playoffs_by_season, rosters_by_season, regular_season_by_season, transactions,
+         stats) = asyncio.run(
+            run_league_pipeline(api, live_seasons, journal=journal, skip_rosters=skip_rosters,
+                                sync_season=CURRENT_SEASON, skip_weeks=stored_weeks)
+        )
+        reuse_weeks(regular_season_by_season, standings_by_season, stored_weeks)
+        if archive:
+            load_archived_seasons(archive, standings_by_season, playoffs_by_season, rosters_by_season,
+                                  regular_season_by_season)
+            archive.close()
+
+    with profiler.stage('sync'):
+        sync = sync_rosters(api, rosters_by_season, standings_by_season, transactions.get(CURRENT_SEASON), previous,
+                            skip_rosters)
+    if use_archive:
+        seal_completed_seasons(ARCHIVE_FILE, standings_by_season, playoffs_by_season, rosters_by_season,
+                               regular_season_by_season)
+    print_season_summary(standings_by_season, playoffs_by_season, rosters_by_season, regular_season_by_season)
+    print_pipeline_stats(stats)
+
+    with profiler.stage('aggregate'):
+        champions, all_teams, season_rosters, player_history, team_rosters = aggregate_league(
+            standings_by_season, playoffs_by_season, rosters_by_season
+        )
+
+    with profiler.stage('stats'):
+        player_stats = fetch_player_stats(api, player_history)
+
+    with profiler.stage('logos'):
+        process_logos(all_teams)
+
+    with profiler.stage('franchise'):
+        franchise_players = find_franchise_players(player_history, all_teams)
+    print_results(all_teams, champions, franchise_players)
+
+    with profiler.stage('write'):
+        output = build_output(all_teams, champions, season_rosters, team_rosters, franchise_players, player_history,
+                              regular_season_by_season, player_stats)
+        output['sync'] = sync
+        if changes_path:
+            old_sha = file_sha256(output_path)
+            changeset = build_changeset(previous or read_league_data(output_path), output, league_records)
+        write_league_data(output, output_path)
+        if changes_path:
+            write_changeset(changeset, changes_path, old_sha, Path(output_path))
+    journal.close(finished=True)
+    write_run_metrics('yahoo_metrics.json')
+    profiler.write_summary()
+
+
 if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Fetch Lakeland Cup history from Yahoo Fantasy")
+    parser.add_argument('--profile', type=Path, metavar='DIR',
+                        help="Profile each stage and write pstats, collapsed stacks and memory peaks to DIR")
+    parser.add_argument('--resume', action='store_true',
+                        help=f"Skip units already recorded in {JOURNAL_FILE} by an interrupted run")
+    parser.add_argument('--leagues', type=Path, metavar='REGISTRY',
+                        help="Fetch every league in a registry file instead of the Lakeland Cup")
+    parser.add_argument('--output-dir', type=Path,
+                        help="Per-league output directory for --leagues (default: scripts/leagues)")
+    parser.add_argument('--incremental', action='store_true',
+                        help="Reuse stored rosters and finished weeks, and apply current-season transactions "
+                             "instead of pulling every roster")
+    parser.add_argument('--no-archive', action='store_true',
+                        help=f"Ignore {ARCHIVE_FILE} and fetch every season from Yahoo")
+    parser.add_argument('--changes', type=Path, metavar='FILE',
+                        help="Also write the teams, seasons and roster memberships that changed since the last run")
+    parser.add_argument('--gzip', action='store_true',
+                        help=f"Write {LEAGUE_DATA_FILE}.gz instead of {LEAGUE_DATA_FILE} (the seed script reads the plain file)")
+    args = parser.parse_args()
+    if args.profile:
+        args.profile = args.profile.resolve()
+    if args.changes:
+        args.changes = args.changes.resolve()
+    if args.leagues:
+        args.leagues = args.leagues.resolve()
+    # An explicit output directory is relative to the caller, the default to scripts/
+    args.output_dir = args.output_dir.resolve() if args.output_dir else Path('leagues')
+
     os.chdir(os.path.dirname(os.path.abspath(__file__)))
-    main()
+    if args.leagues:
+        main_registry(args.leagues, args.output_dir)
+    else:
+        output_path = f"{LEAGUE_DATA_FILE}.gz" if args.gzip else LEAGUE_DATA_FILE
+        main(args.profile, args.resume, args.incremental, args.changes, not args.no_archive, output_path)
@@ -0,0 +1,186 @@
+"""
+Durable work queue for fetch units, stored in one SQLite file.
+
+queue_fetch.py publishes every unit of a refresh (season standings, playoff
+and regular season weeks, rosters, logos, draft sheets) as a job. Any number
+of worker processes claim jobs from the same file. A claim is a lease: the
+job belongs to that worker until the lease runs out, after which another
+worker may take it over, so a worker that crashes or hangs only delays its
+job. Failed jobs go back to pending until they have been tried
+max_attempts times.
+
+Completing a job stores its result and publishes the follow-up jobs it
+discovered (e.g. rosters once a season's team list is known) in the same
+transaction, so the queue never loses work between the two.
+
+Workers on other machines can share the file over a network filesystem
+only if it supports POSIX locks properly, and their clocks must agree to
+within a fraction of the lease time. Otherwise run the workers on one host.
+"""
+
+import contextlib
+import json
+import os
+import socket
+import sqlite3
+import time
+from pathlib import Path
+
+DEFAULT_LEASE_SECONDS = 120
+DEFAULT_MAX_ATTEMPTS = 3
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    state TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    worker TEXT,
+    lease_expires REAL,
+    result TEXT,
+    error TEXT,
+    created REAL NOT NULL,
+    finished REAL
+);
+CREATE INDEX IF NOT EXISTS jobs_state ON jobs (state, lease_expires);
+"""
+
+
+class Job:
+    """One claimed job."""
+
+    def __init__(self, id: str, kind: str, payload: dict, attempts: int):
+        self.id = id
+        self.kind = kind
+        self.payload = payload
+        self.attempts = attempts
+
+
+def worker_name() -> str:
+    """Default worker ID: host and process."""
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+class JobQueue:
+    """Jobs of one refresh run in a SQLite file shared by all workers."""
+
+    def __init__(self, path: Path, lease_seconds: float = DEFAULT_LEASE_SECONDS,
+                 max_attempts: int = DEFAULT_MAX_ATTEMPTS):
+        self.path = Path(path)
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        # Autocommit; every change below runs in its own BEGIN IMMEDIATE transaction
+        self._db = sqlite3.connect(self.path, timeout=60, isolation_level=None)
+        self._db.execute('PRAGMA journal_mode=WAL')
+        self._db.execute('PRAGMA synchronous=NORMAL')
+        self._db.executescript(SCHEMA)
+
+    @contextlib.contextmanager
+    def _transaction(self):
+        self._db.execute('BEGIN IMMEDIATE')
+        try:
+            yield self._db
+        except BaseException:
+            self._db.execute('ROLLBACK')
+            raise
+        self._db.execute('COMMIT')
+
+    @staticmethod
+    def _insert(db, jobs) -> int:
+        now = time.time()
+        inserted = 0
+        for job_id, kind, payload in jobs:
+            cursor = db.execute(
+                'INSERT OR IGNORE INTO jobs (id, kind, payload, created) VALUES (?, ?, ?, ?)',
+                (job_id, kind, json.dumps(payload), now),
+            )
+            inserted += cursor.rowcount
+        return inserted
+
+    def publish(self, jobs) -> int:
+        """Add (id, kind, payload) jobs; IDs already in the queue are skipped. Returns how many were new."""
+        with self._transaction() as db:
+            return self._insert(db, jobs)
+
+    def claim(self, worker: str) -> Job | None:
+        """Lease the oldest available job, or None if there is none right now."""
+        with self._transaction() as db:
+            while True:
+                now = time.time()
+                row = db.execute(
+                    "SELECT id, kind, payload, attempts FROM jobs "
+                    "WHERE state = 'pending' OR (state = 'leased' AND lease_expires < ?) "
+                    "ORDER BY created, rowid LIMIT 1",
+                    (now,),
+                ).fetchone()
+                if row is None:
+                    return None
+
+                job_id, kind, payload, attempts = row
+                if attempts >= self.max_attempts:
+                    # Its last worker's lease ran out too
+                    db.execute("UPDATE jobs SET state = 'failed', error = 'lease expired', finished = ? "
+                               "WHERE id = ?", (now, job_id))
+                    continue
+
+                db.execute(
+                    "UPDATE jobs SET state = 'leased', worker = ?, lease_expires = ?, attempts = attempts + 1 "
+                    "WHERE id = ?",
+                    (worker, now + self.lease_seconds, job_id),
+                )
+                return Job(job_id, kind, json.loads(payload), attempts + 1)
+
+    def complete(self, job: Job, worker: str, result, follow_ups=()) -> bool:
+        """
+        Store a job's result and publish its follow-up jobs.
+
+        Returns False (and changes nothing) if the lease was lost to another
+        worker in the meantime.
+        """
+        with self._transaction() as db:
+            cursor = db.execute(
+                "UPDATE jobs SET state = 'done', result = ?, error = NULL, finished = ? "
+                "WHERE id = ? AND worker = ? AND state = 'leased'",
+                (json.dumps(result), time.time(), job.id, worker),
+            )
+            if cursor.rowcount == 0:
+                return False
+            self._insert(db, follow_ups)
+            return True
+
+    def fail(self, job: Job, worker: str, error: str) -> None:
+        """Give a job back for a retry, or mark it failed after max_attempts."""
+        state = 'failed' if job.attempts >= self.max_attempts else 'pending'
+        with self._transaction() as db:
+            db.execute(
+                "UPDATE jobs SET state = ?, error = ?, worker = NULL, lease_expires = NULL, "
+                "finished = CASE WHEN ? = 'failed' THEN ? END "
+                "WHERE id = ? AND worker = ? AND state = 'leased'",
+                (state, error, state, time.time(), job.id, worker),
+            )
+
+    def counts(self) -> dict:
+        """Number of jobs per state."""
+        rows = self._db.execute('SELECT state, COUNT(*) FROM jobs GROUP BY state').fetchall()
+        return {state: count for state, count in rows}
+
+    def drained(self) -> bool:
+        """True once no job is pending or leased, so no new follow-ups can appear."""
+        counts = self.counts()
+        return not counts.get('pending') and not counts.get('leased')
+
+    def results(self):
+        """Yield (kind, payload, result) of every finished job, in publishing order."""
+        rows = self._db.execute(
+            "SELECT kind, payload, result FROM jobs WHERE state = 'done' ORDER BY created, rowid"
+        )
+        for kind, payload, result in rows:
+            yield kind, json.loads(payload), json.loads(result)
+
+    def failures(self) -> list[tuple[str, str]]:
+        """(id, last error) of jobs that ran out of attempts."""
+        return self._db.execute("SELECT id, error FROM jobs WHERE state = 'failed' ORDER BY rowid").fetchall()
+
+    def close(self) -> None:
+        self._db.close()
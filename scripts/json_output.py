@@ -0,0 +1,89 @@
+"""
+Streaming, atomic JSON output files.
+
+json.dump(output, f, indent=2) of a whole league is slow, and the indented
+file is several times larger than the data. write_json writes compact JSON
+instead, one section at a time: the top levels of the value are walked here
+and each entry below them is encoded on its own, so no string of the whole
+file is ever built. The output is byte-for-byte what
+json.dumps(value, separators=(',', ':')) would produce.
+
+The file is written next to its destination and renamed into place only
+once it is complete, so a crash never leaves a truncated file behind. Paths
+ending in .gz are gzip-compressed; read_json reads either kind.
+"""
+
+import gzip
+import io
+import json
+import os
+from pathlib import Path
+
+SEPARATORS = (',', ':')
+# Containers this many levels deep are walked; anything below is encoded whole
+STREAM_DEPTH = 2
+
+
+def json_key(key) -> str:
+    """An object key as json.dumps writes it (non-string keys become strings)."""
+    return json.dumps(key if isinstance(key, str) else json.dumps(key))
+
+
+def iter_json(value, depth: int = STREAM_DEPTH):
+    """Yield the compact JSON text of `value` in chunks."""
+    if depth > 0 and isinstance(value, dict) and value:
+        first = True
+        for key, item in value.items():
+            yield ('{' if first else ',') + json_key(key) + ':'
+            yield from iter_json(item, depth - 1)
+            first = False
+        yield '}'
+    elif depth > 0 and isinstance(value, (list, tuple)) and value:
+        for i, item in enumerate(value):
+            yield '[' if i == 0 else ','
+            yield from iter_json(item, depth - 1)
+        yield ']'
+    else:
+        yield json.dumps(value, separators=SEPARATORS)
+
+
+def dump(value, f, depth: int = STREAM_DEPTH) -> None:
+    """Write `value` as compact JSON to an open text file."""
+    for chunk in iter_json(value, depth):
+        f.write(chunk)
+
+
+def write_json(path: Path, value, depth: int = STREAM_DEPTH) -> None:
+    """Write `value` to `path` atomically; gzip-compressed if the path ends in .gz."""
+    path = Path(path)
+    tmp_path = path.with_name(path.name + '.tmp')
+
+    def write_text(binary):
+        f = io.TextIOWrapper(binary, encoding='utf-8')
+        dump(value, f, depth)
+        f.flush()
+        # Leave closing the underlying file to its own with block
+        f.detach()
+
+    try:
+        with open(tmp_path, 'wb') as raw:
+            if path.suffix == '.gz':
+                # mtime=0 keeps the compressed bytes the same for the same data
+                with gzip.GzipFile(fileobj=raw, mode='wb', mtime=0) as compressed:
+                    write_text(compressed)
+            else:
+                write_text(raw)
+            raw.flush()
+            os.fsync(raw.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+
+def read_json(path: Path):
+    """Parse a file written by write_json (or any JSON file), compressed or not."""
+    path = Path(path)
+    opener = gzip.open if path.suffix == '.gz' else open
+    with opener(path, 'rt', encoding='utf-8') as f:
+        return json.load(f)
@@ -0,0 +1,266 @@
+#!/usr/bin/env python3
+"""
+Run single Lakeland Cup data tasks without the full refresh.
+
+fetch_yahoo_data.py and fetch_draft_data.py always run their whole pipeline.
+Each subcommand here does one job, and only imports what that job needs:
+the fetch modules are loaded inside the command, and requests / PIL only
+when a command actually goes to the network or reads a logo. Commands that
+work from the existing JSON files (franchise, logos, drafts --offline) make
+no network calls and need no Yahoo login.
+
+Usage:
+    python lakeland.py leagues                 # list your Yahoo NHL leagues and their keys
+    python lakeland.py season 2024-25          # fetch and summarize one season
+    python lakeland.py season 2024-25 --json season.json
+    python lakeland.py rosters [--season 2025-26]   # refetch one season's rosters into league_data.json
+    python lakeland.py logos [--download]      # recompute logo colors (download missing logos first)
+    python lakeland.py logos --prune           # also delete duplicate logo files left from older runs
+    python lakeland.py franchise               # recompute franchise players from league_data.json
+    python lakeland.py drafts [--offline]      # refetch draft sheets (or only re-derive draft_data.json)
+    python lakeland.py prospects               # refetch the prospect protection sheet
+"""
+
+import argparse
+import json
+import os
+from pathlib import Path
+
+SCRIPTS_DIR = Path(__file__).parent
+LEAGUE_DATA_FILE = 'league_data.json'
+DRAFT_DATA_FILE = 'draft_data.json'
+METRICS_FILE = 'cli_metrics.json'
+
+
+def load_json(path):
+    """Parsed JSON file, exiting with a hint if it doesn't exist yet"""
+    if not os.path.exists(path):
+        raise SystemExit(f"{path} not found, run the full fetch first")
+    with open(path) as f:
+        return json.load(f)
+
+
+def load_league_data():
+    """The last run's league data, compressed or not, exiting with a hint if there is none yet"""
+    import fetch_yahoo_data
+    output = fetch_yahoo_data.read_league_data(LEAGUE_DATA_FILE)
+    if output is None:
+        raise SystemExit(f"{LEAGUE_DATA_FILE} not found, run the full fetch first")
+    return output
+
+
+def report_http():
+    """Write the HTTP metrics of a command that went to the network"""
+    from http_client import write_run_metrics
+    write_run_metrics(METRICS_FILE)
+
+
+def login():
+    import fetch_yahoo_data
+    api = fetch_yahoo_data.YahooFantasyAPI()
+    api.authenticate()
+    return api
+
+
+def cmd_leagues(args):
+    import fetch_yahoo_data
+    fetch_yahoo_data.list_my_leagues()
+    report_http()
+
+
+def cmd_season(args):
+    import asyncio
+    import fetch_yahoo_data
+
+    keys = fetch_yahoo_data.LAKELAND_CUP_SEASONS.get(args.season)
+    if not keys:
+        raise SystemExit(f"Unknown season {args.season}, expected one of: "
+                         f"{', '.join(sorted(fetch_yahoo_data.LAKELAND_CUP_SEASONS))}")
+
+    api = login()
+    standings, playoffs, rosters, regular_season, _, _ = asyncio.run(
+        fetch_yahoo_data.run_league_pipeline(api, [(args.season, keys)])
+    )
+    fetch_yahoo_data.print_season_summary(standings, playoffs, rosters, regular_season)
+    report_http()
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump({
+                'season': args.season,
+                'standings': standings.get(args.season),
+                'playoffs': playoffs.get(args.season),
+                'rosters': rosters.get(args.season),
+                'regular_season': fetch_yahoo_data.compact_regular_season(regular_season.get(args.season) or {}),
+            }, f, indent=2)
+        print(f"\nSaved {args.season} to {args.json}")
+
+
+def cmd_rosters(args):
+    import fetch_yahoo_data
+
+    season = args.season or fetch_yahoo_data.CURRENT_SEASON
+    keys = fetch_yahoo_data.LAKELAND_CUP_SEASONS.get(season)
+    if not keys:
+        raise SystemExit(f"Unknown season {season}")
+    output = load_league_data()
+
+    api = login()
+    rosters = fetch_yahoo_data.fetch_season_rosters(api, season, *keys)
+    if not rosters:
+        raise SystemExit(f"Could not fetch {season} rosters, {LEAGUE_DATA_FILE} left unchanged")
+
+    team_rosters = output.setdefault('team_rosters', {})
+    team_rosters[season] = rosters
+
+    output['player_history'] = fetch_yahoo_data.player_history_from_rosters(team_rosters)
+    franchise_players = fetch_yahoo_data.refresh_franchise_players(output)
+
+    fetch_yahoo_data.write_league_data(output, fetch_yahoo_data.league_data_path(LEAGUE_DATA_FILE))
+    print(f"{season}: {len(rosters)} rosters, {len(franchise_players)} franchise players")
+    report_http()
+
+
+def latest_logo_urls(api):
+    """team name -> newest logo URL, from sealed seasons first and Yahoo for the rest"""
+    import fetch_yahoo_data
+    from season_archive import SeasonArchive
+
+    standings_by_season = {}
+    archive = SeasonArchive.open(fetch_yahoo_data.ARCHIVE_FILE)
+    if archive:
+        for season in archive.seasons:
+            standings_by_season[season] = archive.season(season).get('standings')
+        archive.close()
+    for season, (game_key, league_id) in fetch_yahoo_data.LAKELAND_CUP_SEASONS.items():
+        if season not in standings_by_season:
+            standings_by_season[season] = api.get_league_standings(game_key, league_id)
+
+    urls = {}
+    for season in sorted(standings_by_season):
+        for team in standings_by_season[season] or []:
+            if team.get('logo_url'):
+                urls[team['name']] = team['logo_url']
+    return urls
+
+
+def cmd_logos(args):
+    import fetch_yahoo_data
+
+    output = load_league_data()
+    urls = latest_logo_urls(login()) if args.download else {}
+
+    all_teams = {team['name']: {'logo_url': urls.get(team['name'])} for team in output.get('teams', [])}
+    store = fetch_yahoo_data.process_logos(all_teams, recolor=not args.download)
+    for team in output.get('teams', []):
+        team['logo'] = all_teams[team['name']]['logo_file']
+        team['colors'] = all_teams[team['name']]['colors']
+
+    if args.prune:
+        for filename in store.duplicates():
+            (fetch_yahoo_data.LOGOS_DIR / filename).unlink()
+            print(f"  Removed duplicate {filename}")
+
+    # Franchise players carry their team's colors
+    fetch_yahoo_data.refresh_franchise_players(output)
+    fetch_yahoo_data.write_league_data(output, fetch_yahoo_data.league_data_path(LEAGUE_DATA_FILE))
+    if args.download:
+        report_http()
+
+
+def cmd_franchise(args):
+    import fetch_yahoo_data
+
+    output = load_league_data()
+    before = len(output.get('franchise_players', []))
+    franchise_players = fetch_yahoo_data.refresh_franchise_players(output)
+
+    for fp in franchise_players:
+        print(f"  {fp['team']}: {fp['player']} ({fp['position']}) - {fp['years']} years, "
+              f"{fp['seasons'][0]} to {fp['seasons'][-1]}")
+    print(f"\n{len(franchise_players)} franchise players (was {before})")
+
+    if not args.dry_run:
+        fetch_yahoo_data.write_league_data(output, fetch_yahoo_data.league_data_path(LEAGUE_DATA_FILE))
+
+
+def rederive_drafts(drafts, prospects):
+    """Join drafts and prospects with league_data.json and write the draft outputs"""
+    import fetch_draft_data
+
+    data, search_index = fetch_draft_data.derive_draft_data(drafts, prospects,
+                                                            fetch_draft_data.load_league_data(SCRIPTS_DIR))
+    fetch_draft_data.write_draft_outputs(data, search_index, SCRIPTS_DIR)
+    fetch_draft_data.print_draft_summary(data)
+
+
+def stored_drafts():
+    """draft_data.json of the last run, or an empty one"""
+    return load_json(DRAFT_DATA_FILE) if os.path.exists(DRAFT_DATA_FILE) else {}
+
+
+def cmd_drafts(args):
+    import fetch_draft_data
+
+    previous = stored_drafts()
+    if args.offline:
+        if not previous:
+            raise SystemExit(f"{DRAFT_DATA_FILE} not found, run without --offline first")
+        drafts = previous['drafts']
+    else:
+        drafts = fetch_draft_data.fetch_all_drafts()
+    prospects = previous.get('prospects')
+    if prospects is None:
+        if args.offline:
+            raise SystemExit(f"{DRAFT_DATA_FILE} has no prospects, run without --offline first")
+        prospects = fetch_draft_data.fetch_prospects()
+    rederive_drafts(drafts, prospects)
+    if not args.offline:
+        report_http()
+
+
+def cmd_prospects(args):
+    import fetch_draft_data
+
+    previous = stored_drafts()
+    prospects = fetch_draft_data.fetch_prospects()
+    drafts = previous.get('drafts') or fetch_draft_data.fetch_all_drafts()
+    rederive_drafts(drafts, prospects)
+    report_http()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run single Lakeland Cup data tasks")
+    commands = parser.add_subparsers(dest='command', required=True, metavar='COMMAND')
+
+    commands.add_parser('leagues', help="List your Yahoo NHL leagues with their game and league keys")
+
+    season = commands.add_parser('season', help="Fetch one season's standings, playoffs, weeks and rosters")
+    season.add_argument('season', help="Season label, e.g. 2024-25")
+    season.add_argument('--json', type=Path, metavar='FILE', help="Also save the fetched season to FILE")
+
+    rosters = commands.add_parser('rosters', help=f"Refetch one season's rosters into {LEAGUE_DATA_FILE}")
+    rosters.add_argument('--season', help="Season label (default: the current season)")
+
+    logos = commands.add_parser('logos', help="Recompute team colors from the stored logos")
+    logos.add_argument('--download', action='store_true', help="Download missing logos from Yahoo first")
+    logos.add_argument('--prune', action='store_true',
+                       help="Delete duplicate logo files left from before fetches removed them (reseed the database first)")
+
+    franchise = commands.add_parser('franchise', help=f"Recompute franchise players from {LEAGUE_DATA_FILE}")
+    franchise.add_argument('--dry-run', action='store_true', help=f"Only print, don't rewrite {LEAGUE_DATA_FILE}")
+
+    drafts = commands.add_parser('drafts', help="Refetch the draft sheets and rewrite draft_data.json")
+    drafts.add_argument('--offline', action='store_true',
+                        help=f"Don't fetch, re-derive from the stored sheets (e.g. after {LEAGUE_DATA_FILE} changed)")
+
+    commands.add_parser('prospects', help="Refetch the prospect protection sheet and rewrite draft_data.json")
+
+    args = parser.parse_args(argv)
+    os.chdir(SCRIPTS_DIR)
+    handler = globals()[f"cmd_{args.command}"]
+    handler(args)
+
+
+if __name__ == '__main__':
+    main()
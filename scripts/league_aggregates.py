@@ -0,0 +1,219 @@
+"""
+League-wide aggregates computed once per refresh.
+
+The history and team pages need all-time records, head-to-head results,
+finals appearances and title streaks. Instead of deriving them from the
+season, roster and matchup data on every request, they are materialized
+here into small lookup tables that go into league_data.json under
+'aggregates'.
+
+Tables are keyed by franchise, not team name, so a renamed team keeps its
+history. A franchise is every team name one owner has run in seasons that
+don't overlap; its id is the name it first played under, and its latest
+name is shown.
+"""
+
+HIDDEN_OWNER = '--hidden--'
+
+
+def season_year(season: str) -> int:
+    """First year of a season label ("2019-20" -> 2019)."""
+    return int(season.split('-')[0])
+
+
+def iter_games(champions: list, regular_season: dict | None):
+    """Yield (season, kind, team_a, team_b, points_a, points_b) of every scored matchup."""
+    for season, weeks in sorted((regular_season or {}).items()):
+        for week in sorted(weeks or {}):
+            for matchup in weeks[week]:
+                yield (season, 'regular', *matchup['teams'], *matchup['scores'])
+
+    for entry in champions:
+        for matchup in entry.get('playoffs') or []:
+            yield (entry['season'], 'playoffs', *matchup['teams'], *matchup['scores'])
+
+
+def franchises(all_teams: dict) -> dict:
+    """
+    Franchise id -> {name, names, seasons} from the team names of all_teams.
+
+    Names are grouped by owner, oldest first; a name joins its owner's
+    franchise unless their seasons overlap (two teams at once). Teams with
+    no known owner are franchises of their own.
+    """
+    def first_season(item):
+        name, data = item
+        return min((season_year(s) for s in data.get('seasons', [])), default=0), name
+
+    def last_season(name):
+        return max((season_year(s) for s in all_teams[name].get('seasons', [])), default=0)
+
+    result = {}
+    by_owner = {}  # owner -> franchise ids
+    for name, data in sorted(all_teams.items(), key=first_season):
+        seasons = set(data.get('seasons', []))
+        owner = data.get('owner')
+        franchise = None
+        if owner and owner != HIDDEN_OWNER:
+            franchise = next((f for f in by_owner.get(owner, []) if not seasons & set(result[f]['seasons'])), None)
+        if franchise is None:
+            franchise = name
+            result[franchise] = {'name': name, 'names': [], 'seasons': []}
+            if owner and owner != HIDDEN_OWNER:
+                by_owner.setdefault(owner, []).append(franchise)
+
+        entry = result[franchise]
+        entry['names'].append(name)
+        entry['seasons'] = sorted(set(entry['seasons']) | seasons, key=season_year)
+        entry['name'] = max(entry['names'], key=last_season)
+
+    return result
+
+
+def franchise_of(franchises: dict) -> dict:
+    """Team name -> franchise id."""
+    return {name: franchise for franchise, entry in franchises.items() for name in entry['names']}
+
+
+def empty_record(name: str, seasons: int = 0) -> dict:
+    """Record of a franchise before any games; W/L/T lists are [wins, losses, ties]."""
+    return {
+        'name': name,
+        'seasons': seasons,
+        'regular': [0, 0, 0],
+        'playoffs': [0, 0, 0],
+        'points_for': 0.0,
+        'points_against': 0.0,
+        'titles': [],
+        'finals': [],
+    }
+
+
+def franchise_records(franchises: dict, champions: list, games: list) -> dict:
+    """All-time regular season and playoff records per franchise id."""
+    records = {franchise: empty_record(entry['name'], len(entry['seasons'])) for franchise, entry in franchises.items()}
+    franchise = franchise_of(franchises)
+
+    def record_for(name):
+        # Scoreboard names that never showed up in the standings get a record too
+        key = franchise.get(name, name)
+        if key not in records:
+            records[key] = empty_record(name)
+        return records[key]
+
+    for _, kind, team_a, team_b, points_a, points_b in games:
+        for name, scored, allowed in ((team_a, points_a, points_b), (team_b, points_b, points_a)):
+            record = record_for(name)
+            result = 0 if scored > allowed else 1 if scored < allowed else 2
+            record[kind][result] += 1
+            record['points_for'] += scored
+            record['points_against'] += allowed
+
+    for entry in champions:
+        if entry['champion_team']:
+            record_for(entry['champion_team'])['titles'].append(entry['season'])
+        for team in (entry['champion_team'], entry['runner_up_team']):
+            if team:
+                record_for(team)['finals'].append(entry['season'])
+
+    for record in records.values():
+        record['points_for'] = round(record['points_for'], 2)
+        record['points_against'] = round(record['points_against'], 2)
+
+    return dict(sorted(records.items()))
+
+
+def head_to_head(teams: list[str], games: list, franchise: dict | None = None) -> dict:
+    """
+    Win and tie matrices over all matchups.
+
+    wins[i][j] counts wins of teams[i] over teams[j], so the losses of i
+    against j are wins[j][i]; ties[i][j] is symmetric. With `franchise`
+    (team name -> franchise id) `teams` are franchise ids.
+    """
+    franchise = franchise or {}
+    index = {name: i for i, name in enumerate(teams)}
+    index.update((name, index[key]) for name, key in franchise.items() if key in index)
+    size = len(teams)
+    wins = [[0] * size for _ in range(size)]
+    ties = [[0] * size for _ in range(size)]
+
+    for _, _, team_a, team_b, points_a, points_b in games:
+        a, b = index[team_a], index[team_b]
+        if points_a > points_b:
+            wins[a][b] += 1
+        elif points_b > points_a:
+            wins[b][a] += 1
+        else:
+            ties[a][b] += 1
+            ties[b][a] += 1
+
+    return {'wins': wins, 'ties': ties}
+
+
+def finals_appearances(champions: list, franchise: dict | None = None) -> list:
+    """Every final as {season, champion, runner_up, score} under that season's names, newest first."""
+    franchise = franchise or {}
+    finals = []
+    for entry in champions:
+        if not entry['runner_up_team']:
+            continue
+        score = None
+        playoffs = entry.get('playoffs') or []
+        if playoffs:
+            last_round = max(m['round'] for m in playoffs)
+            for matchup in playoffs:
+                if matchup['round'] == last_round and set(matchup['teams']) == {entry['champion_team'], entry['runner_up_team']}:
+                    champion_side = matchup['teams'].index(entry['champion_team'])
+                    score = [matchup['scores'][champion_side], matchup['scores'][1 - champion_side]]
+        finals.append({
+            'season': entry['season'],
+            'champion': entry['champion_team'],
+            'runner_up': entry['runner_up_team'],
+            'champion_franchise': franchise.get(entry['champion_team'], entry['champion_team']),
+            'runner_up_franchise': franchise.get(entry['runner_up_team'], entry['runner_up_team']),
+            'score': score,
+        })
+    finals.sort(key=lambda f: season_year(f['season']), reverse=True)
+    return finals
+
+
+def champion_streaks(champions: list, franchises: dict | None = None) -> list:
+    """Runs of consecutive titles by one franchise, longest first, under its latest name."""
+    franchises = franchises or {}
+    franchise = franchise_of(franchises)
+    streaks = []
+    for entry in sorted(champions, key=lambda e: season_year(e['season'])):
+        key = franchise.get(entry['champion_team'], entry['champion_team'])
+        last = streaks[-1] if streaks else None
+        if last and last['franchise'] == key and season_year(entry['season']) == season_year(last['seasons'][-1]) + 1:
+            last['seasons'].append(entry['season'])
+        else:
+            name = franchises[key]['name'] if key in franchises else entry['champion_team']
+            streaks.append({'franchise': key, 'team': name, 'seasons': [entry['season']]})
+
+    for streak in streaks:
+        streak['length'] = len(streak['seasons'])
+    streaks.sort(key=lambda s: (-s['length'], season_year(s['seasons'][0])))
+    return streaks
+
+
+def build_aggregates(all_teams: dict, champions: list, regular_season: dict | None = None) -> dict:
+    """All lookup tables for league_data.json."""
+    games = [game for game in iter_games(champions, regular_season)
+             if game[2] and game[3] and game[4] is not None and game[5] is not None]
+
+    teams_by_franchise = franchises(all_teams)
+    franchise = franchise_of(teams_by_franchise)
+    records = franchise_records(teams_by_franchise, champions, games)
+    teams = list(records)
+
+    return {
+        'teams': teams,
+        'franchises': {key: {'name': entry['name'], 'names': entry['names']}
+                       for key, entry in sorted(teams_by_franchise.items())},
+        'records': records,
+        'head_to_head': head_to_head(teams, games, franchise),
+        'finals': finals_appearances(champions, franchise),
+        'champion_streaks': champion_streaks(champions, teams_by_franchise),
+    }
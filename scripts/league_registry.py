@@ -0,0 +1,88 @@
+"""
+Registry of the Yahoo leagues to fetch.
+
+By default fetch_yahoo_data.py only knows the Lakeland Cup. A registry file
+lists any number of leagues with their season keys, plus the request limits
+shared by all of them:
+
+    {
+        "rate_limit": {"requests_per_second": 5, "max_in_flight": 8},
+        "league_concurrency": 2,
+        "leagues": [
+            {
+                "slug": "lakeland-cup",
+                "name": "Lakeland Cup",
+                "seasons": {"2024-25": ["453", "4440"], "2025-26": ["465", "2066"]}
+            }
+        ]
+    }
+
+See leagues.json.example.
+"""
+
+import json
+import re
+from pathlib import Path
+
+DEFAULT_RATE_LIMIT = {'requests_per_second': 5, 'max_in_flight': 8}
+DEFAULT_LEAGUE_CONCURRENCY = 2
+
+
+class League:
+    """One league: a slug for its output directory and its seasons."""
+
+    def __init__(self, slug: str, name: str, seasons: dict):
+        self.slug = slug
+        self.name = name
+        self.seasons = {season: (str(game_key), str(league_id)) for season, (game_key, league_id) in seasons.items()}
+        self.current_season = max(self.seasons)
+
+    @property
+    def completed_keys(self) -> set[str]:
+        """League keys of finished seasons (their responses never change)."""
+        return {
+            f"{game_key}.l.{league_id}"
+            for season, (game_key, league_id) in self.seasons.items()
+            if season != self.current_season
+        }
+
+
+class Registry:
+    """Leagues plus the limits shared by one multi-league run."""
+
+    def __init__(self, leagues: list[League], rate_limit: dict | None = None,
+                 league_concurrency: int = DEFAULT_LEAGUE_CONCURRENCY):
+        self.leagues = leagues
+        self.rate_limit = {**DEFAULT_RATE_LIMIT, **(rate_limit or {})}
+        self.league_concurrency = league_concurrency
+
+
+def load_registry(path: Path) -> Registry:
+    """Read and validate a registry file."""
+    with open(path) as f:
+        config = json.load(f)
+
+    leagues = []
+    slugs = set()
+    for entry in config.get('leagues', []):
+        slug = entry.get('slug', '')
+        if not re.fullmatch(r'[a-z0-9][a-z0-9-]*', slug):
+            raise ValueError(f"{path}: league slug must be lowercase letters, digits and dashes: {slug!r}")
+        if slug in slugs:
+            raise ValueError(f"{path}: duplicate league slug {slug!r}")
+        if not entry.get('seasons'):
+            raise ValueError(f"{path}: league {slug!r} has no seasons")
+        for season, keys in entry['seasons'].items():
+            if not re.fullmatch(r'\d{4}-\d{2}', season) or len(keys) != 2:
+                raise ValueError(f"{path}: league {slug!r} season {season!r} must map to [game_key, league_id]")
+        slugs.add(slug)
+        leagues.append(League(slug, entry.get('name', slug), entry['seasons']))
+
+    if not leagues:
+        raise ValueError(f"{path}: no leagues configured")
+
+    return Registry(
+        leagues,
+        rate_limit=config.get('rate_limit'),
+        league_concurrency=int(config.get('league_concurrency', DEFAULT_LEAGUE_CONCURRENCY)),
+    )
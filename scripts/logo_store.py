@@ -0,0 +1,174 @@
+"""
+Deduplicated team logo storage.
+
+Logos used to be saved once per team name, so a franchise that renamed
+itself, or teams that kept Yahoo's default avatar, stored the same image
+several times and had its colors extracted once per copy. The store keeps
+one canonical file per distinct image and maps every team name to one of
+them, in an index next to the images:
+
+    public/images/teams/logos.json
+    {"images": {"<file>": {"sha256": ..., "phash": ..., "size": [w, h], "colors": [...]}},
+     "aliases": {"<team name>": "<file>"}}
+
+Two images are the same logo if their bytes match or if their perceptual
+hashes differ in at most PHASH_DISTANCE bits, which catches the same logo
+re-encoded or served at another size (the larger copy is kept). The hash
+is a difference hash of each RGB channel, so logos that share a shape but
+not their colors, like Yahoo's jersey templates, stay apart. Colors are
+extracted once per canonical image and cached in the index.
+"""
+
+import hashlib
+import io
+from pathlib import Path
+
+from json_output import read_json, write_json
+
+INDEX_FILE = 'logos.json'
+HASH_SIZE = 8
+# Out of 3 * HASH_SIZE**2 = 192 bits
+PHASH_DISTANCE = 10
+
+
+def perceptual_hash(content: bytes) -> tuple[str, list[int]] | tuple[None, None]:
+    """(hex difference hash of the R, G and B channels, [width, height]), or (None, None) for non-images."""
+    try:
+        from PIL import Image
+
+        img = Image.open(io.BytesIO(content))
+        size = list(img.size)
+        # Transparent areas count as white, as on the site
+        img = img.convert('RGBA')
+        background = Image.new('RGBA', img.size, (255, 255, 255, 255))
+        small = Image.alpha_composite(background, img).convert('RGB').resize((HASH_SIZE + 1, HASH_SIZE),
+                                                                             Image.LANCZOS)
+    except Exception:
+        return None, None
+
+    bits = 0
+    for channel in small.split():
+        pixels = channel.load()
+        for y in range(HASH_SIZE):
+            for x in range(HASH_SIZE):
+                bits = bits << 1 | (pixels[x, y] > pixels[x + 1, y])
+    return f"{bits:0{3 * HASH_SIZE * HASH_SIZE // 4}x}", size
+
+
+def hash_distance(a: str, b: str) -> int:
+    return bin(int(a, 16) ^ int(b, 16)).count('1')
+
+
+class LogoStore:
+    """Canonical logo files plus team name aliases in one directory."""
+
+    def __init__(self, directory: Path):
+        self.directory = Path(directory)
+        self.index_path = self.directory / INDEX_FILE
+        index = read_json(self.index_path) if self.index_path.exists() else {}
+        self.images = index.get('images', {})
+        self.aliases = index.get('aliases', {})
+        self.extractions = 0
+        self.removed = []  # duplicate files deleted by adopt
+
+    def file_for(self, team: str) -> str | None:
+        """Canonical file of a team already in the store."""
+        filename = self.aliases.get(team)
+        if filename and (self.directory / filename).exists():
+            return filename
+        return None
+
+    def match(self, sha256: str, phash: str | None) -> str | None:
+        """Canonical file of the same image, if there is one."""
+        for filename, image in self.images.items():
+            if image['sha256'] == sha256:
+                return filename
+        if phash:
+            for filename, image in self.images.items():
+                if image.get('phash') and hash_distance(image['phash'], phash) <= PHASH_DISTANCE:
+                    return filename
+        return None
+
+    def add(self, team: str, content: bytes, filename: str) -> str:
+        """
+        Store a team's logo and return its canonical file.
+
+        An image already in the store only gets the team as a new alias
+        (replacing the stored copy if this one is larger); a new image is
+        written as `filename`.
+        """
+        sha256 = hashlib.sha256(content).hexdigest()
+        phash, size = perceptual_hash(content)
+        canonical = self.match(sha256, phash)
+
+        if canonical is None:
+            path = self.directory / filename
+            if path.exists() and hashlib.sha256(path.read_bytes()).hexdigest() != sha256:
+                # A different image (e.g. an older file not yet in the index) has this name
+                path = path.with_name(f"{path.stem}-{sha256[:8]}{path.suffix}")
+            canonical = path.name
+            self.directory.mkdir(parents=True, exist_ok=True)
+            if not path.exists():
+                path.write_bytes(content)
+            self.images[canonical] = {'sha256': sha256, 'phash': phash, 'size': size, 'colors': None}
+        else:
+            stored = self.images[canonical]
+            if size and stored.get('size') and size[0] * size[1] > stored['size'][0] * stored['size'][1]:
+                (self.directory / canonical).write_bytes(content)
+                self.images[canonical] = {'sha256': sha256, 'phash': phash, 'size': size, 'colors': None}
+
+        self.aliases[team] = canonical
+        return canonical
+
+    def adopt(self, team: str, filename: str) -> str | None:
+        """
+        Bring a file saved before the store existed (one per team name) into the store.
+
+        If the image is already stored under another file, the team is
+        aliased to that one and this copy is deleted.
+        """
+        path = self.directory / filename
+        if not path.exists():
+            return None
+        canonical = self.add(team, path.read_bytes(), filename)
+        if canonical != filename and filename not in self.images:
+            path.unlink()
+            self.removed.append(filename)
+        return canonical
+
+    def colors(self, filename: str, extract) -> list | None:
+        """Cached colors of a canonical image; `extract(path)` computes them on first use."""
+        image = self.images[filename]
+        if image.get('colors') is None:
+            image['colors'] = extract(self.directory / filename)
+            self.extractions += 1
+        return image['colors']
+
+    def remember_colors(self, filename: str, colors: list | None) -> None:
+        """Colors computed elsewhere (e.g. by a queue worker), unless some are cached already."""
+        if self.images[filename].get('colors') is None:
+            self.images[filename]['colors'] = colors
+
+    def forget_colors(self) -> None:
+        for image in self.images.values():
+            image['colors'] = None
+
+    def duplicates(self) -> list[str]:
+        """
+        Image files in the directory that are not canonical (superseded copies of stored logos).
+
+        adopt() deletes the copies it comes across; this finds the ones left
+        over from before it did, for a one-off cleanup.
+        """
+        canonical = set(self.images)
+        return sorted(
+            path.name for path in self.directory.iterdir()
+            if path.suffix.lower() in ('.png', '.jpg', '.jpeg', '.gif') and path.name not in canonical
+            and self.match(hashlib.sha256(path.read_bytes()).hexdigest(), perceptual_hash(path.read_bytes())[0])
+        )
+
+    def save(self) -> None:
+        # Drop images no team points to any more
+        used = set(self.aliases.values())
+        self.images = {filename: image for filename, image in sorted(self.images.items()) if filename in used}
+        write_json(self.index_path, {'images': self.images, 'aliases': dict(sorted(self.aliases.items()))})
@@ -0,0 +1,294 @@
+"""
+Resolve hand-typed player names to Yahoo player IDs.
+
+Draft sheets abbreviate and misspell names ("M. Hrabal", "Kappo Kakko") while
+player_history uses Yahoo's full names. Instead of comparing every pick with
+every player, names are bucketed by blocking keys (surname, initial+surname,
+surname trigrams) and only the candidates sharing a bucket are scored with
+edit distance.
+"""
+
+import re
+import unicodedata
+from collections import defaultdict
+
+# Minimum confidence for a match to be accepted
+MATCH_THRESHOLD = 0.8
+
+# Candidates scored per query (ranked by shared blocking keys)
+MAX_CANDIDATES = 25
+
+# Initials only tell us the first letter, so they never score a perfect match
+INITIAL_PENALTY = 0.95
+
+
+def normalize_name(name: str) -> str:
+    """Lowercase, strip accents and punctuation, collapse whitespace."""
+    text = unicodedata.normalize('NFKD', name)
+    text = ''.join(c for c in text if not unicodedata.combining(c))
+    text = text.lower().replace('’', "'")
+    text = re.sub(r"[.,']", ' ', text)
+    text = re.sub(r'[^a-z\s-]', '', text)
+    return re.sub(r'\s+', ' ', text).strip()
+
+
+def split_name(normalized: str) -> tuple[str, str]:
+    """Split a normalized name into (first, surname)."""
+    parts = normalized.split(' ')
+    if len(parts) == 1:
+        return '', parts[0]
+    return ' '.join(parts[:-1]), parts[-1]
+
+
+def trigrams(text: str) -> set[str]:
+    """Padded character trigrams of a string."""
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def blocking_keys(normalized: str) -> set[str]:
+    """Keys under which a name is bucketed in the index."""
+    first, surname = split_name(normalized)
+    keys = {f"s:{surname}"}
+    if first:
+        keys.add(f"i:{first[0]}:{surname}")
+    keys.update(f"t:{gram}" for gram in trigrams(surname))
+    return keys
+
+
+def levenshtein(a: str, b: str, row: list[int] | None = None) -> int:
+    """Edit distance between two strings, reusing `row` as scratch space."""
+    if a == b:
+        return 0
+    if len(a) < len(b):
+        a, b = b, a
+    if not b:
+        return len(a)
+
+    size = len(b) + 1
+    if row is None or len(row) < size:
+        row = [0] * size
+    for j in range(size):
+        row[j] = j
+
+    for i, ca in enumerate(a, 1):
+        prev_diag = row[0]
+        row[0] = i
+        for j, cb in enumerate(b, 1):
+            current = row[j]
+            if ca == cb:
+                row[j] = prev_diag
+            else:
+                row[j] = 1 + min(prev_diag, current, row[j - 1])
+            prev_diag = current
+
+    return row[len(b)]
+
+
+def similarity(a: str, b: str, row: list[int] | None = None) -> float:
+    """Edit-distance similarity in [0, 1]."""
+    longest = max(len(a), len(b))
+    if not longest:
+        return 1.0
+    return 1.0 - levenshtein(a, b, row) / longest
+
+
+def score_batch(query: str, candidates: list[str]) -> list[float]:
+    """Score one normalized query against a batch of normalized candidates."""
+    first, surname = split_name(query)
+    is_initial = len(first) == 1
+    row = [0] * (max((len(c) for c in candidates), default=0) + len(query) + 1)
+
+    scores = []
+    for candidate in candidates:
+        cand_first, cand_surname = split_name(candidate)
+        if is_initial:
+            if not cand_first.startswith(first):
+                scores.append(0.0)
+                continue
+            score = similarity(surname, cand_surname, row) * INITIAL_PENALTY
+        else:
+            score = similarity(query, candidate, row)
+        scores.append(score)
+
+    return scores
+
+
+class PlayerIndex:
+    """Blocking index over player_history names."""
+
+    def __init__(self, player_history: dict):
+        self.names = []
+        self.normalized = []
+        self.ids = []
+        self.buckets = defaultdict(list)
+
+        for name, data in player_history.items():
+            self.add(name, data.get('player_id'))
+
+    def add(self, name: str, value: str | None) -> None:
+        """Index a name under the value a match on it resolves to."""
+        normalized = normalize_name(name)
+        if not normalized:
+            return
+        index = len(self.names)
+        self.names.append(name)
+        self.normalized.append(normalized)
+        self.ids.append(value)
+        for key in blocking_keys(normalized):
+            self.buckets[key].append(index)
+
+    def candidates(self, normalized: str) -> list[int]:
+        """Indices of players sharing the most blocking keys with a name."""
+        hits = defaultdict(int)
+        for key in blocking_keys(normalized):
+            # Exact surname keys count for more than a shared trigram
+            weight = 1 if key.startswith('t:') else 10
+            for index in self.buckets.get(key, ()):
+                hits[index] += weight
+
+        ranked = sorted(hits, key=lambda i: -hits[i])
+        return ranked[:MAX_CANDIDATES]
+
+    def resolve(self, name: str) -> dict:
+        """Best match for a name as {player_id, matched_name, confidence}."""
+        normalized = normalize_name(name)
+        result = {'player_id': None, 'matched_name': None, 'confidence': 0.0}
+        if not normalized:
+            return result
+
+        indices = self.candidates(normalized)
+        if not indices:
+            return result
+
+        scores = score_batch(normalized, [self.normalized[i] for i in indices])
+        ranked = sorted(zip(scores, indices), reverse=True)
+        best_score, best_index = ranked[0]
+
+        # Two different players scoring the same (e.g. "S. Hughes") is a guess
+        if len(ranked) > 1:
+            runner_score, runner_index = ranked[1]
+            if (best_score - runner_score < 0.02
+                    and self.ids[runner_index] != self.ids[best_index]):
+                best_score /= 2
+
+        result['matched_name'] = self.names[best_index]
+        result['confidence'] = round(best_score, 3)
+        if best_score >= MATCH_THRESHOLD:
+            result['player_id'] = self.ids[best_index]
+        return result
+
+
+class PickIndex(PlayerIndex):
+    """Blocking index over drafted names, resolving to pick keys instead of player IDs."""
+
+    def __init__(self, drafted: dict[str, str]):
+        super().__init__({})
+        for name, pick_key in drafted.items():
+            self.add(name, pick_key)
+
+    def resolve(self, name: str) -> dict:
+        """Best match for a name as {pick_key, matched_name, confidence}."""
+        match = super().resolve(name)
+        return {'pick_key': match.pop('player_id'), **match}
+
+
+def resolve_draft_players(drafts: dict, player_history: dict) -> dict:
+    """
+    Attach player_id and match_confidence to every draft pick.
+
+    Returns a report with counts and the picks that could not be resolved.
+    """
+    index = PlayerIndex(player_history)
+    cache = {}
+    resolved = 0
+    unresolved = []
+
+    for year, draft in sorted(drafts.items()):
+        for round_name, picks in draft['entry_draft'].items():
+            for pick in picks:
+                name = pick['player']
+                if name not in cache:
+                    cache[name] = index.resolve(name)
+                match = cache[name]
+
+                pick['player_id'] = match['player_id']
+                pick['match_confidence'] = match['confidence']
+
+                if match['player_id']:
+                    resolved += 1
+                else:
+                    unresolved.append({
+                        'year': year,
+                        'round': round_name,
+                        'pick': pick['pick'],
+                        'player': name,
+                        'best_guess': match['matched_name'],
+                        'confidence': match['confidence'],
+                    })
+
+    return {
+        'resolved': resolved,
+        'unresolved_count': len(unresolved),
+        'unresolved': unresolved,
+    }
+
+
+def build_search_index(drafts: dict, player_history: dict) -> dict:
+    """
+    Build a prebuilt name search index over drafted and rostered players.
+
+    Draft picks must already carry player_id (see resolve_draft_players) so
+    a drafted player and their Yahoo entry collapse into one record. Each
+    record keeps its normalized name and every spelling seen, and the
+    trigram postings map each trigram to the records containing it.
+    """
+    entries = []
+    by_key = {}
+
+    def entry_for(key, name, player_id=None, position=None):
+        if key not in by_key:
+            by_key[key] = len(entries)
+            entries.append({
+                'name': name,
+                'normalized': normalize_name(name),
+                'aliases': [],
+                'player_id': player_id,
+                'position': position,
+                'drafted': [],
+            })
+        return entries[by_key[key]]
+
+    for name, data in sorted(player_history.items()):
+        player_id = data.get('player_id')
+        entry_for(player_id or name, name, player_id, data.get('position'))
+
+    for year, draft in sorted(drafts.items()):
+        for round_name, picks in draft['entry_draft'].items():
+            for pick in picks:
+                name = pick['player']
+                if not normalize_name(name):
+                    continue
+                player_id = pick.get('player_id')
+                entry = entry_for(player_id or normalize_name(name), name, player_id)
+                entry['drafted'].append({
+                    'year': year,
+                    'round': int(round_name.split('_')[-1]),
+                    'pick': pick['pick'],
+                    'team': pick['team'],
+                })
+
+                if name != entry['name'] and name not in entry['aliases']:
+                    entry['aliases'].append(name)
+
+    postings = defaultdict(set)
+    for index, entry in enumerate(entries):
+        forms = [entry['normalized']] + [normalize_name(alias) for alias in entry['aliases']]
+        for form in forms:
+            for gram in trigrams(form):
+                postings[gram].add(index)
+
+    return {
+        'entries': entries,
+        'trigrams': {gram: sorted(ids) for gram, ids in sorted(postings.items())},
+    }
@@ -0,0 +1,142 @@
+"""
+Stage-level profiling for the fetch scripts (--profile).
+
+Each named stage of a run is wrapped in cProfile and tracemalloc. Per stage
+this writes <stage>.pstats (open with `python -m pstats` or snakeviz) and
+<stage>.collapsed, a folded-stack file sampled from all threads that
+flamegraph.pl or speedscope can render directly. profile_summary.json lists
+wall and CPU time, peak traced memory and the top functions of every stage.
+"""
+
+import contextlib
+import cProfile
+import io
+import json
+import pstats
+import re
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from pathlib import Path
+
+# Seconds between stack samples for the collapsed-stack files
+SAMPLE_INTERVAL = 0.005
+
+
+class StackSampler:
+    """Samples the stacks of all other threads into folded-stack counts."""
+
+    def __init__(self, interval: float = SAMPLE_INTERVAL):
+        self.interval = interval
+        self.counts = Counter()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _sample(self):
+        own_id = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            names = {t.ident: t.name for t in threading.enumerate()}
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f"{code.co_name} ({Path(code.co_filename).name}:{frame.f_lineno})")
+                    frame = frame.f_back
+                thread_name = names.get(thread_id, str(thread_id))
+                self.counts[';'.join([thread_name] + stack[::-1])] += 1
+
+    def start(self):
+        self._thread = threading.Thread(target=self._sample, name='stack-sampler', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def write(self, path: Path):
+        with open(path, 'w') as f:
+            for stack, count in sorted(self.counts.items()):
+                f.write(f"{stack} {count}\n")
+
+
+class StageProfiler:
+    """Context manager factory; does nothing unless an output dir is given."""
+
+    def __init__(self, output_dir: Path | None = None):
+        self.output_dir = Path(output_dir) if output_dir else None
+        self.stages = {}
+        if self.output_dir:
+            self.output_dir.mkdir(parents=True, exist_ok=True)
+
+    @property
+    def enabled(self) -> bool:
+        return self.output_dir is not None
+
+    @contextlib.contextmanager
+    def stage(self, name: str):
+        """Profile the enclosed block as stage `name`."""
+        if not self.enabled:
+            yield
+            return
+
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+        tracemalloc.reset_peak()
+        memory_before, _ = tracemalloc.get_traced_memory()
+
+        sampler = StackSampler()
+        profiler = cProfile.Profile()
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+
+        sampler.start()
+        profiler.enable()
+        try:
+            yield
+        finally:
+            profiler.disable()
+            sampler.stop()
+            wall = time.perf_counter() - wall_start
+            cpu = time.process_time() - cpu_start
+            memory_after, memory_peak = tracemalloc.get_traced_memory()
+            self._save(name, profiler, sampler, {
+                'wall_s': round(wall, 4),
+                'cpu_s': round(cpu, 4),
+                'peak_memory_bytes': memory_peak,
+                'peak_above_start_bytes': memory_peak - memory_before,
+                'retained_bytes': memory_after - memory_before,
+            })
+
+    def _save(self, name, profiler, sampler, figures):
+        filename = re.sub(r'[^\w.-]', '_', name)
+        profiler.dump_stats(self.output_dir / f"{filename}.pstats")
+        sampler.write(self.output_dir / f"{filename}.collapsed")
+
+        stats = pstats.Stats(profiler, stream=io.StringIO())
+        top = sorted(stats.stats.items(), key=lambda item: item[1][3], reverse=True)[:15]
+        figures['top_cumulative'] = [
+            {
+                'function': f"{func_name} ({Path(filename_).name}:{line})",
+                'calls': calls,
+                'total_s': round(total_time, 4),
+                'cumulative_s': round(cumulative, 4),
+            }
+            for (filename_, line, func_name), (_, calls, total_time, cumulative, _) in top
+        ]
+
+        self.stages[name] = figures
+        print(f"  [profile] {name}: {figures['wall_s']}s wall, {figures['cpu_s']}s CPU, "
+              f"peak {figures['peak_memory_bytes'] / 1e6:.1f} MB")
+
+    def write_summary(self):
+        """Write profile_summary.json with the figures of every stage."""
+        if not self.enabled:
+            return
+        path = self.output_dir / 'profile_summary.json'
+        with open(path, 'w') as f:
+            json.dump(self.stages, f, indent=2)
+        print(f"\nProfiles saved to {self.output_dir}")
@@ -0,0 +1,332 @@
+#!/usr/bin/env python3
+"""
+Run a full refresh through a durable job queue shared by several workers.
+
+One fetch_yahoo_data.py process is bound to one IP's rate limits and one
+CPU for parsing and logo colors. Here every fetch unit (season standings,
+settings, playoff and regular season weeks, team lists, rosters, logos, the
+draft sheets and the prospect sheet) is a job in fetch_queue.db (see
+job_queue.py). Worker processes claim jobs with leases, publish the
+follow-ups they discover, and store each unit's parsed result. Once the
+queue is drained, merge folds the results into league_data.json and
+draft_data.json exactly like the single-process fetchers do.
+
+Usage:
+    python queue_fetch.py publish [--fresh]     # queue the initial units
+    python queue_fetch.py work [--processes 4]  # in as many terminals or hosts as you like
+    python queue_fetch.py status
+    python queue_fetch.py merge [--no-stats]    # write league_data.json and draft_data.json
+    python queue_fetch.py run --processes 4     # all of the above on this machine
+"""
+
+import argparse
+import base64
+import multiprocessing
+import os
+import re
+import tempfile
+import time
+from pathlib import Path
+
+import fetch_draft_data
+import fetch_yahoo_data
+from http_client import get_client, write_run_metrics
+from job_queue import DEFAULT_LEASE_SECONDS, DEFAULT_MAX_ATTEMPTS, JobQueue, worker_name
+from logo_store import LogoStore
+
+SCRIPTS_DIR = Path(__file__).parent
+QUEUE_FILE = 'fetch_queue.db'
+# Each worker process writes its own HTTP metrics, the merge writes queue_metrics.json
+WORKER_METRICS_FILE = 'queue_metrics.{worker}.json'
+# Seconds an idle worker waits before looking again while other workers hold leases
+IDLE_POLL = 2.0
+
+
+def unit_job(request):
+    """Queue job of one Yahoo fetch unit (see fetch_yahoo_data.parse_payload)"""
+    return fetch_yahoo_data.unit_key(request), request['kind'], request
+
+
+def has_logo(store, team):
+    """True if the logo store (or a file saved before it) already has a team's logo"""
+    return bool(store.file_for(team)) or (store.directory / f"{fetch_yahoo_data.slugify(team)}.png").exists()
+
+
+def logo_jobs(season, standings, store):
+    """
+    One job per team logo URL; a franchise keeping its logo across seasons is downloaded once.
+
+    Teams whose logo is already stored get no job, as in the single-process fetch.
+    """
+    return [
+        (f"logo {team['name']} {team['logo_url']}", 'logo',
+         {'season': season, 'team': team['name'], 'url': team['logo_url']})
+        for team in standings or []
+        if team.get('logo_url') and not has_logo(store, team['name'])
+    ]
+
+
+def initial_jobs():
+    """Standings of every season plus the draft and prospect sheets"""
+    jobs = [
+        unit_job(request)
+        for season, (game_key, league_id) in sorted(fetch_yahoo_data.LAKELAND_CUP_SEASONS.items())
+        for request in fetch_yahoo_data.season_requests(season, game_key, league_id)
+    ]
+    jobs += [(f"sheet {year}", 'sheet', {'year': year, 'gid': gid})
+             for year, gid in fetch_draft_data.DRAFT_SHEETS.items()]
+    jobs.append(('prospects', 'prospects', {'gid': fetch_draft_data.PROSPECTS_GID}))
+    return jobs
+
+
+def fetch_logo(team, url):
+    """Download a logo and extract its colors; the coordinator writes the file"""
+    response = get_client().get(url, endpoint_type='logo')
+    if response.status_code != 200:
+        raise RuntimeError(f"logo download failed: {response.status_code}")
+
+    with tempfile.NamedTemporaryFile(suffix='.png') as f:
+        f.write(response.content)
+        f.flush()
+        colors = fetch_yahoo_data.extract_logo_colors(f.name)
+
+    return {
+        'file': f"{fetch_yahoo_data.slugify(team)}.png",
+        'content': base64.b64encode(response.content).decode('ascii'),
+        'colors': colors,
+    }
+
+
+class Worker:
+    """Claims and runs jobs until the queue is drained"""
+
+    def __init__(self, queue, name):
+        self.queue = queue
+        self.name = name
+        self.done = 0
+        self.failed = 0
+        self._api = None
+        self.logos = LogoStore(fetch_yahoo_data.LOGOS_DIR)
+
+    @property
+    def api(self):
+        # Sheet and logo jobs need no Yahoo login
+        if self._api is None:
+            self._api = fetch_yahoo_data.YahooFantasyAPI()
+            self._api.authenticate()
+        return self._api
+
+    def handle(self, job):
+        """Run one job; returns (result, follow-up jobs)"""
+        payload = job.payload
+        if job.kind == 'sheet':
+            rows = fetch_draft_data.fetch_sheet(payload['gid'])
+            return fetch_draft_data.parse_draft_sheet(rows, payload['year']), []
+        if job.kind == 'prospects':
+            return fetch_draft_data.parse_prospects(fetch_draft_data.fetch_sheet(payload['gid'])), []
+        if job.kind == 'logo':
+            return fetch_logo(payload['team'], payload['url']), []
+
+        data = self.api.api_request(payload['endpoint'])
+        if data is None and job.attempts < self.queue.max_attempts:
+            # Retried; the last attempt records the unit as missing, like the pipeline does
+            raise RuntimeError('no data')
+        records, follow_ups = fetch_yahoo_data.parse_payload(payload, data)
+        jobs = [unit_job(request) for request in follow_ups]
+        if job.kind == 'standings':
+            jobs += logo_jobs(payload['season'], records[0][2], self.logos)
+        return [records, follow_ups], jobs
+
+    def run(self):
+        while True:
+            job = self.queue.claim(self.name)
+            if job is None:
+                if self.queue.drained():
+                    return
+                time.sleep(IDLE_POLL)
+                continue
+
+            try:
+                result, follow_ups = self.handle(job)
+            except Exception as e:
+                self.failed += 1
+                self.queue.fail(job, self.name, f"{type(e).__name__}: {e}")
+                print(f"  [{self.name}] {job.id} failed (attempt {job.attempts}): {e}")
+                continue
+
+            if self.queue.complete(job, self.name, result, follow_ups):
+                self.done += 1
+            else:
+                print(f"  [{self.name}] {job.id}: lease lost, result dropped")
+
+
+def open_queue(args):
+    return JobQueue(args.queue, lease_seconds=args.lease, max_attempts=args.attempts)
+
+
+def run_worker(args, index):
+    """Entry point of one worker process"""
+    os.chdir(SCRIPTS_DIR)
+    queue = open_queue(args)
+    worker = Worker(queue, f"{worker_name()}#{index}")
+    worker.run()
+    queue.close()
+    print(f"  [{worker.name}] {worker.done} jobs done, {worker.failed} failed attempts")
+    write_run_metrics(WORKER_METRICS_FILE.format(worker=re.sub(r'[^\w.-]+', '-', worker.name)))
+
+
+def cmd_publish(args):
+    if args.fresh:
+        for suffix in ('', '-wal', '-shm'):
+            Path(f"{args.queue}{suffix}").unlink(missing_ok=True)
+    queue = open_queue(args)
+    added = queue.publish(initial_jobs())
+    print(f"Published {added} jobs to {args.queue} ({sum(queue.counts().values())} in total)")
+    queue.close()
+
+
+def cmd_work(args):
+    # Log in once here so worker processes find a fresh token instead of each prompting
+    fetch_yahoo_data.YahooFantasyAPI().authenticate()
+
+    print(f"Working on {args.queue} with {args.processes} processes...")
+    context = multiprocessing.get_context('spawn')
+    processes = [context.Process(target=run_worker, args=(args, i)) for i in range(args.processes)]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+    cmd_status(args)
+
+
+def cmd_status(args):
+    queue = open_queue(args)
+    counts = queue.counts()
+    print(f"{args.queue}: " + ', '.join(f"{counts.get(state, 0)} {state}"
+                                       for state in ('pending', 'leased', 'done', 'failed')))
+    for job_id, error in queue.failures():
+        print(f"  failed: {job_id}: {error}")
+    queue.close()
+
+
+def merge_logos(all_teams, logos):
+    """Store the newest logo of each team, once per distinct image, and take its colors"""
+    store = LogoStore(fetch_yahoo_data.LOGOS_DIR)
+    for name, data in all_teams.items():
+        logo_file = store.file_for(name) or store.adopt(name, f"{fetch_yahoo_data.slugify(name)}.png")
+        logo = logos.get(name)
+        if not logo_file and logo:
+            logo_file = store.add(name, base64.b64decode(logo['content']), logo['file'])
+            store.remember_colors(logo_file, logo['colors'])
+        data['logo_file'] = logo_file
+        data['colors'] = store.colors(logo_file, fetch_yahoo_data.extract_logo_colors) if logo_file else None
+    store.save()
+
+
+def cmd_merge(args):
+    queue = open_queue(args)
+    if not queue.drained():
+        raise SystemExit(f"{args.queue} still has pending or leased jobs, run the workers first")
+
+    season_records = fetch_yahoo_data.SeasonRecords()
+    logos = {}  # team -> newest logo result
+    logo_seasons = {}
+    drafts = {}
+    prospects = None
+    for kind, payload, result in queue.results():
+        if kind == 'sheet':
+            drafts[payload['year']] = result
+        elif kind == 'prospects':
+            prospects = result
+        elif kind == 'logo':
+            if payload['season'] >= logo_seasons.get(payload['team'], ''):
+                logos[payload['team']] = result
+                logo_seasons[payload['team']] = payload['season']
+        else:
+            records, _ = result
+            for record in records:
+                season_records.add(record)
+    failures = queue.failures()
+    queue.close()
+
+    standings_by_season, playoffs_by_season, rosters_by_season, regular_season_by_season = season_records.results()
+    fetch_yahoo_data.print_season_summary(standings_by_season, playoffs_by_season, rosters_by_season,
+                                          regular_season_by_season)
+
+    champions, all_teams, season_rosters, player_history, team_rosters = fetch_yahoo_data.aggregate_league(
+        standings_by_season, playoffs_by_season, rosters_by_season
+    )
+    merge_logos(all_teams, logos)
+
+    if args.no_stats:
+        previous = fetch_yahoo_data.read_league_data()
+        player_stats = (previous or {}).get('player_stats')
+    else:
+        api = fetch_yahoo_data.YahooFantasyAPI()
+        api.authenticate()
+        player_stats = fetch_yahoo_data.fetch_player_stats(api, player_history)
+
+    franchise_players = fetch_yahoo_data.find_franchise_players(player_history, all_teams)
+    fetch_yahoo_data.print_results(all_teams, champions, franchise_players)
+    output = fetch_yahoo_data.build_output(all_teams, champions, season_rosters, team_rosters, franchise_players,
+                                           player_history, regular_season_by_season, player_stats)
+    fetch_yahoo_data.write_league_data(output)
+
+    if prospects is None:
+        print("\nThe prospect sheet job failed, draft_data.json left unchanged")
+    else:
+        data, search_index = fetch_draft_data.derive_draft_data(drafts, prospects, output)
+        fetch_draft_data.write_draft_outputs(data, search_index, SCRIPTS_DIR)
+        fetch_draft_data.print_draft_summary(data)
+
+    if failures:
+        print(f"\n{len(failures)} jobs failed, their data is missing from this merge:")
+        for job_id, error in failures:
+            print(f"  {job_id}: {error}")
+    write_run_metrics('queue_metrics.json')
+
+
+def cmd_run(args):
+    cmd_publish(args)
+    cmd_work(args)
+    cmd_merge(args)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a full refresh through a job queue shared by several workers")
+    parser.add_argument('--queue', type=Path, default=SCRIPTS_DIR / QUEUE_FILE,
+                        help=f"Queue file (default: scripts/{QUEUE_FILE})")
+    parser.add_argument('--lease', type=float, default=DEFAULT_LEASE_SECONDS,
+                        help="Seconds a claimed job stays with its worker before others may take it over")
+    parser.add_argument('--attempts', type=int, default=DEFAULT_MAX_ATTEMPTS,
+                        help="Tries per job before it counts as failed")
+    commands = parser.add_subparsers(dest='command', required=True, metavar='COMMAND')
+
+    publish = commands.add_parser('publish', help="Queue the initial fetch units")
+    publish.add_argument('--fresh', action='store_true', help="Drop the results of an earlier run first")
+
+    work = commands.add_parser('work', help="Claim and run jobs until the queue is drained")
+    work.add_argument('--processes', type=int, default=1, help="Worker processes on this machine")
+
+    commands.add_parser('status', help="Jobs per state and failures")
+
+    merge = commands.add_parser('merge', help="Write league_data.json and draft_data.json from the results")
+    merge.add_argument('--no-stats', action='store_true',
+                       help="Keep the player stats of the last league_data.json instead of fetching them")
+
+    run = commands.add_parser('run', help="Publish (fresh), work and merge on this machine")
+    run.add_argument('--processes', type=int, default=4, help="Worker processes")
+    run.add_argument('--no-stats', action='store_true',
+                     help="Keep the player stats of the last league_data.json instead of fetching them")
+
+    args = parser.parse_args()
+    if args.command == 'run':
+        args.fresh = True
+    args.queue = args.queue.resolve()
+
+    os.chdir(SCRIPTS_DIR)
+    globals()[f"cmd_{args.command}"](args)
+
+
+if __name__ == '__main__':
+    main()
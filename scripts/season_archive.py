@@ -0,0 +1,148 @@
+"""
+Sealed archive of completed seasons.
+
+A finished season's standings, playoffs, regular season and rosters never
+change, so once fetched they are sealed into scripts/seasons.archive and
+later runs read them from there instead of asking Yahoo again. Every block
+(one per season, one per team roster) is gzip-compressed on its own and an
+index of byte offsets sits at the end of the file, so a single season or
+roster is read through a memory map without decompressing anything else.
+
+Layout:
+
+    b"LKCARCH1"                      magic
+    <gzip block> <gzip block> ...    JSON values
+    <index JSON>                     {"blocks": {key: [offset, length]}, "seasons": [...]}
+    <index offset, index length>     two little-endian uint64
+    b"LKCARCH1"                      magic again
+
+Block keys are "<season>" for the season block and "<season>/roster/<team>"
+for rosters. Sealed blocks are never rewritten: sealing more seasons copies
+the existing compressed bytes into a new file and renames it into place.
+"""
+
+import gzip
+import json
+import mmap
+import os
+import struct
+from pathlib import Path
+
+MAGIC = b'LKCARCH1'
+FOOTER = struct.Struct('<QQ')
+
+
+class SeasonArchive:
+    """Read-only view of an archive file."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._file = open(self.path, 'rb')
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        size = len(self._map)
+        tail = len(MAGIC) + FOOTER.size
+        if size < len(MAGIC) + tail or self._map[:len(MAGIC)] != MAGIC or self._map[-len(MAGIC):] != MAGIC:
+            self.close()
+            raise ValueError(f"{self.path} is not a season archive")
+
+        index_offset, index_length = FOOTER.unpack(self._map[size - tail:size - len(MAGIC)])
+        index = json.loads(self._map[index_offset:index_offset + index_length])
+        self.blocks = {key: tuple(span) for key, span in index['blocks'].items()}
+        self.seasons = list(index['seasons'])
+
+    @classmethod
+    def open(cls, path: Path):
+        """The archive at `path`, or None if there is none yet."""
+        return cls(path) if Path(path).exists() else None
+
+    def raw_block(self, key: str) -> bytes:
+        """Compressed bytes of one block."""
+        offset, length = self.blocks[key]
+        return self._map[offset:offset + length]
+
+    def get(self, key: str):
+        return json.loads(gzip.decompress(self.raw_block(key)))
+
+    def season(self, season: str) -> dict:
+        """{standings, playoffs, regular_season, roster_teams} of one sealed season."""
+        data = self.get(season)
+        if data.get('regular_season'):
+            # JSON turned the week numbers into strings
+            data['regular_season'] = {int(week): matchups for week, matchups in data['regular_season'].items()}
+        return data
+
+    def roster(self, season: str, team: str) -> list | None:
+        key = f"{season}/roster/{team}"
+        return self.get(key) if key in self.blocks else None
+
+    def rosters(self, season: str) -> dict | None:
+        """team -> roster of one sealed season, in standings order."""
+        teams = self.season(season).get('roster_teams')
+        if teams is None:
+            return None
+        return {team: self.roster(season, team) for team in teams}
+
+    def close(self) -> None:
+        self._map.close()
+        self._file.close()
+
+
+def seal_seasons(path: Path, seasons: dict) -> list[str]:
+    """
+    Add completed seasons to the archive at `path` (created if missing).
+
+    `seasons` maps season -> {standings, playoffs, regular_season, rosters}.
+    Seasons already sealed are left untouched. Returns the seasons added.
+    """
+    path = Path(path)
+    existing = SeasonArchive.open(path)
+    sealed = set(existing.seasons) if existing else set()
+    new = sorted(season for season in seasons if season not in sealed)
+    if not new:
+        if existing:
+            existing.close()
+        return []
+
+    tmp_path = path.with_suffix('.tmp')
+    blocks = {}
+    with open(tmp_path, 'wb') as f:
+        f.write(MAGIC)
+
+        def put(key, raw):
+            blocks[key] = (f.tell(), len(raw))
+            f.write(raw)
+
+        if existing:
+            for key in existing.blocks:
+                put(key, existing.raw_block(key))
+            existing.close()
+
+        for season in new:
+            data = seasons[season]
+            rosters = data.get('rosters')
+            put(season, compress({
+                'standings': data.get('standings'),
+                'playoffs': data.get('playoffs'),
+                'regular_season': data.get('regular_season'),
+                'roster_teams': list(rosters) if rosters is not None else None,
+            }))
+            for team, roster in (rosters or {}).items():
+                put(f"{season}/roster/{team}", compress(roster))
+
+        index = json.dumps({
+            'blocks': blocks,
+            'seasons': sorted(sealed | set(new)),
+        }, separators=(',', ':')).encode('utf-8')
+        index_offset = f.tell()
+        f.write(index)
+        f.write(FOOTER.pack(index_offset, len(index)))
+        f.write(MAGIC)
+
+    os.replace(tmp_path, path)
+    return new
+
+
+def compress(value) -> bytes:
+    # mtime=0 keeps blocks byte-identical for identical data
+    return gzip.compress(json.dumps(value, separators=(',', ':')).encode('utf-8'), compresslevel=9, mtime=0)
@@ -0,0 +1,149 @@
+"""
+Synthetic Yahoo payloads and draft sheets for benchmarks and offline runs.
+
+Generates responses shaped like the Yahoo Fantasy API (standings, teams,
+rosters, scoreboards) and rows shaped like the draft spreadsheet CSV export,
+at any number of seasons and teams. Rosters keep most players from one
+season to the next so franchise detection has real runs to find.
+"""
+
+import random
+
+FIRST_SEASON = 2012
+POSITIONS = ['C', 'LW', 'RW', 'D', 'D', 'G']
+
+
+def season_name(index: int) -> str:
+    """Season label ("2012-13") of the index-th season."""
+    year = FIRST_SEASON + index
+    return f"{year}-{str(year + 1)[-2:]}"
+
+
+def team_name(index: int) -> str:
+    return f"Synthetic Team {index}"
+
+
+def _team_info(team_index: int, season_index: int) -> list:
+    return [
+        {'team_key': f"{400 + season_index}.l.{1000 + season_index}.t.{team_index + 1}"},
+        {'team_id': str(team_index + 1)},
+        {'name': team_name(team_index)},
+        {'team_logos': [{'team_logo': {'size': 'large', 'url': f"https://example.com/logos/{team_index}.png"}}]},
+        {'managers': [{'manager': {'manager_id': str(team_index + 1), 'nickname': f"Manager {team_index}"}}]},
+    ]
+
+
+def _league(section: str, value) -> dict:
+    return {'fantasy_content': {'league': [{'league_key': 'synthetic'}, {section: value}]}}
+
+
+def standings_payload(season_index: int, num_teams: int, seed: int = 0) -> dict:
+    """league/{key}/standings response with a shuffled final ranking."""
+    ranks = list(range(1, num_teams + 1))
+    random.Random(seed * 7919 + season_index).shuffle(ranks)
+    teams = {'count': num_teams}
+    for i in range(num_teams):
+        teams[str(i)] = {'team': [
+            _team_info(i, season_index),
+            {'team_points': {'total': str(1000 + i)}},
+            {'team_standings': {'rank': str(ranks[i])}},
+        ]}
+    return _league('standings', [{'teams': teams}])
+
+
+def teams_payload(season_index: int, num_teams: int) -> dict:
+    """league/{key}/teams response."""
+    teams = {'count': num_teams}
+    for i in range(num_teams):
+        teams[str(i)] = {'team': [_team_info(i, season_index)]}
+    return _league('teams', teams)
+
+
+def settings_payload(playoff_start_week: int = 22) -> dict:
+    """league/{key}/settings response."""
+    return _league('settings', [{'playoff_start_week': str(playoff_start_week)}])
+
+
+def roster_player_ids(team_index: int, season_index: int, roster_size: int, churn: float = 0.2) -> list[int]:
+    """Player IDs on a roster; each season replaces about `churn` of the slots."""
+    ids = []
+    for slot in range(roster_size):
+        # A slot keeps its player for a stretch of seasons, then turns over
+        stint_length = max(1, int(1 / churn)) + slot % 7
+        stint = season_index // stint_length
+        ids.append((team_index * 1000 + slot) * 100 + stint)
+    return ids
+
+
+def roster_payload(team_index: int, season_index: int, roster_size: int = 25) -> dict:
+    """team/{key}/roster response."""
+    players = {'count': roster_size}
+    for i, player_id in enumerate(roster_player_ids(team_index, season_index, roster_size)):
+        players[str(i)] = {'player': [[
+            {'player_key': f"nhl.p.{player_id}"},
+            {'player_id': str(player_id)},
+            {'name': {'full': f"Player {player_id}", 'first': 'Player', 'last': str(player_id)}},
+            {'uniform_number': str(player_id % 99 + 1)},
+            {'display_position': POSITIONS[i % len(POSITIONS)]},
+            {'primary_position': POSITIONS[i % len(POSITIONS)]},
+        ]]}
+    return {'fantasy_content': {'team': [
+        _team_info(team_index, season_index),
+        {'roster': {'coverage_type': 'date', '0': {'players': players}}},
+    ]}}
+
+
+def scoreboard_payload(week: int, num_teams: int, is_playoffs: bool = True, seed: int = 0) -> dict:
+    """league/{key}/scoreboard;week=N response pairing teams in order."""
+    rng = random.Random(seed * 104729 + week)
+    matchups = {'count': num_teams // 2}
+    for m in range(num_teams // 2):
+        teams = {'count': 2}
+        for side in range(2):
+            index = m * 2 + side
+            teams[str(side)] = {'team': [
+                [{'team_key': f"t.{index}"}, {'name': team_name(index)}],
+                {'team_points': {'coverage_type': 'week', 'week': str(week),
+                                 'total': f"{rng.uniform(50, 150):.2f}"}},
+            ]}
+        matchups[str(m)] = {'matchup': {
+            'week': str(week),
+            'is_playoffs': '1' if is_playoffs else '0',
+            'is_consolation': '0',
+            '0': {'teams': teams},
+        }}
+    return _league('scoreboard', {'0': {'matchups': matchups}, 'week': str(week)})
+
+
+def draft_sheet_rows(year: int, num_teams: int, seed: int = 0) -> list[list[str]]:
+    """Rows of a draft year tab as returned by fetch_sheet."""
+    rng = random.Random(seed * 31 + year)
+    rows = [['Entry Draft', '', '', '', ''], ['', '', '', '', '']]
+    for round_num in (1, 2):
+        rows.append([f"Round {round_num}", '', '', '', ''])
+        rows.append(['Pick', 'Team', 'From', 'Player', 'Traded to'])
+        for pick in range(1, num_teams + 1):
+            overall = (round_num - 1) * num_teams + pick
+            team = team_name(rng.randrange(num_teams))
+            from_team = team_name(rng.randrange(num_teams)) if rng.random() < 0.2 else ''
+            traded_to = team_name(rng.randrange(num_teams)) if rng.random() < 0.05 else 'x'
+            rows.append([str(overall), team, from_team, f"Prospect {year}-{overall}", traded_to])
+        rows.append(['', '', '', '', ''])
+    rows.append(['Free Agent Draft', '', '', '', ''])
+    rows.append(['1', team_name(0), 'yes', 'Somebody', ''])
+    return rows
+
+
+def write_logo(path, seed: int, size: int = 200) -> None:
+    """Write a PNG with a few colored shapes on white, like a team logo."""
+    from PIL import Image, ImageDraw
+
+    rng = random.Random(seed)
+    img = Image.new('RGB', (size, size), (255, 255, 255))
+    draw = ImageDraw.Draw(img)
+    for _ in range(4):
+        color = tuple(rng.randrange(256) for _ in range(3))
+        x0, y0 = rng.randrange(size // 2), rng.randrange(size // 2)
+        x1, y1 = x0 + rng.randrange(20, size // 2), y0 + rng.randrange(20, size // 2)
+        draw.ellipse((x0, y0, x1, y1), fill=color)
+    img.save(path)
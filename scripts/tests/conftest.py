@@ -0,0 +1,20 @@
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+# The scripts import each other as siblings
+SCRIPTS_DIR = Path(__file__).parent.parent
+sys.path.insert(0, str(SCRIPTS_DIR))
+
+PAYLOADS_DIR = Path(__file__).parent / 'payloads'
+
+
+@pytest.fixture
+def payload():
+    """Load a recorded payload from tests/payloads by file name"""
+    def load(name):
+        with open(PAYLOADS_DIR / name) as f:
+            return json.load(f)
+    return load
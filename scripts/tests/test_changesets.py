@@ -0,0 +1,34 @@
+"""Change set record IDs"""
+
+from changesets import build_changeset, draft_records
+
+
+def draft_data(*prospects):
+    return {'drafts': {}, 'prospects': {'Lyss Falcons': [dict(p) for p in prospects]}}
+
+
+def test_prospects_with_the_same_name_keep_their_own_records():
+    data = draft_data({'player': 'J. Hughes', 'rights_expire': '2026'},
+                      {'player': 'J Hughes', 'rights_expire': '2026'},
+                      {'player': 'J. Hughes', 'rights_expire': '2027'})
+
+    assert sorted(draft_records(data)['prospects']) == [
+        'Lyss Falcons|2026|j hughes',
+        'Lyss Falcons|2026|j hughes#2',
+        'Lyss Falcons|2027|j hughes',
+    ]
+
+
+def test_unchanged_prospects_give_an_empty_changeset():
+    old = draft_data({'player': 'J. Hughes', 'rights_expire': '2026'}, {'player': 'J. Hughes', 'rights_expire': '2026'})
+    new = draft_data({'player': 'J. Hughes', 'rights_expire': '2026'}, {'player': 'J. Hughes', 'rights_expire': '2026'})
+
+    assert build_changeset(old, new, draft_records)['counts']['prospects'] == {'inserted': 0, 'updated': 0, 'deleted': 0}
+
+
+def test_dropped_duplicate_is_deleted():
+    old = draft_data({'player': 'J. Hughes', 'rights_expire': '2026'}, {'player': 'J Hughes', 'rights_expire': '2026'})
+    new = draft_data({'player': 'J. Hughes', 'rights_expire': '2026'})
+
+    changes = build_changeset(old, new, draft_records)['changes']['prospects']
+    assert changes['deleted'] == ['Lyss Falcons|2026|j hughes#2']
@@ -0,0 +1,72 @@
+"""League aggregates keyed by franchise across team renames"""
+
+from league_aggregates import build_aggregates, franchises
+
+
+ALL_TEAMS = {
+    'Elfenau Gamblers': {'owner': 'Reto', 'seasons': ['2018-19', '2019-20']},
+    'Oerlikon Gamblers': {'owner': 'Reto', 'seasons': ['2020-21', '2021-22']},
+    'Lyss Falcons': {'owner': 'Nic', 'seasons': ['2018-19', '2019-20', '2020-21', '2021-22']},
+    'Hidden A': {'owner': '--hidden--', 'seasons': ['2018-19']},
+    'Hidden B': {'owner': '--hidden--', 'seasons': ['2019-20']},
+}
+
+
+def final(season, champion, runner_up):
+    return {'season': season, 'champion_team': champion, 'runner_up_team': runner_up,
+            'playoffs': [{'round': 1, 'teams': [champion, runner_up], 'scores': [10.0, 5.0]}]}
+
+
+CHAMPIONS = [
+    final('2019-20', 'Elfenau Gamblers', 'Lyss Falcons'),
+    final('2020-21', 'Oerlikon Gamblers', 'Lyss Falcons'),
+    final('2021-22', 'Lyss Falcons', 'Oerlikon Gamblers'),
+]
+
+
+def test_renamed_team_is_one_franchise_under_its_latest_name():
+    result = franchises(ALL_TEAMS)
+
+    assert result['Elfenau Gamblers'] == {
+        'name': 'Oerlikon Gamblers',
+        'names': ['Elfenau Gamblers', 'Oerlikon Gamblers'],
+        'seasons': ['2018-19', '2019-20', '2020-21', '2021-22'],
+    }
+    assert 'Oerlikon Gamblers' not in result
+
+
+def test_hidden_owners_are_not_merged():
+    result = franchises(ALL_TEAMS)
+
+    assert result['Hidden A']['names'] == ['Hidden A']
+    assert result['Hidden B']['names'] == ['Hidden B']
+
+
+def test_overlapping_teams_of_one_owner_stay_apart():
+    teams = {
+        'First': {'owner': 'Reto', 'seasons': ['2019-20', '2020-21']},
+        'Second': {'owner': 'Reto', 'seasons': ['2020-21']},
+    }
+
+    assert sorted(franchises(teams)) == ['First', 'Second']
+
+
+def test_records_and_streaks_follow_the_franchise():
+    aggregates = build_aggregates(ALL_TEAMS, CHAMPIONS)
+    gamblers = aggregates['records']['Elfenau Gamblers']
+
+    assert gamblers['name'] == 'Oerlikon Gamblers'
+    assert gamblers['titles'] == ['2019-20', '2020-21']
+    assert gamblers['playoffs'] == [2, 1, 0]
+    assert 'Oerlikon Gamblers' not in aggregates['records']
+
+    streak = aggregates['champion_streaks'][0]
+    assert (streak['franchise'], streak['team'], streak['length']) == ('Elfenau Gamblers', 'Oerlikon Gamblers', 2)
+
+    teams = aggregates['teams']
+    gamblers_index, falcons_index = teams.index('Elfenau Gamblers'), teams.index('Lyss Falcons')
+    assert aggregates['head_to_head']['wins'][gamblers_index][falcons_index] == 2
+
+    # Finals keep the names of their season
+    assert aggregates['finals'][-1]['champion'] == 'Elfenau Gamblers'
+    assert aggregates['finals'][1]['champion_franchise'] == 'Elfenau Gamblers'
@@ -0,0 +1,46 @@
+"""Logo store: duplicate legacy files are removed when they are adopted"""
+
+import io
+
+import pytest
+
+from logo_store import LogoStore
+
+Image = pytest.importorskip('PIL.Image')
+
+
+def png(color, size=(32, 32), left=True):
+    """A logo that is `color` on one half and white on the other"""
+    img = Image.new('RGB', size, (255, 255, 255))
+    for x in range(size[0] // 2):
+        for y in range(size[1]):
+            img.putpixel((x if left else size[0] - 1 - x, y), color)
+    buffer = io.BytesIO()
+    img.save(buffer, 'PNG')
+    return buffer.getvalue()
+
+
+def test_adopting_a_duplicate_deletes_it(tmp_path):
+    (tmp_path / 'elfenau-gamblers.png').write_bytes(png((200, 0, 0)))
+    (tmp_path / 'oerlikon-gamblers.png').write_bytes(png((200, 0, 0)))
+    store = LogoStore(tmp_path)
+
+    assert store.adopt('Elfenau Gamblers', 'elfenau-gamblers.png') == 'elfenau-gamblers.png'
+    assert store.adopt('Oerlikon Gamblers', 'oerlikon-gamblers.png') == 'elfenau-gamblers.png'
+
+    assert not (tmp_path / 'oerlikon-gamblers.png').exists()
+    assert store.removed == ['oerlikon-gamblers.png']
+    assert store.file_for('Oerlikon Gamblers') == 'elfenau-gamblers.png'
+    assert store.duplicates() == []
+
+
+def test_adopting_a_distinct_logo_keeps_it(tmp_path):
+    (tmp_path / 'lyss-falcons.png').write_bytes(png((0, 0, 200)))
+    (tmp_path / 'slithering-goons.png').write_bytes(png((0, 0, 200), left=False))
+    store = LogoStore(tmp_path)
+
+    store.adopt('Lyss Falcons', 'lyss-falcons.png')
+    store.adopt('Slithering Goons', 'slithering-goons.png')
+
+    assert (tmp_path / 'slithering-goons.png').exists()
+    assert store.removed == []
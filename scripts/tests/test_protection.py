@@ -0,0 +1,40 @@
+"""Protection table: goalie detection and matching sheet prospects to picks"""
+
+from fetch_draft_data import build_protection_table, prospect_position
+from player_matching import PickIndex
+
+
+def draft(*players):
+    return {"entry_draft": {"round_1": [
+        {"pick": pick, "player": player, "team": "Lyss Falcons", "traded_to": "", "player_id": None}
+        for pick, player in enumerate(players, 1)
+    ]}}
+
+
+def test_known_goalies_come_from_the_shared_list():
+    assert prospect_position("Michael Hrabal", None) == "G"
+    assert prospect_position("M. Hrabal", None) == "G"
+    assert prospect_position("Connor Bedard", None) is None
+    # Yahoo's position wins over the list
+    assert prospect_position("Michael Hrabal", "C") == "C"
+
+
+def test_pick_index_resolves_to_pick_keys():
+    index = PickIndex({"Luke Cooley": "2023-1-4", "Jack Hughes": "2019-1-1"})
+
+    assert index.resolve("L. Cooley")["pick_key"] == "2023-1-4"
+    assert index.resolve("Nobody Here")["pick_key"] is None
+    assert "player_id" not in index.resolve("L. Cooley")
+
+
+def test_sheet_prospects_match_their_pick():
+    drafts = {"2023": draft("Luke Cooley", "Michael Hrabal")}
+    prospects = {"Lyss Falcons": [{"player": "L. Cooley", "rights_expire": "2028"}]}
+
+    table = build_protection_table(drafts, prospects, {}, ["Lyss Falcons"])
+    picks = table["picks"]
+
+    assert picks["2023-1-1"]["source"] == "sheet"
+    assert picks["2023-1-1"]["expires"] == 2028
+    assert picks["2023-1-2"]["position"] == "G"
+    assert picks["2023-1-2"]["expires"] == 2028
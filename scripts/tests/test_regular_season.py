@@ -0,0 +1,44 @@
+"""Regular-season weeks: settings parsing and reuse of finished weeks"""
+
+from fetch_yahoo_data import (CURRENT_SEASON, compact_regular_season, expand_regular_season, finished_weeks,
+                              regular_season_weeks, reuse_weeks)
+
+
+def settings(**meta):
+    return {'fantasy_content': {'league': [meta, {'settings': [{'playoff_start_week': '22'}]}]}}
+
+
+def week(points):
+    return [{'teams': ['Lyss Falcons', 'Slithering Goons'], 'scores': [points, 30.0],
+             'winner': 'Lyss Falcons' if points > 30.0 else 'Slithering Goons'}]
+
+
+def test_running_season_stops_at_the_current_week():
+    assert regular_season_weeks(settings(start_week='1', current_week='4', is_finished='0')) == [1, 2, 3, 4]
+    assert regular_season_weeks(settings(start_week='1', current_week='23', is_finished='1')) == list(range(1, 22))
+
+
+def test_unreadable_settings_give_none():
+    assert regular_season_weeks({'fantasy_content': {}}) is None
+    assert regular_season_weeks(settings(start_week='1', current_week='soon')) is None
+
+
+def test_expand_undoes_compact():
+    weeks = {1: week(40.0), 2: week(20.0)}
+
+    assert expand_regular_season(compact_regular_season(weeks)) == weeks
+
+
+def test_newest_stored_week_is_fetched_again():
+    previous = {'regular_season': {CURRENT_SEASON: compact_regular_season({1: week(40.0), 2: week(20.0)})}}
+
+    assert finished_weeks(previous) == {CURRENT_SEASON: {1: week(40.0)}}
+    assert finished_weeks(None) == {}
+
+
+def test_reused_weeks_fill_in_around_fetched_ones():
+    regular_season = {CURRENT_SEASON: {2: week(25.0)}}
+    standings = {CURRENT_SEASON: [{'name': 'Lyss Falcons'}]}
+    reuse_weeks(regular_season, standings, {CURRENT_SEASON: {1: week(40.0)}, '2001-02': {1: week(10.0)}})
+
+    assert regular_season == {CURRENT_SEASON: {1: week(40.0), 2: week(25.0)}}
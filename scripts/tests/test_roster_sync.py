@@ -0,0 +1,149 @@
+"""Incremental roster sync: transaction replay, consistency checks and the stored sync point"""
+
+import pytest
+
+import fetch_yahoo_data
+from fetch_yahoo_data import CURRENT_SEASON, apply_transactions, parse_transactions, sync_current_rosters, sync_rosters
+
+
+@pytest.fixture
+def transactions(payload):
+    return parse_transactions(payload('transactions.json'))
+
+
+@pytest.fixture
+def rosters(payload):
+    return payload('rosters.json')
+
+
+def previous_output(rosters, last_transaction_id):
+    """league_data.json of the last run, synced up to `last_transaction_id`"""
+    return {
+        'team_rosters': {CURRENT_SEASON: rosters},
+        'sync': {'season': CURRENT_SEASON, 'last_transaction_id': last_transaction_id},
+    }
+
+
+def player_ids(roster):
+    return sorted(player['player_id'] for player in roster)
+
+
+def test_parse_transactions_keeps_successful_moves_oldest_first(transactions):
+    assert [t['id'] for t in transactions] == [11, 12]
+    assert [(m['type'], m['from_team'], m['to_team']) for m in transactions[0]['moves']] == [
+        ('add', None, 'Lyss Falcons'),
+        ('drop', 'Lyss Falcons', None),
+    ]
+
+
+def test_clean_apply(rosters, transactions):
+    synced = sync_current_rosters(previous_output(rosters, 10), list(rosters), transactions)
+
+    assert synced is not None
+    updated, last_id = synced
+    assert last_id == 12
+    assert player_ids(updated['Lyss Falcons']) == ['8475', '8478', '8484']
+    assert player_ids(updated['Slithering Goons']) == ['8479', '8482']
+    # The stored rosters are left as they were
+    assert player_ids(rosters['Lyss Falcons']) == ['8470', '8475', '8482']
+
+
+def test_only_transactions_after_the_sync_point_are_applied(rosters, transactions):
+    # Transaction 11 is already in the stored rosters
+    stored = apply_transactions(rosters, transactions[:1])
+    updated, last_id = sync_current_rosters(previous_output(stored, 11), list(rosters), transactions)
+
+    assert last_id == 12
+    assert player_ids(updated['Lyss Falcons']) == ['8475', '8478', '8484']
+
+
+def test_no_new_transactions_keeps_the_sync_point(rosters, transactions):
+    stored = apply_transactions(rosters, transactions)
+    updated, last_id = sync_current_rosters(previous_output(stored, 12), list(rosters), transactions)
+
+    assert last_id == 12
+    assert updated == stored
+
+
+def test_mismatched_drop_falls_back(rosters, transactions):
+    # The dropped player isn't on the stored roster: the rosters have drifted
+    rosters['Lyss Falcons'] = [p for p in rosters['Lyss Falcons'] if p['player_id'] != '8470']
+
+    assert apply_transactions(rosters, transactions) is None
+    assert sync_current_rosters(previous_output(rosters, 10), list(rosters), transactions) is None
+
+
+def test_added_player_already_on_roster_falls_back(rosters, transactions):
+    rosters['Lyss Falcons'].append({'player_id': '8484', 'name': 'Connor Bedard', 'position': 'C'})
+
+    assert apply_transactions(rosters, transactions) is None
+
+
+@pytest.mark.parametrize('last_id', [0, 5])
+def test_truncated_feed_falls_back(rosters, transactions, last_id):
+    # The feed starts at 11, so moves after the sync point may be cut off
+    assert sync_current_rosters(previous_output(rosters, last_id), list(rosters), transactions) is None
+
+
+def test_missing_feed_falls_back(rosters):
+    assert sync_current_rosters(previous_output(rosters, 10), list(rosters), None) is None
+
+
+def test_renamed_teams_fall_back(rosters, transactions):
+    team_names = ['Lyss Falcons', 'Slithering Goons Reborn']
+
+    assert sync_current_rosters(previous_output(rosters, 10), team_names, transactions) is None
+
+
+def test_no_sync_point_falls_back(rosters, transactions):
+    previous = previous_output(rosters, 10)
+    previous['sync'] = None
+
+    assert sync_current_rosters(previous, list(rosters), transactions) is None
+
+
+@pytest.fixture
+def full_pulls(monkeypatch, rosters):
+    """Record fetch_season_rosters calls instead of going to Yahoo"""
+    calls = []
+
+    def fetch_season_rosters(api, season, game_key, league_id):
+        calls.append(season)
+        return rosters
+    monkeypatch.setattr(fetch_yahoo_data, 'fetch_season_rosters', fetch_season_rosters)
+    return calls
+
+
+def standings(rosters):
+    return {CURRENT_SEASON: [{'name': name} for name in rosters]}
+
+
+def test_sync_rosters_stores_the_applied_sync_point(rosters, transactions, full_pulls):
+    rosters_by_season = {CURRENT_SEASON: {}}
+    sync = sync_rosters(None, rosters_by_season, standings(rosters), transactions,
+                        previous_output(rosters, 10), skipped={CURRENT_SEASON})
+
+    assert sync == {'season': CURRENT_SEASON, 'last_transaction_id': 12}
+    assert player_ids(rosters_by_season[CURRENT_SEASON]['Slithering Goons']) == ['8479', '8482']
+    assert full_pulls == []
+
+
+def test_sync_rosters_pulls_in_full_when_the_replay_fails(rosters, transactions, full_pulls):
+    rosters_by_season = {CURRENT_SEASON: {}}
+    sync = sync_rosters(None, rosters_by_season, standings(rosters), transactions,
+                        previous_output(rosters, 0), skipped={CURRENT_SEASON})
+
+    assert full_pulls == [CURRENT_SEASON]
+    # The transactions were read before the full pull, so their newest ID is the sync point
+    assert sync == {'season': CURRENT_SEASON, 'last_transaction_id': 12}
+
+
+def test_sync_rosters_keeps_rosters_the_pipeline_pulled(rosters, transactions, full_pulls):
+    # The previous output has no current-season rosters, so the pipeline pulled them
+    previous = {'team_rosters': {}, 'sync': None}
+    rosters_by_season = {CURRENT_SEASON: rosters}
+    sync = sync_rosters(None, rosters_by_season, standings(rosters), transactions, previous, skipped=set())
+
+    assert full_pulls == []
+    assert rosters_by_season[CURRENT_SEASON] is rosters
+    assert sync == {'season': CURRENT_SEASON, 'last_transaction_id': 12}
@@ -0,0 +1,71 @@
+"""Merging watched Yahoo changes into league_data.json"""
+
+import pytest
+
+import fetch_yahoo_data
+from fetch_yahoo_data import CURRENT_SEASON, parse_transactions
+from watch import merge_scoreboard, merge_standings, merge_transactions
+
+
+def standings(*names):
+    return [{'name': name, 'manager': f"{name} GM", 'logo_url': None, 'rank': rank}
+            for rank, name in enumerate(names, 1)]
+
+
+@pytest.fixture
+def output(payload):
+    """league_data.json of a full fetch synced up to transaction 10"""
+    rosters = payload('rosters.json')
+    champions, all_teams, season_rosters, player_history, team_rosters = fetch_yahoo_data.aggregate_league(
+        {CURRENT_SEASON: standings('Lyss Falcons', 'Slithering Goons')}, {}, {CURRENT_SEASON: rosters})
+    regular_season = {CURRENT_SEASON: {1: [{'teams': ['Lyss Falcons', 'Slithering Goons'], 'scores': [40.0, 35.0]}]}}
+    output = fetch_yahoo_data.build_output(all_teams, champions, season_rosters, team_rosters, [],
+                                           player_history, regular_season)
+    output['sync'] = {'season': CURRENT_SEASON, 'last_transaction_id': 10}
+    return output
+
+
+def test_standings_move_the_leader(output):
+    assert merge_standings(output, standings('Slithering Goons', 'Lyss Falcons'))
+
+    assert output['seasons'][-1]['champion_team'] == 'Slithering Goons'
+    assert len(output['seasons']) == 1
+
+
+def test_standings_pick_up_a_renamed_team(output):
+    merge_standings(output, standings('Lyss Falcons', 'Goons Reborn'))
+
+    assert [team['name'] for team in output['teams']] == ['Goons Reborn', 'Lyss Falcons']
+    assert output['season_rosters'][CURRENT_SEASON] == ['Lyss Falcons', 'Goons Reborn']
+
+
+def test_transactions_update_rosters_and_history(output, payload):
+    assert merge_transactions(None, output, parse_transactions(payload('transactions.json')))
+
+    assert output['sync'] == {'season': CURRENT_SEASON, 'last_transaction_id': 12}
+    goons = output['team_rosters'][CURRENT_SEASON]['Slithering Goons']
+    assert sorted(player['player_id'] for player in goons) == ['8479', '8482']
+    assert 'Connor Bedard' in output['player_history']
+
+
+def test_scoreboard_replaces_the_current_week(output):
+    matchups = [{'week': '2', 'is_playoffs': False, 'teams': ['Slithering Goons', 'Lyss Falcons'],
+                 'scores': [50.0, 20.0], 'winner': 'Slithering Goons'}]
+    assert merge_scoreboard(output, matchups)
+    matchups[0]['scores'] = [52.0, 20.0]
+    assert merge_scoreboard(output, matchups)
+
+    weeks = fetch_yahoo_data.expand_regular_season(output['regular_season'][CURRENT_SEASON])
+    assert sorted(weeks) == [1, 2]
+    assert weeks[2] == [{'teams': ['Slithering Goons', 'Lyss Falcons'], 'scores': [52.0, 20.0],
+                         'winner': 'Slithering Goons'}]
+    fetch_yahoo_data.refresh_aggregates(output)
+
+
+def test_playoff_scoreboard_is_left_out(output):
+    matchups = [{'week': '22', 'is_playoffs': True, 'teams': ['Slithering Goons', 'Lyss Falcons'],
+                 'scores': [50.0, 20.0], 'winner': 'Slithering Goons'}]
+    before = dict(output['regular_season'])
+
+    assert not merge_scoreboard(output, matchups)
+    assert output['regular_season'] == before
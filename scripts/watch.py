@@ -0,0 +1,338 @@
+#!/usr/bin/env python3
+"""
+Keep the site data fresh during draft night and the trade deadline.
+
+Instead of rerunning both fetchers over and over, this polls only what can
+still change: the current draft year's sheet and the current Yahoo season's
+standings, scoreboard and transactions. Each source is polled on its own
+adaptive interval, tightened right after a change and relaxed while nothing
+happens. Outputs are rewritten, and a change event is appended to
+watch_events.jsonl, only when the polled data actually differs.
+
+Yahoo changes are merged into league_data.json: standings update the
+current season's teams and leader, transactions bring the current rosters
+up to date (the same incremental sync the full fetch uses) and the
+scoreboard fills in the current regular-season week. The raw polled data
+is also kept in live_season.json.
+
+Usage:
+    python watch.py                   # until Ctrl-C
+    python watch.py --no-yahoo        # draft night: only the sheet
+    python watch.py --duration 3600
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+import fetch_draft_data
+import fetch_yahoo_data
+from http_client import write_run_metrics
+
+SCRIPTS_DIR = Path(__file__).parent
+EVENTS_FILE = SCRIPTS_DIR / 'watch_events.jsonl'
+LIVE_SEASON_FILE = SCRIPTS_DIR / 'live_season.json'
+LEAGUE_DATA_FILE = SCRIPTS_DIR / fetch_yahoo_data.LEAGUE_DATA_FILE
+
+# Seconds between polls: (right after a change, when nothing has changed for a while)
+DRAFT_INTERVALS = (15, 300)
+YAHOO_INTERVALS = (60, 900)
+# Each quiet poll stretches the interval by this factor, up to the maximum
+BACKOFF = 1.5
+
+
+def digest(data):
+    """Stable hash of JSON-serializable data"""
+    return hashlib.sha256(json.dumps(data, sort_keys=True).encode('utf-8')).hexdigest()
+
+
+class Source:
+    """One polled endpoint with its own adaptive interval."""
+
+    def __init__(self, name, poll, on_change, intervals, describe=None):
+        self.name = name
+        self.poll = poll
+        self.on_change = on_change
+        self.describe = describe
+        self.min_interval, self.max_interval = intervals
+        self.interval = self.min_interval
+        self.next_due = 0.0
+        self.data = None
+        self.digest = None
+        self.polls = 0
+        self.changes = 0
+
+    def check(self, now):
+        """Poll once; returns a change event or None"""
+        self.polls += 1
+        try:
+            data = self.poll()
+        except Exception as e:
+            print(f"  {self.name}: poll failed: {e}")
+            data = None
+
+        if data is None:
+            # Errors back off like quiet polls so a flaky endpoint isn't hammered
+            self.interval = min(self.max_interval, self.interval * BACKOFF)
+            self.next_due = now + self.interval
+            return None
+
+        new_digest = digest(data)
+        if new_digest == self.digest:
+            self.interval = min(self.max_interval, self.interval * BACKOFF)
+            self.next_due = now + self.interval
+            return None
+
+        previous, self.data, self.digest = self.data, data, new_digest
+        self.changes += 1
+        self.interval = self.min_interval
+        self.next_due = now + self.interval
+
+        self.on_change(data)
+        return {
+            'time': datetime.now(timezone.utc).isoformat(),
+            'source': self.name,
+            'initial': previous is None,
+            'changes': self.describe(previous, data) if self.describe and previous is not None else None,
+        }
+
+
+def flatten_picks(draft):
+    """(section, pick) -> pick entry of a parsed draft sheet"""
+    picks = {}
+    for section, entries in draft.items():
+        if isinstance(entries, dict):
+            picks.update(flatten_picks(entries))
+        elif isinstance(entries, list):
+            for entry in entries:
+                if isinstance(entry, dict) and 'pick' in entry:
+                    picks[f"{section}:{entry['pick']}"] = entry
+    return picks
+
+
+def describe_draft(before, after):
+    before_picks, after_picks = flatten_picks(before), flatten_picks(after)
+    return [
+        {'pick': key, 'before': before_picks.get(key), 'after': after_picks.get(key)}
+        for key in sorted(set(before_picks) | set(after_picks))
+        if before_picks.get(key) != after_picks.get(key)
+    ]
+
+
+def describe_standings(before, after):
+    ranks = {team['name']: team['rank'] for team in before}
+    return [
+        {'team': team['name'], 'before': ranks.get(team['name']), 'after': team['rank']}
+        for team in after
+        if ranks.get(team['name']) != team['rank']
+    ]
+
+
+def describe_transactions(before, after):
+    seen = {t['id'] for t in before}
+    return [t for t in after if t['id'] not in seen]
+
+
+def describe_scoreboard(before, after):
+    return [m for m in after if m not in before]
+
+
+def parse_live_scoreboard(data):
+    """All matchups of the current scoreboard week, playoffs included"""
+    matchups = []
+    for matchup in fetch_yahoo_data.iter_scoreboard_matchups(data):
+        teams = fetch_yahoo_data.parse_matchup_teams(matchup)
+        if len(teams) == 2:
+            matchups.append({
+                'week': matchup.get('week'),
+                'is_playoffs': matchup.get('is_playoffs') == '1',
+                'teams': [t['name'] for t in teams],
+                'scores': [t['points'] for t in teams],
+                'winner': fetch_yahoo_data.matchup_winner(teams),
+            })
+    return matchups
+
+
+def merge_standings(output, standings):
+    """Update the current season's champion entry, season roster and teams of league_data.json"""
+    season = fetch_yahoo_data.CURRENT_SEASON
+    entry = next((c for c in output.get('seasons', []) if c['season'] == season), None)
+    playoffs = entry.get('playoffs') if entry else None
+    champions, all_teams, season_rosters, _, _ = fetch_yahoo_data.aggregate_league(
+        {season: standings}, {season: playoffs}, {})
+
+    output['seasons'] = sorted([c for c in output.get('seasons', []) if c['season'] != season] + champions,
+                               key=lambda c: c['season'])
+    output.setdefault('season_rosters', {})[season] = season_rosters[season]
+
+    teams = {team['name']: team for team in output.get('teams', [])}
+    for team in teams.values():
+        if team['name'] not in all_teams and season in team['seasons']:
+            team['seasons'].remove(season)
+    for name, data in all_teams.items():
+        team = teams.setdefault(name, {'name': name, 'logo': None, 'colors': None, 'seasons': []})
+        team['owner'] = data['owner']
+        if season not in team['seasons']:
+            team['seasons'].append(season)
+    # A team only ever seen this season under a name it has since dropped goes away
+    output['teams'] = [team for name, team in sorted(teams.items()) if team['seasons']]
+    return True
+
+
+def merge_transactions(api, output, transactions):
+    """Bring the current season's rosters of league_data.json up to date; False if they couldn't be"""
+    season = fetch_yahoo_data.CURRENT_SEASON
+    team_names = output.get('season_rosters', {}).get(season) or []
+    rosters_by_season = {season: None}
+    sync = fetch_yahoo_data.sync_rosters(api, rosters_by_season, {season: [{'name': name} for name in team_names]},
+                                         transactions, previous=output, skipped={season})
+    if not rosters_by_season[season]:
+        return False
+
+    team_rosters = output.setdefault('team_rosters', {})
+    team_rosters[season] = rosters_by_season[season]
+    output['sync'] = sync
+    output['player_history'] = fetch_yahoo_data.player_history_from_rosters(team_rosters)
+    fetch_yahoo_data.refresh_franchise_players(output)
+    return True
+
+
+def merge_scoreboard(output, matchups):
+    """Replace the current regular-season week's matchups in league_data.json; False during the playoffs"""
+    matchups = [m for m in matchups if not m['is_playoffs']]
+    if not matchups or not matchups[0]['week']:
+        return False
+
+    season = fetch_yahoo_data.CURRENT_SEASON
+    regular_season = output.setdefault('regular_season', {})
+    weeks = fetch_yahoo_data.expand_regular_season(regular_season.get(season)) or {}
+    weeks[int(matchups[0]['week'])] = [{'teams': m['teams'], 'scores': m['scores'], 'winner': m['winner']}
+                                       for m in matchups]
+    regular_season[season] = fetch_yahoo_data.compact_regular_season(weeks)
+    return True
+
+
+def draft_sources():
+    """Poll the current draft year's sheet; re-derive draft_data.json when it changes"""
+    live_year = max(fetch_draft_data.DRAFT_SHEETS)
+    live_gid = fetch_draft_data.DRAFT_SHEETS[live_year]
+
+    # Finished draft years and the prospect list are fetched once
+    drafts = fetch_draft_data.fetch_all_drafts()
+    prospects = fetch_draft_data.fetch_prospects()
+
+    def poll():
+        return fetch_draft_data.parse_draft_sheet(fetch_draft_data.fetch_sheet(live_gid), live_year)
+
+    def on_change(draft):
+        drafts[live_year] = draft
+        league_data = fetch_draft_data.load_league_data(SCRIPTS_DIR)
+        data, search_index = fetch_draft_data.derive_draft_data(drafts, prospects, league_data)
+        fetch_draft_data.write_draft_outputs(data, search_index, SCRIPTS_DIR)
+
+    return [Source(f'draft:{live_year}', poll, on_change, DRAFT_INTERVALS, describe_draft)]
+
+
+def yahoo_sources(api, league_file=LEAGUE_DATA_FILE):
+    """Poll the current season's standings, scoreboard and transactions into league_data.json"""
+    season = fetch_yahoo_data.CURRENT_SEASON
+    game_key, league_id = fetch_yahoo_data.LAKELAND_CUP_SEASONS[season]
+    league_key = f"{game_key}.l.{league_id}"
+    live = {'season': season, 'standings': None, 'scoreboard': None, 'transactions': None}
+
+    # Loaded once and kept current in memory; each change rewrites it
+    league_file = fetch_yahoo_data.league_data_path(league_file)
+    output = fetch_yahoo_data.read_league_data(league_file)
+    if output is None:
+        print(f"  {league_file} not found, run the full fetch first; Yahoo changes only go to {LIVE_SEASON_FILE.name}")
+
+    merges = {
+        'standings': lambda standings: merge_standings(output, standings),
+        'scoreboard': lambda matchups: merge_scoreboard(output, matchups),
+        'transactions': lambda transactions: merge_transactions(api, output, transactions),
+    }
+
+    def scoreboard():
+        data = api.api_request(f"league/{league_key}/scoreboard")
+        return parse_live_scoreboard(data) if data else None
+
+    def updater(key):
+        def on_change(value):
+            live[key] = value
+            live['updated_at'] = datetime.now(timezone.utc).isoformat()
+            tmp_path = LIVE_SEASON_FILE.with_suffix('.tmp')
+            with open(tmp_path, 'w') as f:
+                json.dump(live, f, indent=2)
+            os.replace(tmp_path, LIVE_SEASON_FILE)
+
+            if output is not None and merges[key](value):
+                fetch_yahoo_data.refresh_aggregates(output)
+                fetch_yahoo_data.write_league_data(output, league_file)
+        return on_change
+
+    return [
+        Source('yahoo:standings', lambda: api.get_league_standings(game_key, league_id),
+               updater('standings'), YAHOO_INTERVALS, describe_standings),
+        Source('yahoo:scoreboard', scoreboard, updater('scoreboard'), YAHOO_INTERVALS, describe_scoreboard),
+        Source('yahoo:transactions', lambda: api.get_transactions(game_key, league_id),
+               updater('transactions'), YAHOO_INTERVALS, describe_transactions),
+    ]
+
+
+def watch(sources, duration=None, events_file=EVENTS_FILE):
+    """Poll due sources until interrupted or `duration` seconds have passed"""
+    started = time.monotonic()
+    while duration is None or time.monotonic() - started < duration:
+        now = time.monotonic()
+        for source in sources:
+            if source.next_due > now:
+                continue
+            event = source.check(now)
+            if event:
+                with open(events_file, 'a') as f:
+                    f.write(json.dumps(event) + '\n')
+                label = 'initial' if event['initial'] else f"{len(event['changes'] or [])} changes"
+                print(f"[{event['time'][11:19]}] {source.name}: {label}, next poll in {source.interval:.0f}s")
+
+        next_due = min(source.next_due for source in sources)
+        if duration is not None:
+            next_due = min(next_due, started + duration)
+        time.sleep(max(0.0, next_due - time.monotonic()))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Poll the live draft sheet and current Yahoo season for changes")
+    parser.add_argument('--no-draft', action='store_true', help="Don't poll the draft sheet")
+    parser.add_argument('--no-yahoo', action='store_true', help="Don't poll Yahoo")
+    parser.add_argument('--duration', type=float, help="Stop after this many seconds")
+    args = parser.parse_args()
+
+    sources = []
+    if not args.no_draft:
+        sources += draft_sources()
+    if not args.no_yahoo:
+        api = fetch_yahoo_data.YahooFantasyAPI()
+        api.authenticate()
+        sources += yahoo_sources(api)
+    if not sources:
+        parser.error("nothing to watch")
+
+    print(f"\nWatching {', '.join(s.name for s in sources)} (Ctrl-C to stop)")
+    try:
+        watch(sources, args.duration)
+    except KeyboardInterrupt:
+        pass
+
+    print("\n" + "="*60)
+    for source in sources:
+        print(f"  {source.name}: {source.polls} polls, {source.changes} changes")
+    write_run_metrics(SCRIPTS_DIR / 'watch_metrics.json')
+
+
+if __name__ == '__main__':
+    os.chdir(SCRIPTS_DIR)
+    main()
@@ -2,30 +2,11 @@ import { NextRequest, NextResponse } from 'next/server';
 import { db, draftPicks } from '@/lib/db';
 import { desc } from 'drizzle-orm';
 import Fuse from 'fuse.js';
+import knownGoalies from '@/lib/known-goalies.json';
 
 // Known goalies from our drafts - goalies get 5 years protection instead of 3
-// This list can be expanded or replaced with position data in the draft_picks table
-const KNOWN_GOALIES = new Set([
-  'Jake Oettinger',
-  'Spencer Knight',
-  'Yaroslav Askarov',
-  'Devon Levi',
-  'Jesper Wallstedt',
-  'Dustin Wolf',
-  'Thomas Milic',
-  'Trey Augustine',
-  'Carter George',
-  'Michael Hrabal',
-  'Sergei Ivanov',
-  'Sebastian Cossa',
-  'Ilya Nabokov',
-  'Mikhail Yegorov',
-  'Joshua Ravensbergen',
-  'Jack Ivankovic',
-  'M. Hrabal',
-  'T. Augustine',
-  'A. Gajan',
-]);
+// Shared with scripts/fetch_draft_data.py: expand known-goalies.json, or replace it with position data in the draft_picks table
+const KNOWN_GOALIES = new Set<string>(knownGoalies);
 
 function isGoalie(playerName: string, position: string | null): boolean {
   // First check if position is explicitly set